@@ -15,6 +15,10 @@ setup(
     extras_require={
         'dev': [
             'mypy',
+            'pytest',
+        ],
+        'tune': [
+            'numpy',
         ],
     },
 )
\ No newline at end of file
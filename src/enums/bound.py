@@ -0,0 +1,17 @@
+from enum import IntEnum
+
+class Bound(IntEnum):
+    """Enumeration representing the kind of score stored in the transposition table.
+
+    Members:
+        EXACT: The score is the exact value of the position.
+        LOWER: The search failed high, the value of the position is at least the score.
+        UPPER: The search failed low, the value of the position is at most the score.
+
+    Notes:
+        The members are integers so they can be packed directly into 
+        transposition table entries.
+    """
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
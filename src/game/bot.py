@@ -1,132 +1,715 @@
 from models.board import Board
 from game.game import Game
+from game.transposition_table import TranspositionTable
+from game.endgame import EndgameSolver
+from game.opening_book import OpeningBook
+from game.parallel_search import ParallelSearch
+from game.pattern_evaluator import PatternEvaluator
+from game.probcut import ProbCut
+from game.time_manager import TimeManager
+from game.search_stats import SearchStats
+from game.move_cache import MoveCache
+from enums.bound import Bound
 from enums.player import Player, get_opponent
 from math import inf
-from typing import Optional
-import time
+from typing import Callable, Optional
+from pathlib import Path
+from concurrent.futures import Future
+from threading import Event, Thread
+import util.bitboard as Bitboard
+import util.matrix as Matrix
+import util.zobrist as Zobrist
+import util.symmetry as Symmetry
 
 class Bot:
+
+    __HASH_MOVE_PRIORITY: int = 1 << 40
+    __KILLER_PRIORITY: int = 1 << 39
+    __WEIGHT_PRIORITY: int = 16
+    __MOBILITY_PRIORITY: int = 64
+    __MAX_PLY: int = 64
+    __MAX_PONDER_DEPTH: int = 24
+    __NULL_WINDOW: float = 1.0
+    __ASPIRATION_WINDOW: float = 1000.0
+    __MAX_ASPIRATION_WINDOW: float = 100000.0
+    __FINAL_SCORE: int = 1000000
+    __SYMMETRY_DISCS: int = 10
+
+    def __init__(self, hash_size_mb: float = 16, endgame_empties: int = 12, book: Optional[OpeningBook] = None, workers: int = 1, log_path: Optional[Path] = None, probcut_confidence: Optional[float] = ProbCut.DEFAULT_CONFIDENCE, patterns: Optional[PatternEvaluator] = None) -> None:
+        """
+        Create a bot with its own transposition table.
+
+        Args:
+            hash_size_mb (float, optional): The memory budget of the transposition table in megabytes. Defaults to 16.
+            endgame_empties (int, optional): The number of empty squares at or below which the bot solves 
+                the game exactly instead of searching with the heuristic. Defaults to 12.
+            book (Optional[OpeningBook], optional): The opening book to play from before searching. Defaults to None.
+            workers (int, optional): The number of processes searching each move. With more than one worker, 
+                helper processes search the same position and share the transposition table through shared memory. 
+                Defaults to 1, which searches in this process only and is deterministic.
+            log_path (Optional[Path], optional): A file the statistics of every move are appended to, as one line of JSON per move. 
+                Defaults to None, which keeps no log.
+            probcut_confidence (Optional[float], optional): The confidence of the Multi-ProbCut forward pruning, in standard deviations. 
+                Defaults to `ProbCut.DEFAULT_CONFIDENCE`. None turns the pruning off, so every node is searched to its full depth. 
+                The parameters are fitted to the evaluation (see `ProbCut.open_default`); with pattern tables or tuned weights, 
+                the pruning stays off until they have been fitted to them.
+            patterns (Optional[PatternEvaluator], optional): The pattern tables that evaluate the leaves of the search. 
+                Defaults to None, which evaluates them with `Game.get_board_score`.
+        """
+        self.probcut: Optional[ProbCut] = ProbCut.open_default(probcut_confidence, patterns is not None, Game.weights) if probcut_confidence is not None else None
+        """
+        Parameters of the Multi-ProbCut forward pruning, or None if it is turned off.
+        """
+        self.move_cache: MoveCache = MoveCache()
+        """
+        Cache of the legal moves and flips of the positions searched by this bot. Searches and pondering of a bot 
+        never run at the same time, so the cache is only used by one thread at a time, unlike the shared `Game.move_cache`.
+        """
+        self.patterns: Optional[PatternEvaluator] = patterns
+        self.evaluate: Callable[[Board, Player], float] = patterns.evaluate if patterns is not None else self.__evaluate_heuristic
+        """
+        The evaluation of the leaves of the search, from the point of view of the given player.
+        """
+        self.parallel: Optional[ParallelSearch] = ParallelSearch(workers, hash_size_mb, self.probcut, patterns.path if patterns is not None else None) if workers > 1 else None
+        self.transposition_table: TranspositionTable = TranspositionTable(hash_size_mb) if self.parallel is None else self.parallel.transposition_table
+        """
+        A fixed-size table that stores previously evaluated game states, keyed by the Zobrist hash 
+        of the board and the side to move. Each entry records whether its score is exact, 
+        a lower bound or an upper bound, so it can be reused safely with any alpha-beta window.
+        Early in the game, positions are stored in their canonical orientation (see `Bot.get_key`),
+        so symmetric positions share their entries.
+        """
+        self.book: Optional[OpeningBook] = book
+        self.log_path: Optional[Path] = log_path
+        self.endgame_empties: int = endgame_empties
+        self.endgame: EndgameSolver = EndgameSolver()
+        """
+        Exact solver used once the number of empty squares drops to `endgame_empties`.
+        """
+        self.killers: list[list[int]] = [[-1, -1] for _ in range(Bot.__MAX_PLY)]
+        """
+        Two most recent moves per ply that caused a beta cutoff.
+        """
+        self.history: list[list[int]] = [[0] * 64 for _ in range(2)]
+        """
+        History heuristic scores per player and square, increased by the squared depth of every cutoff.
+        """
+        self.time_manager: TimeManager = TimeManager()
+        self.stats: SearchStats = SearchStats()
+        """
+        Statistics of the last search.
+        """
+        self.bail: bool = False
+        """
+        Set when the running search has to stop, because it ran out of time or was cancelled.
+        """
+        self.cancellation: Event = Event()
+        """
+        Cancellation token of the running search. It can be set from another thread with `Bot.cancel`.
+        """
+        self.ponder_thread: Optional[Thread] = None
+        self.ponder_key: Optional[tuple[int, int, int]] = None
+        """
+        The position searched while pondering, as (occupied, color, player to move).
+        """
+        self.ponder_result: Optional[tuple[int, float, Optional[int]]] = None
+        """
+        The depth, score and best move of the last completed pondering iteration.
+        """
     
-    bail = False
-    transposition_table: dict[int, tuple[int, float, tuple]] = {}
-    """
-    A dictionary that stores previously evaluated game states to optimize performance through transposition.
-
-    Key:
-        - `hash(board)`: An integer hash value representing the current state of the game board.
-
-    Value:
-        A tuple containing:
-            - `depth` (int): The search depth at which this state was evaluated.
-            - `score` (float): The evaluated score of the board state.
-            - `move` (Optional[Tuple[int, int]]): The best move associated with this state, or None if no move is available.
-
-    This transposition table allows for efficient retrieval and reuse of previously evaluated states, enhancing the performance of the Minimax algorithm with alpha-beta pruning.
-    """
-    
-    def __minimax(self, board: Board, depth: int, alpha: float, beta: float, maximizingPlayer: bool, player: Player, start_time: float) -> tuple[float, Optional[tuple]]:
+    def close(self) -> None:
+        """
+        Stops pondering and the helper processes and releases the shared transposition table.
         """
-        Implements the Minimax algorithm with alpha-beta pruning for optimal decision-making in two-player games.
+        self.stop_pondering()
+        if self.parallel is not None:
+            self.parallel.close()
+            self.parallel = None
+
+    def __negamax(self, board: Board, depth: int, ply: int, alpha: float, beta: float, player: Player) -> tuple[float, Optional[int]]:
+        """
+        Implements the Negamax algorithm with alpha-beta pruning and principal variation search.
+
+        Scores are always returned from the point of view of the player to move. The first move 
+        is searched with the full window; every other move is first searched with a null window 
+        and only re-searched with the full window if it turns out to be better than the current best move.
+
+        Moves are played and reverted on the given board in place, so no board is copied during the search.
 
         Args:
             board (Board): The current state of the game board.
             depth (int): The maximum depth to search in the game tree.
-            alpha (float): The best value that the maximizing player can guarantee at the current level or above.
-            beta (float): The best value that the minimizing player can guarantee at the current level or above.
-            maximizingPlayer (bool): Indicates whether the current player is the maximizing player.
-            player (Player): The player for whom the move is being evaluated.
-            start_time (float): The time when the search started, used for time-limiting the algorithm.
+            ply (int): The distance of the current position from the root of the search.
+            alpha (float): The score the player to move is already guaranteed.
+            beta (float): The score the opponent is already guaranteed, as seen by the player to move.
+            player (Player): The player to move.
 
         Returns:
         
-            Tuple[float, Optional[Tuple[int, int]]]: A tuple containing the evaluated score and the best move (as coordinates) found for the current player, 
+            Tuple[float, Optional[int]]: A tuple containing the evaluated score and the best move (as a square index) found for the current player, 
             or None if no move is available.
         """
-        if time.time() - start_time >= 3.0:
-            Bot.bail = True
-        board_hash: int = hash((board.color, board.occupied))
-        transposition: Optional[tuple[int, float, tuple]] = Bot.transposition_table.get(board_hash)
-        if transposition and transposition[0] >= depth:
-            return transposition[1], transposition[2]
+        stats: SearchStats = self.stats
+        stats.nodes += 1
+        if stats.nodes % TimeManager.CHECK_INTERVAL == 0 and (self.cancellation.is_set() or self.time_manager.is_out_of_time(stats.nodes)):
+            self.bail = True
+        key, transform, transposition = self.__probe(board, player)
+        stats.probes += 1
+        hash_move: Optional[int] = None
+        if transposition:
+            stats.hits += 1
+            hash_move = transposition[3]
+        if ply > 0 and transposition and transposition[0] >= depth:
+            _, bound, stored_score, stored_move = transposition
+            if bound == Bound.EXACT:
+                stats.hash_cutoffs += 1
+                return stored_score, stored_move
+            if bound == Bound.LOWER:
+                alpha = max(alpha, stored_score)
+            else:
+                beta = min(beta, stored_score)
+            if alpha >= beta:
+                stats.hash_cutoffs += 1
+                return stored_score, stored_move
+
+        cache: MoveCache = self.move_cache
+        moves: int = cache.get_legal_moves(board.occupied, board.color, player)
+        opponent: Player = get_opponent(player)
+
+        if not moves:
+            if not cache.get_legal_moves(board.occupied, board.color, opponent):
+                return Bot.__get_final_score(board, player), None
+            if depth == 0 or self.bail:
+                stats.evaluations += 1
+                return self.evaluate(board, player), None
+            score, _ = self.__negamax(board, depth, ply + 1, -beta, -alpha, opponent)
+            return -score, None
 
-        moves: dict[tuple[int, int], list[tuple[int, int]]] = Game.get_moves(board, player)
+        if depth == 0 or (self.bail and ply > 0):
+            stats.evaluations += 1
+            return self.evaluate(board, player), None
 
-        if depth == 0 or len(moves) == 0 or Bot.bail:
-            score: float = Game.get_board_score(board, player)
-            return score, None
+        if self.probcut is not None and ply > 0 and beta - alpha <= Bot.__NULL_WINDOW:
+            cut: Optional[float] = self.__probcut(self.probcut, board, depth, ply, alpha, beta, player)
+            if cut is not None:
+                stats.probcuts += 1
+                return cut, None
         
-        if maximizingPlayer:
-            max_eval: float = -inf
-            eval: float = -inf
-            best_move: tuple = ()
-            for move in moves:
-                next_state: Board = board.deepcopy()
-                Game.play(next_state, player, move, moves, True)
-                eval, _ = self.__minimax(next_state, depth - 1, alpha, beta, False, get_opponent(player), start_time)
-                if eval > max_eval:
-                    max_eval = eval
-                    best_move = move
-                alpha = max(alpha, eval)
-                if beta <= alpha:
-                    break
-            Bot.transposition_table[board_hash] = (depth, max_eval, best_move)
-            return max_eval, best_move
+        original_alpha: float = alpha
+        best_score: float = -inf
+        best_move: int = -1
+        for move, flips in self.__order_moves(board, player, moves, depth, ply, hash_move):
+            board.make_move(move, flips, player)
+            if best_move < 0:
+                score = -self.__negamax(board, depth - 1, ply + 1, -beta, -alpha, opponent)[0]
+            else:
+                score = -self.__negamax(board, depth - 1, ply + 1, -alpha - Bot.__NULL_WINDOW, -alpha, opponent)[0]
+                if alpha < score < beta:
+                    score = -self.__negamax(board, depth - 1, ply + 1, -beta, -alpha, opponent)[0]
+            board.unmake_move(move, flips, player)
+            if score > best_score:
+                if best_score == -inf and score >= beta:
+                    stats.first_move_cutoffs += 1
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                stats.cutoffs += 1
+                self.__update_cutoff(player, move, depth, ply)
+                break
+        self.__store(key, transform, depth, best_score, best_move, original_alpha, beta)
+        return best_score, best_move
+
+    def __evaluate_heuristic(self, board: Board, player: Player) -> float:
+        """
+        Evaluates a leaf with `Game.get_incremental_score`, generating the mobility through the bot's move cache.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player): The player for whom the score is being calculated.
+
+        Returns:
+            float: The score of the position for the player.
+        """
+        return Game.get_incremental_score(board, player, self.move_cache)
+
+    def __probcut(self, probcut: ProbCut, board: Board, depth: int, ply: int, alpha: float, beta: float, player: Player) -> Optional[float]:
+        """
+        Predicts with shallow null-window searches whether the search of a node to the full depth would fail high or low.
+
+        Args:
+            probcut (ProbCut): The pruning parameters.
+            board (Board): The current state of the game board.
+            depth (int): The depth the node is to be searched to.
+            ply (int): The distance of the node from the root of the search.
+            alpha (float): The score the player to move is already guaranteed.
+            beta (float): The score the opponent is already guaranteed, as seen by the player to move.
+            player (Player): The player to move.
+
+        Returns:
+            Optional[float]: Beta if the node is predicted to fail high, alpha if it is predicted to fail low,
+            or None if it has to be searched.
+        """
+        if not (-ProbCut.SCORE_LIMIT < alpha and beta < ProbCut.SCORE_LIMIT):
+            return None
+        for shallow, slope, intercept, margin in probcut.get_checks(64 - board.occupied.bit_count(), depth):
+            bound: float = (beta + margin - intercept) / slope
+            if self.__negamax(board, shallow, ply, bound - Bot.__NULL_WINDOW, bound, player)[0] >= bound:
+                return None if self.bail else beta
+            bound = (alpha - margin - intercept) / slope
+            if self.__negamax(board, shallow, ply, bound, bound + Bot.__NULL_WINDOW, player)[0] <= bound:
+                return None if self.bail else alpha
+        return None
+
+    def __aspiration_search(self, board: Board, depth: int, guess: Optional[float], player: Player) -> tuple[float, Optional[int]]:
+        """
+        Searches the root position with an aspiration window around the score of the previous iteration.
+
+        If the score falls outside the window, the window is widened on that side and the position is searched again.
+
+        Args:
+            board (Board): The current state of the game board.
+            depth (int): The maximum depth to search in the game tree.
+            guess (Optional[float]): The score of the previous iteration, or None to search with the full window.
+            player (Player): The player to move.
+
+        Returns:
+            Tuple[float, Optional[int]]: The score and the best move (as a square index) found for the player.
+        """
+        if guess is None:
+            return self.__negamax(board, depth, 0, -inf, inf, player)
+
+        delta: float = Bot.__ASPIRATION_WINDOW
+        alpha: float = guess - delta
+        beta: float = guess + delta
+        while True:
+            score, move = self.__negamax(board, depth, 0, alpha, beta, player)
+            if self.bail or alpha < score < beta:
+                return score, move
+            delta *= 4
+            if delta > Bot.__MAX_ASPIRATION_WINDOW:
+                alpha, beta = -inf, inf
+            elif score <= alpha:
+                alpha = score - delta
+            else:
+                beta = score + delta
+
+    @staticmethod
+    def __get_final_score(board: Board, player: Player) -> float:
+        """
+        Scores a finished game from the point of view of the player. Any win scores above every heuristic score.
+
+        Args:
+            board (Board): The final state of the game board.
+            player (Player): The player for whom the score is being calculated.
+
+        Returns:
+            float: The disc difference of the player scaled by `Bot.__FINAL_SCORE`.
+        """
+        difference: int = board.white_tiles - board.black_tiles
+        if player == Player.BLACK:
+            difference = -difference
+        return float(difference * Bot.__FINAL_SCORE)
+
+    def __order_moves(self, board: Board, player: Player, moves: int, depth: int, ply: int, hash_move: Optional[int]) -> list[tuple[int, int]]:
+        """
+        Orders the legal moves so the moves most likely to cause a cutoff are searched first.
+
+        The move stored in the transposition table comes first, followed by the killer moves 
+        of the current ply. The remaining moves are ranked by the history table and a cheap 
+        static score: the positional weight of the square and, away from the leaves, 
+        the mobility the move leaves to the opponent. The flips and the mobility come from the 
+        move cache, which the search of the child positions then hits.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player): The player to move.
+            moves (int): A bitboard of the legal moves.
+            depth (int): The remaining search depth.
+            ply (int): The distance of the current position from the root of the search.
+            hash_move (Optional[int]): The best move stored in the transposition table, if any.
+
+        Returns:
+            list[tuple[int, int]]: The moves (square index) paired with their flips, best first.
+        """
+        occupied: int = board.occupied
+        color: int = board.color
+        placed: int = -1 if player == Player.WHITE else 0
+        opponent: Player = get_opponent(player)
+        cache: MoveCache = self.move_cache
+        killers: list[int] = self.killers[ply]
+        history: list[int] = self.history[player.value]
+        ordered: list[tuple[int, int, int]] = []
+        for move, flips in cache.get_flips(occupied, color, player).items():
+            if move == hash_move:
+                priority: int = Bot.__HASH_MOVE_PRIORITY
+            elif move == killers[0]:
+                priority = Bot.__KILLER_PRIORITY
+            elif move == killers[1]:
+                priority = Bot.__KILLER_PRIORITY - 1
+            else:
+                priority = history[move] + Matrix.SQUARE_WEIGHTS[move] * Bot.__WEIGHT_PRIORITY
+                if depth > 2:
+                    tile: int = 1 << move
+                    priority -= cache.get_legal_moves(occupied | tile, color ^ flips | tile & placed, opponent).bit_count() * Bot.__MOBILITY_PRIORITY
+            ordered.append((priority, move, flips))
+        ordered.sort(reverse=True)
+        return [(move, flips) for _, move, flips in ordered]
+
+    def __update_cutoff(self, player: Player, move: int, depth: int, ply: int) -> None:
+        """
+        Records a move that caused a beta cutoff in the killer and history tables.
+
+        Args:
+            player (Player): The player who made the move.
+            move (int): The square index of the move.
+            depth (int): The remaining search depth at which the cutoff happened.
+            ply (int): The distance of the position from the root of the search.
+        """
+        killers: list[int] = self.killers[ply]
+        if killers[0] != move:
+            killers[1] = killers[0]
+            killers[0] = move
+        self.history[player.value][move] += depth * depth
+
+    @staticmethod
+    def get_key(board: Board, player: Player) -> tuple[int, int]:
+        """
+        Computes the transposition table key of a position.
+
+        While there are at most `Bot.__SYMMETRY_DISCS` discs on the board, the key is the Zobrist hash
+        of the position's canonical orientation, so all symmetric positions share one key. Later in the game
+        positions are rarely symmetric, and the incremental hash of the board is used directly.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player): The player to move.
+
+        Returns:
+            tuple[int, int]: The key, including the side to move, and the transform from the board to the orientation it was computed for.
+        """
+        side: int = Zobrist.SIDE if player == Player.WHITE else 0
+        if board.occupied.bit_count() > Bot.__SYMMETRY_DISCS:
+            return board.hash ^ side, Symmetry.IDENTITY
+        occupied, color, transform = Symmetry.get_canonical(board.occupied, board.color)
+        if transform == Symmetry.IDENTITY:
+            return board.hash ^ side, transform
+        return Zobrist.get_hash(occupied, color) ^ side, transform
+
+    def __probe(self, board: Board, player: Player) -> tuple[int, int, Optional[tuple[int, Bound, float, Optional[int]]]]:
+        """
+        Looks up a position in the transposition table.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player): The player to move.
+
+        Returns:
+            tuple[int, int, Optional[tuple[int, Bound, float, Optional[int]]]]: The key and transform from `Bot.get_key`, 
+            and the depth, bound, score and best move of the entry, with the move mapped back onto the board, or None.
+        """
+        key, transform = Bot.get_key(board, player)
+        entry: Optional[tuple[int, Bound, float, Optional[int]]] = self.transposition_table.probe(key)
+        if entry is not None and entry[3] is not None and transform != Symmetry.IDENTITY:
+            entry = (entry[0], entry[1], entry[2], Symmetry.transform_square(entry[3], Symmetry.INVERSES[transform]))
+        return key, transform, entry
+
+    def __store(self, key: int, transform: int, depth: int, score: float, move: int, alpha: float, beta: float) -> None:
+        """
+        Stores a search result in the transposition table with the bound implied by the search window.
+
+        Results of a search that ran out of time are incomplete and are not stored.
+
+        Args:
+            key (int): The key of the position from `Bot.get_key`.
+            transform (int): The transform from the board to the orientation of the key.
+            depth (int): The depth the position was searched to.
+            score (float): The score returned by the search.
+            move (int): The best move (square index) found.
+            alpha (float): The lower end of the search window the position was searched with.
+            beta (float): The upper end of the search window the position was searched with.
+        """
+        if self.bail:
+            return
+        if score <= alpha:
+            bound: Bound = Bound.UPPER
+        elif score >= beta:
+            bound = Bound.LOWER
         else:
-            min_eval = inf
-            eval = inf
-            best_move = ()
-            for move in moves:
-                next_state = board.deepcopy()
-                Game.play(next_state, player, move, moves, True)
-                eval, _ = self.__minimax(next_state, depth - 1, alpha, beta, True, get_opponent(player), start_time)
-                if eval < min_eval:
-                    min_eval = eval
-                    best_move = move
-                beta = min(beta, eval)
-                if beta <= alpha:
-                    break
-            Bot.transposition_table[board_hash] = (depth, min_eval, best_move)
-            return min_eval, best_move        
+            bound = Bound.EXACT
+        if move >= 0:
+            move = Symmetry.transform_square(move, transform)
+        self.transposition_table.store(key, depth, bound, score, move)
+    
+    def cancel(self) -> None:
+        """
+        Stops the running search as soon as possible. The search returns the best move of its last completed iteration.
+        """
+        self.cancellation.set()
+
+    def prepare_search(self, clear_cancellation: bool = True) -> None:
+        """
+        Prepares the bot for a new search: clears the time-out flag, the cancellation token and the statistics, 
+        ages the transposition table, resets the killer moves and ages the history table.
+
+        Args:
+            clear_cancellation (bool, optional): Whether to clear the cancellation token. The helpers of a parallel 
+                search leave it to the main process, which may already have cancelled them. Defaults to True.
+        """
+        self.bail = False
+        if clear_cancellation:
+            self.cancellation.clear()
+        self.stats = SearchStats()
+        self.transposition_table.new_search()
+        for killers in self.killers:
+            killers[0] = killers[1] = -1
+        for history in self.history:
+            for square in range(64):
+                history[square] >>= 1
     
-    def bot_move(self, board: Board, time_limit: float = 3.0, depth_limit: int = 7) -> Optional[tuple[int, int]]:
-        """Finds the best possible move using the Minimax algorithm with iterative deepening.
+    def get_principal_variation(self, board: Board, player: Player, length: int) -> list[Optional[int]]:
+        """Follows the best moves stored in the transposition table from a searched position.
+
+        Args:
+            board (Board): The searched position.
+            player (Player): The player to move.
+            length (int): The maximum number of moves to follow.
+
+        Returns:
+            list[Optional[int]]: The expected moves (square indices), with None for a pass.
+        """
+        variation: list[Optional[int]] = []
+        board = board.deepcopy()
+        cache: MoveCache = self.move_cache
+        while len(variation) < length:
+            if not cache.get_legal_moves(board.occupied, board.color, player):
+                if not cache.get_legal_moves(board.occupied, board.color, get_opponent(player)):
+                    break
+                variation.append(None)
+                player = get_opponent(player)
+                continue
+            entry: Optional[tuple[int, Bound, float, Optional[int]]] = self.__probe(board, player)[2]
+            if entry is None or entry[3] is None:
+                break
+            flips: int = cache.get_flips(board.occupied, board.color, player).get(entry[3], 0)
+            if not flips:
+                break
+            board.make_move(entry[3], flips, player)
+            variation.append(entry[3])
+            player = get_opponent(player)
+        return variation
+
+    def search(self, board: Board, player: Player, depth: int) -> tuple[float, Optional[int]]:
+        """Searches the position with iterative deepening up to a fixed depth, for analysis and book building.
 
         Args:
             board (Board): The current state of the game board.
+            player (Player): The player to move.
+            depth (int): The depth to search to.
+
+        Returns:
+            tuple[float, Optional[int]]: The score for the player and the best move (as a square index), 
+            or None if the player has no legal move.
+        """
+        self.prepare_search()
+        _, score, move = self.iterative_deepening(board.deepcopy(), player, TimeManager(), depth)
+        return score, move
+
+    def iterative_deepening(self, board: Board, player: Player, time_manager: TimeManager, depth_limit: int, start_depth: int = 1, progress: Optional[Callable[[int, float, Optional[int]], None]] = None) -> tuple[int, float, Optional[int]]:
+        """Searches the position one depth at a time until the time manager stops starting new iterations.
+
+        The result of an iteration aborted by the time manager is discarded, so the best move always comes 
+        from the last completed iteration. The first iteration is always started, and if it does not complete, 
+        its partial result is used. The root position is never cut short, so there is always a move.
+
+        Args:
+            board (Board): The board to search on. Moves are played and reverted on it in place.
+            player (Player): The player to move.
+            time_manager (TimeManager): Decides when to stop the search.
+            depth_limit (int): The maximum depth to search in the game tree.
+            start_depth (int, optional): The depth of the first iteration. Defaults to 1.
+            progress (Optional[Callable[[int, float, Optional[int]], None]], optional): Called with the depth, score 
+                and best move (square index) of every completed iteration. Defaults to None.
+
+        Returns:
+            tuple[int, float, Optional[int]]: The depth of the last completed iteration, its score 
+            and its best move (as a square index).
+        """
+        self.time_manager = time_manager
+        completed_depth: int = 0
+        best_score: float = 0
+        best_move: Optional[int] = None
+        guess: Optional[float] = None
+        depth: int = start_depth
+        while depth <= depth_limit and (best_move is None or (time_manager.can_start_iteration(self.stats.nodes) and not self.cancellation.is_set())):
+            score, move = self.__aspiration_search(board, depth, guess, player)
+            if self.bail:
+                if best_move is None:
+                    best_score, best_move = score, move
+                break
+            completed_depth, best_score, best_move = depth, score, move
+            guess = score
+            time_manager.complete_iteration(move)
+            self.stats.add_iteration(depth, time_manager.get_elapsed(), score, move)
+            if progress is not None:
+                progress(depth, score, move)
+            depth += 1
+        return completed_depth, best_score, best_move
+
+    def bot_move(self, board: Board, player: Player = Player.WHITE, time_limit: float = 3.0, depth_limit: int = 7, node_limit: Optional[int] = None, progress: Optional[Callable[[int, float, Optional[int]], None]] = None, clear_cancellation: bool = True) -> tuple[Optional[tuple[int, int]], SearchStats]:
+        """Finds the best possible move using the Negamax algorithm with iterative deepening.
+
+        Pondering is stopped first. If the bot pondered this position and searched it at least to `depth_limit`, 
+        the pondered move is returned without searching again; otherwise the search reuses what pondering 
+        stored in the transposition table.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player, optional): The player to find a move for. Defaults to Player.WHITE.
             time_limit (float, optional): The maximum time allowed for the search in seconds. Defaults to 3.0.
             depth_limit (int, optional): The maximum depth to search in the game tree. Defaults to 7.
+            node_limit (Optional[int], optional): The number of nodes to search instead of limiting the time, 
+                so the result does not depend on the speed of the machine. Defaults to None.
+            progress (Optional[Callable[[int, float, Optional[int]], None]], optional): Called with the depth, score 
+                and best move (square index) of every completed iteration of the search. Defaults to None.
+            clear_cancellation (bool, optional): Whether to clear the cancellation token before searching. A caller that 
+                accepts the search in another thread than the one that may cancel it clears the token itself when it accepts 
+                the search (after `Bot.stop_pondering`), so a `Bot.cancel` sent before the search started is not lost. 
+                Defaults to True.
 
         Returns:
             
-            Optional[tuple[int, int]]: The coordinates of the best possible move found (row, column), 
-            or None if no move is available.
+            tuple[Optional[tuple[int, int]], SearchStats]: The coordinates of the best possible move found (row, column), 
+            or None if no move is available, and the statistics of the search.
         """
-        best_score: float = -inf
-        best_move: Optional[tuple] = ()
-        depth: int = 1
+        self.stop_pondering()
+        pondered: Optional[tuple[int, float, Optional[int]]] = None
+        if self.ponder_key == (board.occupied, board.color, player.value):
+            pondered = self.ponder_result
+        self.ponder_key = self.ponder_result = None
 
-        move_count: int = len(Game.get_moves(board, Player.WHITE))
+        move_count: int = self.move_cache.get_legal_moves(board.occupied, board.color, player).bit_count()
 
         if move_count == 0:
-            return None
+            self.stats = SearchStats()
+            return None, self.stats
 
-        Bot.bail = False
-        search_limit: float = (time_limit - 0.25) / move_count
-        start_time: float = time.time()
-        
-        while time.time() - start_time < search_limit and depth <= depth_limit:
-            score, move = self.__minimax(board, depth, -inf, inf, True, Player.WHITE, start_time)
-            if score > best_score:
-                best_score = score
-                best_move = move
+        if self.book is not None:
+            entry: Optional[tuple[int, float]] = self.book.lookup(board, player)
+            if entry is not None:
+                self.stats = SearchStats()
+                self.stats.source = "book"
+                self.stats.move, self.stats.score = entry
+                self.__log()
+                return Bitboard.to_position(entry[0]), self.stats
+
+        empties: int = 64 - board.occupied.bit_count()
+        if pondered is not None and pondered[2] is not None and (pondered[0] >= depth_limit or pondered[0] >= empties):
+            self.stats.source = "ponder"
+            self.stats.depth, self.stats.score, self.stats.move = pondered
+            self.__log()
+            return Bitboard.to_position(pondered[2]), self.stats
+
+        self.prepare_search(clear_cancellation)
+        stats: SearchStats = self.stats
+        cache_hits, cache_misses = self.move_cache.hits, self.move_cache.misses
+        time_manager: TimeManager = TimeManager(time_limit, empties, node_limit)
+        search_board: Board = board.deepcopy()
+
+        solved: Optional[tuple[int, Optional[int]]] = None
+        if empties <= self.endgame_empties:
+            solved = self.endgame.solve(search_board, player, time_manager.get_deadline(0.5), self.cancellation, time_manager.get_node_budget(0.5))
+            stats.nodes += self.endgame.nodes
+
+        if solved is not None:
+            stats.source = "endgame"
+            stats.score, stats.move = solved
+            stats.depth = empties
+        else:
             if move_count == 1:
-                break
-            depth += 1            
+                depth_limit = 1
+            helpers: list[Future] = []
+            if self.parallel is not None:
+                helpers = self.parallel.start(board, player, time_manager, depth_limit)
+            try:
+                stats.depth, stats.score, stats.move = self.iterative_deepening(search_board, player, time_manager, depth_limit, progress=progress)
+            finally:
+                if self.parallel is not None:
+                    self.parallel.stop(helpers)
 
-        
-        print(f"Time: {time.time() - start_time}")
-        print(f"Depth: {min(depth, depth_limit)}")
-        print(f"Move: {best_move}")
-                
-        return best_move
-        
\ No newline at end of file
+        stats.time = time_manager.get_elapsed()
+        stats.move_cache_hits = self.move_cache.hits - cache_hits
+        stats.move_cache_misses = self.move_cache.misses - cache_misses
+        self.__log()
+        return (Bitboard.to_position(stats.move) if stats.move is not None else None), stats
+
+    def __log(self) -> None:
+        """
+        Appends the statistics of the last search to the log file, if there is one.
+        """
+        if self.log_path is not None:
+            with open(self.log_path, "a") as log:
+                log.write(self.stats.to_json() + "\n")
+
+    def ponder(self, board: Board, player: Player) -> bool:
+        """Starts searching the opponent's predicted reply in the background, while the opponent is thinking.
+
+        The predicted reply is the best move stored in the transposition table for the position.
+        Pondering searches a copy of the board without a time limit until `Bot.stop_pondering` 
+        or `Bot.bot_move` is called. The transposition table, killer moves and history filled in 
+        by pondering are kept for the next search.
+
+        Args:
+            board (Board): The position after the bot's move, with the opponent to move.
+            player (Player): The player the bot plays.
+
+        Returns:
+            bool: True if pondering started; False if no reply could be predicted or the bot would have no move after it.
+        """
+        self.stop_pondering()
+        opponent: Player = get_opponent(player)
+        entry: Optional[tuple[int, Bound, float, Optional[int]]] = self.__probe(board, opponent)[2]
+        if entry is None or entry[3] is None:
+            return False
+        reply: int = entry[3]
+        flips: int = self.move_cache.get_flips(board.occupied, board.color, opponent).get(reply, 0)
+        if not flips:
+            return False
+
+        ponder_board: Board = board.deepcopy()
+        ponder_board.make_move(reply, flips, opponent)
+        if not self.move_cache.get_legal_moves(ponder_board.occupied, ponder_board.color, player):
+            return False
+        self.ponder_key = (ponder_board.occupied, ponder_board.color, player.value)
+        self.ponder_result = None
+        self.prepare_search()
+        self.ponder_thread = Thread(target=self.__ponder, args=(ponder_board, player), daemon=True)
+        self.ponder_thread.start()
+        return True
+
+    def stop_pondering(self) -> None:
+        """
+        Stops pondering and waits until the background search has finished. Does nothing if the bot is not pondering.
+        """
+        if self.ponder_thread is not None:
+            self.cancel()
+            self.ponder_thread.join()
+            self.ponder_thread = None
+
+    def __ponder(self, board: Board, player: Player) -> None:
+        """Searches the pondered position until cancelled, keeping the result of the last completed iteration.
+
+        Args:
+            board (Board): The pondered position, owned by the pondering thread.
+            player (Player): The player to move.
+        """
+        empties: int = 64 - board.occupied.bit_count()
+        if empties <= self.endgame_empties:
+            solved: Optional[tuple[int, Optional[int]]] = self.endgame.solve(board, player, inf, self.cancellation)
+            self.stats.nodes += self.endgame.nodes
+            if solved is not None:
+                self.ponder_result = (empties, solved[0], solved[1])
+                return
+        depth, score, move = self.iterative_deepening(board, player, TimeManager(), min(empties, Bot.__MAX_PONDER_DEPTH))
+        if depth > 0:
+            self.ponder_result = (depth, score, move)
@@ -0,0 +1,292 @@
+from models.board import Board
+from game.transposition_table import TranspositionTable
+from enums.bound import Bound
+from enums.player import Player
+from threading import Event
+from typing import Optional
+from math import inf
+import util.bitboard as Bitboard
+import util.zobrist as Zobrist
+import time
+
+class EndgameSolver:
+    """
+    Exact endgame solver.
+
+    Searches the game to the end and scores positions by the exact disc difference.
+    The solver first determines whether the position is a win, loss or draw with a
+    narrow window, and only then searches for the exact disc difference.
+
+    Moves are ordered fastest-first (fewest replies for the opponent), preferring regions
+    with an odd number of empty squares. The last four empty squares are solved by
+    dedicated code without move generation, ordering or caching.
+    """
+
+    QUADRANTS: list[int] = [0x000000000F0F0F0F, 0x00000000F0F0F0F0, 0x0F0F0F0F00000000, 0xF0F0F0F000000000]
+    """
+    Bit masks of the four 4x4 quadrants of the board, used for parity ordering.
+    """
+
+    __SMALL_EMPTIES: int = 4
+    __TIME_CHECK_INTERVAL: int = 1024
+
+    def __init__(self, hash_size_mb: float = 4) -> None:
+        """
+        Create a solver with its own cache of solved positions.
+
+        Args:
+            hash_size_mb (float, optional): The memory budget of the solved position cache in megabytes. Defaults to 4.
+        """
+        self.cache: TranspositionTable = TranspositionTable(hash_size_mb)
+        self.nodes: int = 0
+        self.bail: bool = False
+        self.deadline: float = 0
+        self.node_limit: float = inf
+        self.cancellation: Optional[Event] = None
+
+    def solve(self, board: Board, player: Player, deadline: float, cancellation: Optional[Event] = None, node_limit: float = inf) -> Optional[tuple[int, Optional[int]]]:
+        """
+        Solves the position exactly.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player): The player to move.
+            deadline (float): The time (as returned by `time.monotonic()`) by which the solver has to finish.
+            cancellation (Optional[Event], optional): A token that stops the solver when set. Defaults to None.
+            node_limit (float, optional): The number of nodes after which the solver gives up. Defaults to inf.
+
+        Returns:
+            Optional[tuple[int, Optional[int]]]: The final disc difference for the player with perfect play,
+            and the best move (square index), or None if the player has to pass.
+            Returns None if the position could not be solved before the deadline or within the node limit, or the solver was cancelled.
+        """
+        own, opponent = board.get_bitboards(player)
+        self.nodes = 0
+        self.bail = False
+        self.deadline = deadline
+        self.node_limit = node_limit
+        self.cancellation = cancellation
+        self.cache.new_search()
+
+        score, move = self.__solve_root(own, opponent, -1, 1)
+        if self.bail:
+            return None
+        if score > 0:
+            score, move = self.__solve_root(own, opponent, 0, 64)
+        elif score < 0:
+            score, move = self.__solve_root(own, opponent, -64, 0)
+
+        if self.bail:
+            return None
+        return score, move
+
+    def __solve_root(self, own: int, opponent: int, alpha: int, beta: int) -> tuple[int, Optional[int]]:
+        """
+        Solves the root position within the given window and keeps track of the best move.
+
+        Args:
+            own (int): The bitboard of the tiles of the player to move.
+            opponent (int): The bitboard of the opponent's tiles.
+            alpha (int): The lower end of the search window.
+            beta (int): The upper end of the search window.
+
+        Returns:
+            tuple[int, Optional[int]]: The disc difference and the best move (square index), or None if the player has to pass.
+        """
+        moves: int = Bitboard.get_legal_moves(own, opponent)
+        if not moves:
+            return -self.__solve(opponent, own, -beta, -alpha), None
+
+        best_score: int = -65
+        best_move: Optional[int] = None
+        for move, flips in self.__order_moves(own, opponent, moves):
+            tile: int = 1 << move
+            score: int = -self.__solve(opponent ^ flips, own | flips | tile, -beta, -alpha)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta or self.bail:
+                break
+        return best_score, best_move
+
+    def __solve(self, own: int, opponent: int, alpha: int, beta: int) -> int:
+        """
+        Solves a position within the given window.
+
+        Args:
+            own (int): The bitboard of the tiles of the player to move.
+            opponent (int): The bitboard of the opponent's tiles.
+            alpha (int): The lower end of the search window.
+            beta (int): The upper end of the search window.
+
+        Returns:
+            int: The final disc difference for the player to move, as a fail-soft bound if outside the window.
+        """
+        if self.bail:
+            return 0
+        self.nodes += 1
+        if self.nodes >= self.node_limit:
+            self.bail = True
+        elif self.nodes % EndgameSolver.__TIME_CHECK_INTERVAL == 0 and (
+            time.monotonic() >= self.deadline or (self.cancellation is not None and self.cancellation.is_set())
+        ):
+            self.bail = True
+        if self.bail:
+            return 0
+
+        empty: int = ~(own | opponent) & Bitboard.FULL
+        if empty.bit_count() <= EndgameSolver.__SMALL_EMPTIES:
+            return self.__solve_small(own, opponent, alpha, beta, empty, False)
+
+        key: int = Zobrist.get_bitboard_hash(own, opponent)
+        entry: Optional[tuple[int, Bound, float, Optional[int]]] = self.cache.probe(key)
+        if entry:
+            _, bound, stored, _ = entry
+            score: int = int(stored)
+            if bound == Bound.EXACT:
+                return score
+            if bound == Bound.LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if alpha >= beta:
+                return score
+
+        moves: int = Bitboard.get_legal_moves(own, opponent)
+        if not moves:
+            if not Bitboard.get_legal_moves(opponent, own):
+                return own.bit_count() - opponent.bit_count()
+            return -self.__solve(opponent, own, -beta, -alpha)
+
+        original_alpha: int = alpha
+        best_score: int = -65
+        best_move: Optional[int] = None
+        for move, flips in self.__order_moves(own, opponent, moves):
+            tile: int = 1 << move
+            score = -self.__solve(opponent ^ flips, own | flips | tile, -beta, -alpha)
+            if score > best_score:
+                best_score = score
+                best_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if not self.bail:
+            if best_score <= original_alpha:
+                bound = Bound.UPPER
+            elif best_score >= beta:
+                bound = Bound.LOWER
+            else:
+                bound = Bound.EXACT
+            self.cache.store(key, empty.bit_count(), bound, best_score, best_move)
+        return best_score
+
+    def __solve_small(self, own: int, opponent: int, alpha: int, beta: int, empty: int, passed: bool) -> int:
+        """
+        Solves a position with at most four empty squares by trying every empty square directly.
+
+        Args:
+            own (int): The bitboard of the tiles of the player to move.
+            opponent (int): The bitboard of the opponent's tiles.
+            alpha (int): The lower end of the search window.
+            beta (int): The upper end of the search window.
+            empty (int): The bitboard of the empty squares.
+            passed (bool): Whether the opponent has just passed.
+
+        Returns:
+            int: The final disc difference for the player to move, as a fail-soft bound if outside the window.
+        """
+        if not empty:
+            return own.bit_count() - opponent.bit_count()
+        if not empty & (empty - 1):
+            return EndgameSolver.__solve_last(own, opponent, empty)
+
+        best_score: int = -65
+        for move in EndgameSolver.__parity_order(empty):
+            flips: int = Bitboard.get_flips(own, opponent, move)
+            if not flips:
+                continue
+            tile: int = 1 << move
+            score: int = -self.__solve_small(opponent ^ flips, own | flips | tile, -beta, -alpha, empty ^ tile, False)
+            if score > best_score:
+                best_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        if best_score == -65:
+            if passed:
+                return own.bit_count() - opponent.bit_count()
+            return -self.__solve_small(opponent, own, -beta, -alpha, empty, True)
+        return best_score
+
+    @staticmethod
+    def __solve_last(own: int, opponent: int, empty: int) -> int:
+        """
+        Solves a position with a single empty square.
+
+        Args:
+            own (int): The bitboard of the tiles of the player to move.
+            opponent (int): The bitboard of the opponent's tiles.
+            empty (int): The bitboard of the last empty square.
+
+        Returns:
+            int: The final disc difference for the player to move.
+        """
+        move: int = empty.bit_length() - 1
+        difference: int = own.bit_count() - opponent.bit_count()
+        flipped: int = Bitboard.get_flips(own, opponent, move).bit_count()
+        if flipped:
+            return difference + 2 * flipped + 1
+        flipped = Bitboard.get_flips(opponent, own, move).bit_count()
+        if flipped:
+            return difference - 2 * flipped - 1
+        return difference
+
+    @staticmethod
+    def __parity_order(empty: int) -> list[int]:
+        """
+        Orders the empty squares so the squares in quadrants with an odd number of empty squares come first.
+
+        Args:
+            empty (int): The bitboard of the empty squares.
+
+        Returns:
+            list[int]: The square indices of the empty squares.
+        """
+        odd: int = 0
+        for quadrant in EndgameSolver.QUADRANTS:
+            if (empty & quadrant).bit_count() & 1:
+                odd |= quadrant
+        return Bitboard.iterate(empty & odd) + Bitboard.iterate(empty & ~odd)
+
+    @staticmethod
+    def __order_moves(own: int, opponent: int, moves: int) -> list[tuple[int, int]]:
+        """
+        Orders the moves fastest-first: moves leaving the opponent the fewest replies come first,
+        and moves in quadrants with an odd number of empty squares win ties.
+
+        Args:
+            own (int): The bitboard of the tiles of the player to move.
+            opponent (int): The bitboard of the opponent's tiles.
+            moves (int): A bitboard of the legal moves.
+
+        Returns:
+            list[tuple[int, int]]: The moves (square index) paired with their flips, best first.
+        """
+        empty: int = ~(own | opponent) & Bitboard.FULL
+        odd: int = 0
+        for quadrant in EndgameSolver.QUADRANTS:
+            if (empty & quadrant).bit_count() & 1:
+                odd |= quadrant
+        ordered: list[tuple[int, int, int]] = []
+        for move in Bitboard.iterate(moves):
+            flips: int = Bitboard.get_flips(own, opponent, move)
+            tile: int = 1 << move
+            replies: int = Bitboard.get_legal_moves(opponent ^ flips, own | flips | tile).bit_count()
+            ordered.append((2 * replies - (1 if tile & odd else 0), move, flips))
+        ordered.sort()
+        return [(move, flips) for _, move, flips in ordered]
@@ -0,0 +1,91 @@
+from pathlib import Path
+from typing import Any, Optional
+import util.matrix as Matrix
+import hashlib
+import json
+
+class EvaluationWeights:
+    """
+    Weights of the terms of the evaluation function (see `Game.get_board_score`).
+
+    The terms are the tile ratio (`tiles`), the corners (`corners`), the X and C squares next to
+    empty corners (`corner_neighbours`), the mobility ratio (`mobility`), the frontier ratio (`frontier`)
+    and the positional sum over `matrix` (`positional`). The weights are fitted by `main.py --tune`
+    and read from `EvaluationWeights.DEFAULT_PATH` and installed with `Game.set_weights` at startup.
+    """
+
+    DEFAULT_PATH: Path = Path(__file__).resolve().parent.parent.parent / "data" / "weights.json"
+    """
+    Location of the fitted weights, if they have been tuned.
+    """
+
+    TERMS: list[str] = ["tiles", "corners", "corner_neighbours", "mobility", "frontier", "positional"]
+    """
+    Names of the term weights, in the order of the evaluation function.
+    """
+
+    __DEFAULT_TERMS: list[float] = [10, 801.724, 382.026, 78.922, 74.396, 10]
+    __DEFAULT_MATRIX: list[list[int]] = [list(row) for row in Matrix.HEURISTIC_MATRIX]
+
+    def __init__(self, terms: Optional[list[float]] = None, matrix: Optional[list[list[int]]] = None) -> None:
+        """
+        Create a set of weights.
+
+        Args:
+            terms (Optional[list[float]], optional): The term weights in the order of `EvaluationWeights.TERMS`. Defaults to None, which uses the built-in weights.
+            matrix (Optional[list[list[int]]], optional): The weight of every position. Defaults to None, which uses the built-in matrix.
+        """
+        tiles, corners, corner_neighbours, mobility, frontier, positional = terms if terms is not None else EvaluationWeights.__DEFAULT_TERMS
+        self.tiles: float = tiles
+        self.corners: float = corners
+        self.corner_neighbours: float = corner_neighbours
+        self.mobility: float = mobility
+        self.frontier: float = frontier
+        self.positional: float = positional
+        self.matrix: list[list[int]] = [list(row) for row in (matrix if matrix is not None else EvaluationWeights.__DEFAULT_MATRIX)]
+
+    def get_terms(self) -> list[float]:
+        """
+        Returns:
+            list[float]: The term weights in the order of `EvaluationWeights.TERMS`.
+        """
+        return [self.tiles, self.corners, self.corner_neighbours, self.mobility, self.frontier, self.positional]
+
+    @staticmethod
+    def load(path: Path = DEFAULT_PATH) -> 'EvaluationWeights':
+        """
+        Read a weights file.
+
+        Args:
+            path (Path, optional): The weights file. Defaults to `EvaluationWeights.DEFAULT_PATH`.
+
+        Returns:
+            EvaluationWeights: The weights in the file, or the built-in weights if it does not exist.
+        """
+        if not path.exists():
+            return EvaluationWeights()
+        with open(path) as file:
+            data: dict[str, Any] = json.load(file)
+        return EvaluationWeights([data[term] for term in EvaluationWeights.TERMS], data["matrix"])
+
+    def get_fingerprint(self) -> str:
+        """
+        Identify the weights, so parameters fitted to the scores of the evaluation can be matched to them.
+
+        Returns:
+            str: A hexadecimal digest of the term weights and the matrix.
+        """
+        return hashlib.sha256(json.dumps([self.get_terms(), self.matrix]).encode()).hexdigest()[:16]
+
+    def write(self, path: Path) -> None:
+        """
+        Write the weights to a file.
+
+        Args:
+            path (Path): The weights file to write.
+        """
+        data: dict[str, Any] = dict(zip(EvaluationWeights.TERMS, self.get_terms()))
+        data["matrix"] = self.matrix
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump(data, file, indent=1)
@@ -1,21 +1,51 @@
 from models.board import Board
+from models.game_state import GameState
+from game.evaluation_weights import EvaluationWeights
+from game.move_cache import MoveCache
 from typing import Optional
 from enums.game_result import GameResult
 from enums.player import Player, get_opponent
 import util.matrix as Matrix
+import util.bitboard as Bitboard
 
 class Game:
-    """Othello game static class. It stores all possible moves, current player and number of tiles for each player.
+    """Othello game static class. It implements the rules of the game.
+
+    The player to move is kept by `Game.state`, a default game used by the methods that do not 
+    take a player. Code playing several games at once creates a `GameState` for each game instead.
     """    
-    legal_moves: dict[tuple[int, int], list[tuple[int, int]]] = {}
-    current_player: Player = Player.BLACK
-    black_tiles: int = 2
-    white_tiles: int = 2
+    weights: EvaluationWeights = EvaluationWeights()
+    """
+    Weights of the evaluation. The built-in weights until others are installed with `Game.set_weights`.
+    """
+    state: GameState = GameState()
+    move_cache: MoveCache = GameState.move_cache
+    """
+    The legal move cache shared with every `GameState`, which the games and user interfaces of the process go through. 
+    It is not locked, so it is only used from one thread; every bot searches with its own cache (see `Bot.move_cache`).
+    """
     
+    @staticmethod
+    def set_weights(weights: EvaluationWeights) -> None:
+        """Installs the weights of the evaluation and makes their matrix the heuristic matrix used by the boards.
+
+        Boards keep the positional sum of the matrix they were built with, so the weights are installed 
+        at startup, before any board is created (see `main.py`), and in every worker process.
+
+        Args:
+            weights (EvaluationWeights): The weights to evaluate with.
+        """
+        if weights.matrix != Matrix.HEURISTIC_MATRIX:
+            Matrix.set_heuristic_matrix(weights.matrix)
+        Game.weights = weights
+
     @staticmethod
     def get_moves(board: Board, player: Player) -> dict[tuple[int, int], list[tuple[int, int]]]:
         """Gets all possible moves for the specified player.
 
+        This is a compatibility view over `Game.get_legal_moves` and `Game.get_flips`; 
+        the search works with the bitboards directly.
+
         Args:
             board (Board): The current state of the game board.
             player (Player): The player for whom to find possible moves.
@@ -26,25 +56,52 @@ class Game:
             to a list of opponent positions that can be captured or affected by that move.
         """
         moves: dict[tuple[int,int],list[tuple[int,int]]] = {}
-        for x in range(Board.SIZE):
-            for y in range(Board.SIZE):
-                opponents: list[tuple[int, int]] = Game.__is_legal_move(board, player, (x,y))
-                if opponents:
-                    moves[(x,y)] = opponents
+        for square, flips in Game.move_cache.get_flips(board.occupied, board.color, player).items():
+            moves[Bitboard.to_position(square)] = [Bitboard.to_position(flip) for flip in Bitboard.iterate(flips)]
 
         return moves
+
+    @staticmethod
+    def get_legal_moves(board: Board, player: Player) -> int:
+        """Gets all possible moves for the specified player as a bitboard.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player): The player for whom to find possible moves.
+
+        Returns:
+            int: A bitboard with a bit set for every square the player can legally play.
+        """
+        return Game.move_cache.get_legal_moves(board.occupied, board.color, player)
+
+    @staticmethod
+    def get_flips(board: Board, player: Player, square: int) -> int:
+        """Gets the opponent discs flipped by a move.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player): The player making the move.
+            square (int): The index of the square being played (row * 8 + column).
+
+        Returns:
+            int: A bitboard of all opponent discs flipped by the move. Zero if the move is not legal.
+        """
+        return Game.move_cache.get_flips(board.occupied, board.color, player).get(square, 0)
         
     @staticmethod
     def has_ended(board: Board) -> bool:
-        if len(Game.get_moves(board, Game.current_player)) == 0 and len(Game.get_moves(board, Player.WHITE)) == 0:
+        if not Game.get_legal_moves(board, Game.state.current_player) and not Game.get_legal_moves(board, Player.WHITE):
             return True
         
         return False
         
     @staticmethod
-    def get_winner() -> GameResult:
+    def get_winner(board: Board) -> GameResult:
         """Determines the winner of the game if it has concluded.
 
+        Args:
+            board (Board): The current state of the game board.
+
         Returns:
             
             GameResult: An enumeration representing the outcome of the game. 
@@ -54,46 +111,37 @@ class Game:
                 - GameResult.DRAW: The game ended in a draw.
                 - GameResult.NO_WINNER: The game is still ongoing.
         """
-        if Game.white_tiles > Game.black_tiles:
+        if board.white_tiles > board.black_tiles:
             return GameResult.WHITE_WINS
-        elif Game.white_tiles < Game.black_tiles:
+        elif board.white_tiles < board.black_tiles:
             return GameResult.BLACK_WINS
-        elif Game.white_tiles == Game.black_tiles:
+        elif board.white_tiles == board.black_tiles:
             return GameResult.DRAW
         return GameResult.NO_WINNER
     
     @staticmethod
-    def play(board: Board, player: Player, position: tuple[int, int], legal_moves: Optional[dict[tuple[int, int], list[tuple[int, int]]]] = None, bot: bool = False) -> bool:
+    def play(board: Board, player: Player, position: tuple[int, int], legal_moves: Optional[int] = None) -> bool:
         """Executes a turn for the specified player at the given position.
 
         Args:
             board (Board): The current state of the game board.
             player (Player): The player making the move.
             position (tuple[int, int]): The coordinates of the position (row, column) where the player wants to play.
-            legal_moves (Optional[dict[tuple[int, int], list[tuple[int, int]]]]): A dictionary of legal moves available 
-                for the player. Defaults to None, which uses the game's legal moves.
-            bot (bool): Indicates whether the method is called by a bot. Defaults to False.
+            legal_moves (Optional[int]): A bitboard of the legal moves of the player, such as `GameState.legal_moves`. 
+                It is only used to check that the move is legal; the flips are always computed from the board. 
+                Defaults to None, which computes the legal moves of the player.
 
         Returns:
             bool: True if the move was successfully executed; False if the move is not possible.
         """
-        if not legal_moves:
-            legal_moves = Game.legal_moves
-        if position not in legal_moves:
+        if legal_moves is None:
+            legal_moves = Game.get_legal_moves(board, player)
+        square: int = Bitboard.to_square(position)
+        if not legal_moves >> square & 1:
             print("Cannot make that move!")
             return False
         
-        board.set_tile(position, player)
-        for opponent in legal_moves[position]:
-            board.replace_opponent(opponent)
-        
-        if not bot:
-            if player == Player.BLACK:
-                Game.black_tiles += 1 + len(legal_moves[position])
-                Game.white_tiles -= len(legal_moves[position])
-            else:
-                Game.black_tiles -= len(legal_moves[position])
-                Game.white_tiles += 1 + len(legal_moves[position])
+        board.make_move(square, Game.get_flips(board, player, square), player)
 
         return True
 
@@ -110,241 +158,104 @@ class Game:
             based on the current board configuration. A higher score indicates a more favorable 
             position for the player.
         """
-        opponent: Player = get_opponent(player)
-        player_tiles: int = 0
-        opponent_tiles: int = 0
-        my_front_tiles: int = 0
-        opp_front_tiles: int = 0
+        own, opponent = board.get_bitboards(player)
+        empty: int = ~board.occupied & Bitboard.FULL
         p: float = 0
         c: float = 0
         l: float = 0
-        m: float = 0
-        f: float = 0
         d: float = 0
 
-        for i in range(Board.SIZE):
-            for j in range(Board.SIZE):
-                if board.get_tile_color((i,j)) == player:
-                    d += Matrix.HEURISTIC_MATRIX[i][j]
-                    player_tiles += 1
-                elif board.get_tile_color((i,j)) == opponent:
-                    d -= Matrix.HEURISTIC_MATRIX[i][j]
-                    opponent_tiles += 1
-                if board.is_occupied((i,j)):
-                    for direction in Matrix.DIRECTIONS:
-                        x = i + direction[0]
-                        y = j + direction[1]
-                        if x >= 0 and x < 8 and y >= 0 and y < 8 and not board.is_occupied((x,y)):
-                            if board.get_tile_color((i, j)) == player:
-                                my_front_tiles += 1
-                            elif board.get_tile_color((i,j)) == opponent:
-                                opp_front_tiles += 1
-                            break
-                        
-        if player_tiles > opponent_tiles:
-            p = (100.0 * player_tiles) / (player_tiles + opponent_tiles)
-        elif player_tiles < opponent_tiles:
-            p = -(100.0 * opponent_tiles) / (player_tiles + opponent_tiles)
-        else:
-            p = 0
+        for weight, mask in Matrix.HEURISTIC_MASKS:
+            d += weight * ((own & mask).bit_count() - (opponent & mask).bit_count())
 
-        if my_front_tiles > opp_front_tiles:
-            f = -(100.0 * my_front_tiles) / (my_front_tiles + opp_front_tiles)
-        elif my_front_tiles < opp_front_tiles:
-            f = (100.0 * opp_front_tiles) / (my_front_tiles + opp_front_tiles)
-        else:
-            f = 0
-            
-        player_tiles = 0
-        opponent_tiles = 0
-
-        if board.get_tile_color((0,0)) == player:
-            player_tiles += 1
-        elif board.get_tile_color((0,0)) == opponent:
-            opponent_tiles += 1
-
-        if board.get_tile_color((0,7)) == player:
-            player_tiles += 1
-        elif board.get_tile_color((0,7)) == opponent:
-            opponent_tiles += 1
-
-        if board.get_tile_color((7,0)) == player:
-            player_tiles += 1
-        elif board.get_tile_color((7,0)) == opponent:
-            opponent_tiles += 1
-
-        if board.get_tile_color((7,7)) == player:
-            player_tiles += 1
-        elif board.get_tile_color((7,7)) == opponent:
-            opponent_tiles += 1
-        c = 25 * (player_tiles - opponent_tiles)
-
-        player_tiles = 0
-        opponent_tiles = 0
-
-        if not board.is_occupied((0, 0)):
-            if board.get_tile_color((0, 1)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((0, 1)) == opponent:
-                opponent_tiles += 1
-
-            if board.get_tile_color((1, 1)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((1, 1)) == opponent:
-                opponent_tiles += 1
-
-            if board.get_tile_color((1, 0)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((1, 0)) == opponent:
-                opponent_tiles += 1
-
-        if not board.is_occupied((0, 7)):
-            if board.get_tile_color((0, 6)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((0, 6)) == opponent:
-                opponent_tiles += 1
-
-            if board.get_tile_color((1, 6)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((1, 6)) == opponent:
-                opponent_tiles += 1
-
-            if board.get_tile_color((1, 7)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((1, 7)) == opponent:
-                opponent_tiles += 1
-
-        if not board.is_occupied((7, 0)):
-            if board.get_tile_color((7, 1)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((7, 1)) == opponent:
-                opponent_tiles += 1
-
-            if board.get_tile_color((6, 1)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((6, 1)) == opponent:
-                opponent_tiles += 1
-
-            if board.get_tile_color((6, 0)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((6, 0)) == opponent:
-                opponent_tiles += 1
-
-        if not board.is_occupied((7, 7)):
-            if board.get_tile_color((6, 7)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((6, 7)) == opponent:
-                opponent_tiles += 1
-
-            if board.get_tile_color((6, 6)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((6, 6)) == opponent:
-                opponent_tiles += 1
-
-            if board.get_tile_color((7, 6)) == player:
-                player_tiles += 1
-            elif board.get_tile_color((7, 6)) == opponent:
-                opponent_tiles += 1
+        p = Game.__get_ratio(own.bit_count(), opponent.bit_count())
 
-        l = -12.5 * (player_tiles - opponent_tiles)
-        
-        player_tiles = len(Game.get_moves(board, player))
-        opponent_tiles = len(Game.get_moves(board, opponent))
+        c = 25 * ((own & Matrix.CORNERS).bit_count() - (opponent & Matrix.CORNERS).bit_count())
 
-        if player_tiles > opponent_tiles:
-            m = (100.0 * player_tiles) / (player_tiles + opponent_tiles)
-        elif player_tiles < opponent_tiles:
-            m = -(100.0 * opponent_tiles) / (player_tiles + opponent_tiles)
-        else:
-            m = 0
+        player_tiles: int = 0
+        opponent_tiles: int = 0
+        for corner, neighbours in Matrix.CORNER_NEIGHBOURS:
+            if empty & corner:
+                player_tiles += (own & neighbours).bit_count()
+                opponent_tiles += (opponent & neighbours).bit_count()
+        l = -12.5 * (player_tiles - opponent_tiles)
 
-        score = (10 * p) + (801.724 * c) + (382.026 * l) + (78.922 * m) + (74.396 * f) + (10 * d)
-        return score
+        return Game.__get_score(board, player, own, opponent, p, c, l, d, Game.move_cache)
 
     @staticmethod
-    def switch_player() -> None:
-        """Switches current player.
-        """
-        Game.current_player = get_opponent(Game.current_player)
-    
-            
-    @staticmethod
-    def __is_inside_board(position: tuple[int, int]) -> bool:
-        """Checks if the given position is within the boundaries of the board.
+    def get_incremental_score(board: Board, player: Player, cache: Optional[MoveCache] = None) -> float:
+        """Calculates the same score as `Game.get_board_score` from the running terms kept by the board.
 
-        Args:
-            position (tuple[int, int]): The position to check, represented as (row, column).
-
-        Returns:
-            bool: True if the position is within the board's boundaries; 
-                False if it is outside.
-        """
-        return (position[0] >= 0 and position[0] < Board.SIZE) and (position[1] >= 0 and position[1] < Board.SIZE)
-    
-    @staticmethod
-    def __get_opponents_in_dir(board: Board, player: Player, position: tuple[int, int], direction: tuple[int, int]) -> list[tuple[int, int]]:
-        """Retrieves all opponent pieces in the specified direction from a given position.
+        Tile counts, the positional sum and the corner terms are updated by `Board.make_move` 
+        and `Board.unmake_move`, so only the frontier and mobility terms are computed here.
 
         Args:
             board (Board): The current state of the game board.
-            player (Player): The player for whom the check is being performed.
-            position (tuple[int, int]): The starting position (row, column) from which to check.
-            direction (tuple[int, int]): The direction to check, represented as a vector (row_offset, column_offset) 
-                                        from the Matrix.DIRECTIONS.
+            player (Player): The player for whom the score is being calculated.
+            cache (Optional[MoveCache], optional): The cache the mobility is generated through. Defaults to None, which uses `Game.move_cache`.
 
         Returns:
-            list[tuple[int, int]]: A list of positions (row, column) of all opponent pieces found in the specified direction.
+            float: The calculated score representing the player's advantage or disadvantage 
+            based on the current board configuration. A higher score indicates a more favorable 
+            position for the player.
         """
-        opponents: list[tuple[int, int]] = []
-        current_position: tuple[int, int] = (position[0] + direction[0], position[1] + direction[1])
-        opponent: Player = get_opponent(player)
-
-        while Game.__is_inside_board(current_position) and board.is_occupied(current_position):
-            if board.get_tile_color(current_position) == opponent:
-                opponents += [current_position]
-                current_position = (current_position[0] + direction[0], current_position[1] + direction[1])
-            else:
-                return opponents
-        
-        return []
+        own, opponent = board.get_bitboards(player)
+        if player == Player.WHITE:
+            p: float = Game.__get_ratio(board.white_tiles, board.black_tiles)
+            sign: int = 1
+        else:
+            p = Game.__get_ratio(board.black_tiles, board.white_tiles)
+            sign = -1
+        c: float = 25 * sign * board.corners
+        l: float = -12.5 * sign * board.corner_neighbours
+        d: float = sign * board.positional
+        return Game.__get_score(board, player, own, opponent, p, c, l, d, cache if cache is not None else Game.move_cache)
 
-    
     @staticmethod
-    def __get_opponents(board: Board, player: Player, position: tuple[int, int]) -> list[tuple[int, int]]:
-        """Retrieves all opponent pieces adjacent to the specified position.
+    def __get_score(board: Board, player: Player, own: int, opponent: int, p: float, c: float, l: float, d: float, cache: MoveCache) -> float:
+        """Computes the frontier and mobility terms and combines them with the remaining terms into the final score.
 
         Args:
             board (Board): The current state of the game board.
-            player (Player): The player for whom the check is being performed.
-            position (tuple[int, int]): The position (row, column) from which to check for opponents.
+            player (Player): The player for whom the score is being calculated.
+            own (int): The bitboard of the player's tiles.
+            opponent (int): The bitboard of the opponent's tiles.
+            p (float): The tile count term.
+            c (float): The corner term.
+            l (float): The X and C squares term.
+            d (float): The positional term.
+            cache (MoveCache): The cache the mobility is generated through.
 
         Returns:
-            list[tuple[int, int]]: A list of positions (row, column) of all opponent pieces adjacent 
-            to the specified position.
+            float: The weighted sum of all terms.
         """
-        opponents: list[tuple[int, int]] = []
-        for direction in Matrix.DIRECTIONS:
-            opps: list[tuple[int, int]] = Game.__get_opponents_in_dir(board, player, position, direction)    
-            if not opps:
-                continue
-            opponents += opps
-        return opponents        
-    
+        frontier: int = Bitboard.get_neighbours(~(own | opponent) & Bitboard.FULL)
+        f: float = -Game.__get_ratio((own & frontier).bit_count(), (opponent & frontier).bit_count())
+        m: float = Game.__get_ratio(cache.get_legal_moves(board.occupied, board.color, player).bit_count(), cache.get_legal_moves(board.occupied, board.color, get_opponent(player)).bit_count())
+
+        weights: EvaluationWeights = Game.weights
+        score = (weights.tiles * p) + (weights.corners * c) + (weights.corner_neighbours * l) + (weights.mobility * m) + (weights.frontier * f) + (weights.positional * d)
+        return score
+
     @staticmethod
-    def __is_legal_move(board: Board, player: Player, position: tuple[int, int]) -> list[tuple[int, int]]:
-        """Checks if a move to the specified position is legal for the given player.
+    def __get_ratio(player_count: int, opponent_count: int) -> float:
+        """Computes the share of the larger count as a percentage, signed in favour of the player.
 
         Args:
-            board (Board): The current state of the game board.
-            player (Player): The player attempting to make the move.
-            position (tuple[int, int]): The target position (row, column) for the move.
+            player_count (int): The count for the player.
+            opponent_count (int): The count for the opponent.
 
         Returns:
-            list[tuple[int, int]]: An empty list if the move is not legal; 
-            otherwise, a list of positions (row, column) of all opponent pieces 
-            that would be captured by the move.
+            float: A value between -100 and 100, or 0 if the counts are equal.
         """
-        if board.is_occupied(position):
-            return []
-        
-        return Game.__get_opponents(board, player, position)
+        if player_count > opponent_count:
+            return (100.0 * player_count) / (player_count + opponent_count)
+        elif player_count < opponent_count:
+            return -(100.0 * opponent_count) / (player_count + opponent_count)
+        return 0
+
+    @staticmethod
+    def switch_player() -> None:
+        """Switches the current player of the default game.
+        """
+        Game.state.switch_player()
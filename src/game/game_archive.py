@@ -0,0 +1,390 @@
+from models.board import Board
+from models.game_state import GameState
+from enums.player import Player, get_opponent
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+import util.bitboard as Bitboard
+import heapq
+import mmap
+import os
+import struct
+
+class GameRecord:
+    """
+    A finished game as stored in a `GameArchive`.
+
+    The game is kept as the square indexes of its moves; passes are not stored, since
+    they follow from the rules when the game is replayed.
+    """
+
+    def __init__(
+        self,
+        moves: list[int],
+        result: int,
+        engines: tuple[str, str] = ("", ""),
+        times: tuple[float, float] = (0.0, 0.0),
+        start: Optional[tuple[int, int, Player]] = None,
+    ) -> None:
+        """
+        Create a game record.
+
+        Args:
+            moves (list[int]): The square indexes of the moves played, in order.
+            result (int): The final disc difference in favour of black.
+            engines (tuple[str, str], optional): The settings of the black and white engine. Defaults to ("", "").
+            times (tuple[float, float], optional): The time black and white spent searching in seconds. Defaults to (0.0, 0.0).
+            start (Optional[tuple[int, int, Player]], optional): The occupied and color bitboards and player to move
+                of the position the game started from. Defaults to None, which is the starting position.
+        """
+        self.moves: list[int] = moves
+        self.result: int = result
+        self.engines: tuple[str, str] = engines
+        self.times: tuple[float, float] = times
+        self.start: tuple[int, int, Player] = start if start is not None else GameRecord.get_standard_start()
+
+    @staticmethod
+    def get_standard_start() -> tuple[int, int, Player]:
+        """
+        Returns:
+            tuple[int, int, Player]: The occupied and color bitboards and player to move of the starting position.
+        """
+        board: Board = Board()
+        return board.occupied, board.color, Player.BLACK
+
+    @staticmethod
+    def from_state(state: GameState, engines: tuple[str, str] = ("", ""), times: tuple[float, float] = (0.0, 0.0)) -> 'GameRecord':
+        """
+        Create the record of a game played with a `GameState`.
+
+        Args:
+            state (GameState): The game.
+            engines (tuple[str, str], optional): The settings of the black and white engine. Defaults to ("", "").
+            times (tuple[float, float], optional): The time black and white spent searching in seconds. Defaults to (0.0, 0.0).
+
+        Returns:
+            GameRecord: The record of the game.
+        """
+        return GameRecord(list(state.history), state.board.black_tiles - state.board.white_tiles, engines, times, state.start)
+
+    def replay(self) -> Iterator[tuple[Board, Player]]:
+        """
+        Replays the game.
+
+        The same board is updated in place and yielded for every position, so it has to be
+        copied to be kept.
+
+        Yields:
+            tuple[Board, Player]: The position the game started from and the position after every move,
+            with the player to move.
+
+        Raises:
+            ValueError: If a move of the record is not legal.
+        """
+        occupied, color, player = self.start
+        board: Board = Board.from_bitboards(occupied, color)
+        yield board, player
+        for square in self.moves:
+            own, opponent = board.get_bitboards(player)
+            if not Bitboard.get_legal_moves(own, opponent):
+                player = get_opponent(player)
+                own, opponent = opponent, own
+            flips: int = Bitboard.get_flips(own, opponent, square)
+            if not flips:
+                raise ValueError(f"Illegal move {Bitboard.to_position(square)} in game record")
+            board.make_move(square, flips, player)
+            player = get_opponent(player)
+            yield board, player
+
+
+class GameArchive:
+    """
+    Archive of finished games stored in a compact binary file, with a sidecar index of the positions reached.
+
+    The archive file starts with a header (magic bytes and format version) followed by the games.
+    Every game is a fixed-size header:
+    - `flags` (1 byte): Whether the game started from another position than the starting position.
+    - `moves` (1 byte): The number of moves.
+    - `result` (1 byte): The final disc difference in favour of black.
+    - `engines` (2 * 2 bytes): The black and white engine as line numbers of the engine file.
+    - `times` (2 * 4 bytes): The time black and white spent searching in seconds.
+
+    followed by the occupied and color bitboards of the first position (2 * 8 bytes, only for games
+    that did not start from the starting position) and one byte per move holding its square index.
+    A game is identified by its byte offset in the archive.
+
+    The engine settings are stored once per distinct setting, one per line, in `<archive>.engines`.
+    The index file `<archive>.idx` holds a header (magic bytes, format version and record count) and
+    fixed-size records sorted by position:
+    - `occupied` (8 bytes) and `color` (8 bytes): The bitboards of a position.
+    - `offset` (8 bytes): The offset of a game that reached the position.
+
+    Both files are memory-mapped, so replaying the games or finding the games that reached a position
+    does not load the archive into Python objects.
+    """
+
+    MAGIC: bytes = b"OTHG"
+    INDEX_MAGIC: bytes = b"OTHI"
+    VERSION: int = 1
+    HEADER: struct.Struct = struct.Struct("<4sI")
+    GAME: struct.Struct = struct.Struct("<BBbxHHff")
+    START: struct.Struct = struct.Struct("<QQ")
+    INDEX_HEADER: struct.Struct = struct.Struct("<4sIQ")
+    INDEX_RECORD: struct.Struct = struct.Struct("<QQQ")
+
+    __CUSTOM_START: int = 1
+    __WHITE_STARTS: int = 2
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open an archive for reading. Games appended after opening are not seen by this instance.
+
+        Args:
+            path (Path): The path of the archive file.
+
+        Raises:
+            ValueError: If the file or its index is not a game archive.
+        """
+        with open(path, "rb") as file:
+            self.data: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = GameArchive.HEADER.unpack_from(self.data, 0)
+        if magic != GameArchive.MAGIC or version != GameArchive.VERSION:
+            self.data.close()
+            raise ValueError(f"{path} is not a game archive")
+        self.engines: list[str] = GameArchive.__read_engines(path)
+        self.index: Optional[mmap.mmap] = None
+        self.count: int = 0
+        """
+        Number of records in the position index.
+        """
+        index_path: Path = GameArchive.get_index_path(path)
+        if index_path.exists():
+            with open(index_path, "rb") as file:
+                self.index = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.count = GameArchive.INDEX_HEADER.unpack_from(self.index, 0)
+            if magic != GameArchive.INDEX_MAGIC or version != GameArchive.VERSION:
+                self.close()
+                raise ValueError(f"{index_path} is not a game archive index")
+
+    def close(self) -> None:
+        """
+        Close the memory-mapped files.
+        """
+        self.data.close()
+        if self.index is not None:
+            self.index.close()
+
+    @staticmethod
+    def get_index_path(path: Path) -> Path:
+        """
+        Args:
+            path (Path): The path of the archive file.
+
+        Returns:
+            Path: The path of the position index of the archive.
+        """
+        return path.with_name(path.name + ".idx")
+
+    @staticmethod
+    def get_engines_path(path: Path) -> Path:
+        """
+        Args:
+            path (Path): The path of the archive file.
+
+        Returns:
+            Path: The path of the engine settings of the archive.
+        """
+        return path.with_name(path.name + ".engines")
+
+    def read(self, offset: int) -> GameRecord:
+        """
+        Read a game.
+
+        Args:
+            offset (int): The offset of the game in the archive.
+
+        Returns:
+            GameRecord: The game.
+        """
+        return self.__read(offset)[0]
+
+    def games(self) -> Iterator[tuple[int, GameRecord]]:
+        """
+        Read the games one by one, in the order they were appended.
+
+        Yields:
+            tuple[int, GameRecord]: The offset and record of every game.
+        """
+        offset: int = GameArchive.HEADER.size
+        while offset < len(self.data):
+            record, end = self.__read(offset)
+            yield offset, record
+            offset = end
+
+    def find(self, board: Board) -> list[int]:
+        """
+        Find the games that reached a position.
+
+        Args:
+            board (Board): The position.
+
+        Returns:
+            list[int]: The offsets of the games in the archive, in the order they were appended.
+        """
+        if self.index is None:
+            return []
+        key: tuple[int, int] = (board.occupied, board.color)
+        low: int = 0
+        high: int = self.count
+        while low < high:
+            middle: int = (low + high) // 2
+            occupied, color, _ = self.__get_index_record(middle)
+            if (occupied, color) < key:
+                low = middle + 1
+            else:
+                high = middle
+        offsets: list[int] = []
+        while low < self.count:
+            occupied, color, offset = self.__get_index_record(low)
+            if (occupied, color) != key:
+                break
+            offsets.append(offset)
+            low += 1
+        return offsets
+
+    def __get_index_record(self, index: int) -> tuple[int, int, int]:
+        """
+        Args:
+            index (int): The position of the record in the index.
+
+        Returns:
+            tuple[int, int, int]: The occupied and color bitboards and the game offset of the record.
+        """
+        assert self.index is not None
+        return GameArchive.INDEX_RECORD.unpack_from(self.index, GameArchive.INDEX_HEADER.size + index * GameArchive.INDEX_RECORD.size)
+
+    def __read(self, offset: int) -> tuple[GameRecord, int]:
+        """
+        Args:
+            offset (int): The offset of the game in the archive.
+
+        Returns:
+            tuple[GameRecord, int]: The game and the offset right after it.
+        """
+        flags, count, result, black, white, black_time, white_time = GameArchive.GAME.unpack_from(self.data, offset)
+        offset += GameArchive.GAME.size
+        start: Optional[tuple[int, int, Player]] = None
+        if flags & GameArchive.__CUSTOM_START:
+            occupied, color = GameArchive.START.unpack_from(self.data, offset)
+            start = (occupied, color, Player.WHITE if flags & GameArchive.__WHITE_STARTS else Player.BLACK)
+            offset += GameArchive.START.size
+        moves: list[int] = list(self.data[offset:offset + count])
+        record: GameRecord = GameRecord(moves, result, (self.engines[black], self.engines[white]), (black_time, white_time), start)
+        return record, offset + count
+
+    @staticmethod
+    def append(path: Path, records: Iterable[GameRecord]) -> None:
+        """
+        Append games to an archive, creating it if it does not exist, and add their positions to the index.
+
+        The new index is merged from the old one and the positions of the new games,
+        so appending many games at once is much cheaper than appending them one by one.
+        All games are replayed and encoded before any file is written, so a batch with an
+        illegal move leaves the archive, its engines and its index unchanged.
+
+        Args:
+            path (Path): The path of the archive file.
+            records (Iterable[GameRecord]): The games to append.
+
+        Raises:
+            ValueError: If a game contains an illegal move.
+        """
+        engines: list[str] = GameArchive.__read_engines(path) if path.exists() else []
+        engine_ids: dict[str, int] = {engine: index for index, engine in enumerate(engines)}
+        new_engines: list[str] = []
+        entries: list[tuple[int, int, int]] = []
+        offset: int = path.stat().st_size if path.exists() else 0
+        data: list[bytes] = []
+        if offset == 0:
+            data.append(GameArchive.HEADER.pack(GameArchive.MAGIC, GameArchive.VERSION))
+            offset = GameArchive.HEADER.size
+
+        for record in records:
+            positions: list[tuple[int, int]] = [(board.occupied, board.color) for board, _ in record.replay()]
+            ids: list[int] = []
+            for engine in record.engines:
+                if engine not in engine_ids:
+                    engine_ids[engine] = len(engine_ids)
+                    new_engines.append(engine)
+                ids.append(engine_ids[engine])
+            encoded: bytes = GameArchive.__encode(record, ids[0], ids[1])
+            data.append(encoded)
+            entries += [(occupied, color, offset) for occupied, color in positions]
+            offset += len(encoded)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if new_engines:
+            with open(GameArchive.get_engines_path(path), "a") as engines_file:
+                engines_file.writelines(engine + "\n" for engine in new_engines)
+        with open(path, "ab") as file:
+            file.writelines(data)
+        GameArchive.__merge_index(GameArchive.get_index_path(path), sorted(entries))
+
+    @staticmethod
+    def __encode(record: GameRecord, black: int, white: int) -> bytes:
+        """
+        Args:
+            record (GameRecord): The game.
+            black (int): The id of the black engine.
+            white (int): The id of the white engine.
+
+        Returns:
+            bytes: The game as stored in the archive.
+        """
+        occupied, color, player = record.start
+        custom: bool = record.start != GameRecord.get_standard_start()
+        flags: int = (GameArchive.__CUSTOM_START if custom else 0) | (GameArchive.__WHITE_STARTS if player == Player.WHITE else 0)
+        data: bytes = GameArchive.GAME.pack(flags, len(record.moves), record.result, black, white, *record.times)
+        if custom:
+            data += GameArchive.START.pack(occupied, color)
+        return data + bytes(record.moves)
+
+    @staticmethod
+    def __merge_index(index_path: Path, entries: list[tuple[int, int, int]]) -> None:
+        """
+        Merge sorted index records into the index file, which is replaced once the merged index is written.
+
+        Args:
+            index_path (Path): The path of the index file.
+            entries (list[tuple[int, int, int]]): The new (occupied, color, offset) records, sorted.
+        """
+        temporary_path: Path = index_path.with_name(index_path.name + ".tmp")
+        with open(temporary_path, "wb") as file:
+            if not index_path.exists():
+                file.write(GameArchive.INDEX_HEADER.pack(GameArchive.INDEX_MAGIC, GameArchive.VERSION, len(entries)))
+                for entry in entries:
+                    file.write(GameArchive.INDEX_RECORD.pack(*entry))
+            else:
+                with open(index_path, "rb") as old_file, mmap.mmap(old_file.fileno(), 0, access=mmap.ACCESS_READ) as old:
+                    _, _, count = GameArchive.INDEX_HEADER.unpack_from(old, 0)
+                    file.write(GameArchive.INDEX_HEADER.pack(GameArchive.INDEX_MAGIC, GameArchive.VERSION, count + len(entries)))
+                    with memoryview(old) as view:
+                        existing = GameArchive.INDEX_RECORD.iter_unpack(view[GameArchive.INDEX_HEADER.size:])
+                        for entry in heapq.merge(existing, entries):
+                            file.write(GameArchive.INDEX_RECORD.pack(*entry))
+                        del existing
+        os.replace(temporary_path, index_path)
+
+    @staticmethod
+    def __read_engines(path: Path) -> list[str]:
+        """
+        Args:
+            path (Path): The path of the archive file.
+
+        Returns:
+            list[str]: The engine settings of the archive, indexed by their id.
+        """
+        engines_path: Path = GameArchive.get_engines_path(path)
+        if not engines_path.exists():
+            return []
+        with open(engines_path) as file:
+            return file.read().splitlines()
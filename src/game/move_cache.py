@@ -0,0 +1,176 @@
+from enums.player import Player
+from collections import OrderedDict
+from typing import Any, Mapping, Optional
+import util.bitboard as Bitboard
+
+class MoveCache:
+    """
+    Bounded least recently used cache of the legal moves of positions.
+
+    Entries are keyed by the occupied and color bitboards of the board and the player to move.
+    Each entry holds the bitboard of the legal moves, computed when the entry is created, and the
+    flips of every legal move, computed on the first request. When the cache is full, the least
+    recently used entry is evicted.
+
+    One cache is shared by the games and the user interfaces of a process (see `GameState.move_cache`),
+    so the moves of a turn are generated once however many callers ask for them, and every bot has
+    its own cache for its searches (see `Bot.move_cache`). The cache is not locked, so each cache is
+    only used by one thread at a time.
+    """
+
+    DEFAULT_CAPACITY: int = 1 << 15
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Create an empty cache.
+
+        Args:
+            capacity (int, optional): The maximum number of positions kept. Defaults to `MoveCache.DEFAULT_CAPACITY`.
+        """
+        self.capacity: int = capacity
+        self.entries: OrderedDict[tuple[int, int, int], list[Any]] = OrderedDict()
+        """
+        The [legal moves, flips by square or None] entry of every cached position, least recently used first.
+        """
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def get_legal_moves(self, occupied: int, color: int, player: Player) -> int:
+        """
+        Look up the legal moves of a position.
+
+        Args:
+            occupied (int): The bitboard of occupied squares.
+            color (int): The bitboard of tile colors.
+            player (Player): The player to move.
+
+        Returns:
+            int: A bitboard with a bit set for every square the player can legally play.
+        """
+        return self.__get_entry(occupied, color, player)[0]
+
+    def get_flips(self, occupied: int, color: int, player: Player) -> Mapping[int, int]:
+        """
+        Look up the flips of every legal move of a position.
+
+        The mapping is the one stored in the cache and shared by every later lookup of the position, 
+        so it must not be modified.
+
+        Args:
+            occupied (int): The bitboard of occupied squares.
+            color (int): The bitboard of tile colors.
+            player (Player): The player to move.
+
+        Returns:
+            Mapping[int, int]: The bitboard of the discs flipped by every legal move, keyed by its square index in ascending order.
+        """
+        return MoveCache.__get_flips(self.__get_entry(occupied, color, player), occupied, color, player)
+
+    def get_moves(self, occupied: int, color: int, player: Player) -> tuple[int, Mapping[int, int]]:
+        """
+        Look up the legal moves of a position and their flips. Like in `MoveCache.get_flips`, the flips are shared and must not be modified.
+
+        Args:
+            occupied (int): The bitboard of occupied squares.
+            color (int): The bitboard of tile colors.
+            player (Player): The player to move.
+
+        Returns:
+            tuple[int, Mapping[int, int]]: The bitboard of the legal moves and the flips of every legal move.
+        """
+        entry: list[Any] = self.__get_entry(occupied, color, player)
+        return entry[0], MoveCache.__get_flips(entry, occupied, color, player)
+
+    def get_hit_rate(self) -> float:
+        """
+        Compute the share of lookups answered from the cache.
+
+        Returns:
+            float: The share of lookups answered from the cache.
+        """
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Collect the counters and the size of the cache, for example for a benchmark report.
+
+        Returns:
+            dict[str, Any]: The hits, misses, hit rate, size and capacity of the cache.
+        """
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.get_hit_rate(), "size": len(self.entries), "capacity": self.capacity}
+
+    def clear(self) -> None:
+        """
+        Remove all entries and reset the hit and miss counters.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __get_entry(self, occupied: int, color: int, player: Player) -> list[Any]:
+        """
+        Looks a position up, creating its entry with the legal moves if it is not cached.
+
+        Args:
+            occupied (int): The bitboard of occupied squares.
+            color (int): The bitboard of tile colors.
+            player (Player): The player to move.
+
+        Returns:
+            list[Any]: The [legal moves, flips by square or None] entry of the position.
+        """
+        key: tuple[int, int, int] = (occupied, color, player.value)
+        entries: OrderedDict[tuple[int, int, int], list[Any]] = self.entries
+        entry: Optional[list[Any]] = entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return entry
+        self.misses += 1
+        own, opponent = MoveCache.__get_bitboards(occupied, color, player)
+        entry = [Bitboard.get_legal_moves(own, opponent), None]
+        entries[key] = entry
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def __get_flips(entry: list[Any], occupied: int, color: int, player: Player) -> dict[int, int]:
+        """
+        Gets the flips of an entry, computing them on the first request.
+
+        Args:
+            entry (list[Any]): The entry of the position, which keeps the flips once they are computed.
+            occupied (int): The bitboard of occupied squares.
+            color (int): The bitboard of tile colors.
+            player (Player): The player to move.
+
+        Returns:
+            dict[int, int]: The bitboard of the discs flipped by every legal move, keyed by its square index.
+        """
+        flips: Optional[dict[int, int]] = entry[1]
+        if flips is None:
+            own, opponent = MoveCache.__get_bitboards(occupied, color, player)
+            flips = {square: Bitboard.get_flips(own, opponent, square) for square in Bitboard.iterate(entry[0])}
+            entry[1] = flips
+        return flips
+
+    @staticmethod
+    def __get_bitboards(occupied: int, color: int, player: Player) -> tuple[int, int]:
+        """
+        Splits a position into the discs of the player to move and the opponent's discs.
+
+        Args:
+            occupied (int): The bitboard of occupied squares.
+            color (int): The bitboard of tile colors.
+            player (Player): The player to move.
+
+        Returns:
+            tuple[int, int]: The bitboard of the player's discs and the bitboard of the opponent's discs, like `Board.get_bitboards`.
+        """
+        white: int = occupied & color
+        black: int = occupied ^ white
+        if player == Player.WHITE:
+            return white, black
+        return black, white
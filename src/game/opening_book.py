@@ -0,0 +1,158 @@
+from models.board import Board
+from enums.player import Player, get_opponent
+from pathlib import Path
+from typing import Optional
+import util.bitboard as Bitboard
+import util.symmetry as Symmetry
+import mmap
+import struct
+
+class OpeningBook:
+    """
+    Opening book stored in a compact binary file.
+
+    The file starts with a header (magic bytes, format version and record count) followed by
+    fixed-size records sorted by position:
+    - `occupied` (8 bytes) and `color` (8 bytes): The bitboards of the position.
+    - `side` (1 byte): The player to move.
+    - `move` (1 byte): The square index of the best move.
+    - `score` (4 bytes): The score of the position for the player to move.
+
+    Positions are stored in their canonical orientation (see `Symmetry.get_canonical`), with the move
+    mapped to that orientation, so one record serves all symmetric positions.
+
+    The file is memory-mapped and searched with a binary search, so opening a book
+    does not load its records into Python objects.
+    """
+
+    MAGIC: bytes = b"OTHB"
+    VERSION: int = 2
+    HEADER: struct.Struct = struct.Struct("<4sIQ")
+    RECORD: struct.Struct = struct.Struct("<QQBBxxf")
+
+    DEFAULT_PATH: Path = Path(__file__).resolve().parent.parent.parent / "data" / "book.bin"
+    """
+    Location of the book used by the user interfaces, if it has been built.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open a book file.
+
+        Args:
+            path (Path): The path of the book file.
+
+        Raises:
+            ValueError: If the file is not an opening book.
+        """
+        with open(path, "rb") as file:
+            self.data: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = OpeningBook.HEADER.unpack_from(self.data, 0)
+        self.count: int = count
+        if magic != OpeningBook.MAGIC or version != OpeningBook.VERSION:
+            self.data.close()
+            raise ValueError(f"{path} is not an opening book")
+
+    @staticmethod
+    def open_default() -> Optional['OpeningBook']:
+        """
+        Open the book at `OpeningBook.DEFAULT_PATH`.
+
+        Returns:
+            Optional[OpeningBook]: The default book, or None if it has not been built.
+        """
+        if not OpeningBook.DEFAULT_PATH.exists():
+            return None
+        return OpeningBook(OpeningBook.DEFAULT_PATH)
+
+    def close(self) -> None:
+        """
+        Close the memory-mapped file.
+        """
+        self.data.close()
+
+    def lookup(self, board: Board, player: Player) -> Optional[tuple[int, float]]:
+        """
+        Find the position in the book.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player): The player to move.
+
+        Returns:
+            Optional[tuple[int, float]]: The best move (square index) and its score for the player,
+            or None if the position is not in the book.
+        """
+        occupied, color, transform = Symmetry.get_canonical(board.occupied, board.color)
+        key: tuple[int, int, int] = (occupied, color, player.value)
+        low: int = 0
+        high: int = self.count
+        while low < high:
+            middle: int = (low + high) // 2
+            occupied, color, side, move, score = OpeningBook.RECORD.unpack_from(self.data, OpeningBook.HEADER.size + middle * OpeningBook.RECORD.size)
+            record: tuple[int, int, int] = (occupied, color, side)
+            if record == key:
+                return Symmetry.transform_square(move, Symmetry.INVERSES[transform]), score
+            if record < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    @staticmethod
+    def write(path: Path, records: list[tuple[int, int, Player, int, float]]) -> None:
+        """
+        Write a book file.
+
+        Args:
+            path (Path): The path of the book file to write.
+            records (list[tuple[int, int, Player, int, float]]): The book entries as 
+                (occupied, color, player to move, best move, score) tuples, in any order and orientation.
+                Of several symmetric entries, only one is kept.
+        """
+        canonical: dict[tuple[int, int, int], tuple[int, float]] = {}
+        for occupied, color, player, move, score in records:
+            occupied, color, transform = Symmetry.get_canonical(occupied, color)
+            canonical.setdefault((occupied, color, player.value), (Symmetry.transform_square(move, transform), score))
+        rows: list[tuple[int, int, int, int, float]] = sorted(key + entry for key, entry in canonical.items())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(OpeningBook.HEADER.pack(OpeningBook.MAGIC, OpeningBook.VERSION, len(rows)))
+            for row in rows:
+                file.write(OpeningBook.RECORD.pack(*row))
+
+    @staticmethod
+    def expand(depth: int) -> list[tuple[Board, Player]]:
+        """
+        List all positions reachable from the starting position within the given number of moves,
+        keeping one orientation of symmetric positions.
+
+        Args:
+            depth (int): The number of moves (plies) to expand.
+
+        Returns:
+            list[tuple[Board, Player]]: The positions paired with the player to move.
+        """
+        frontier: list[tuple[Board, Player]] = [(Board(), Player.BLACK)]
+        positions: list[tuple[Board, Player]] = list(frontier)
+        seen: set[tuple[int, int, int]] = set()
+        for _ in range(depth):
+            next_frontier: list[tuple[Board, Player]] = []
+            for board, player in frontier:
+                own, opponent = board.get_bitboards(player)
+                moves: int = Bitboard.get_legal_moves(own, opponent)
+                if not moves:
+                    continue
+                for move in Bitboard.iterate(moves):
+                    child: Board = board.deepcopy()
+                    child.make_move(move, Bitboard.get_flips(own, opponent, move), player)
+                    child_player: Player = get_opponent(player)
+                    occupied, color, _ = Symmetry.get_canonical(child.occupied, child.color)
+                    key: tuple[int, int, int] = (occupied, color, child_player.value)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    next_frontier.append((child, child_player))
+            positions += next_frontier
+            frontier = next_frontier
+        return positions
@@ -0,0 +1,133 @@
+from models.board import Board
+from game.transposition_table import TranspositionTable
+from game.time_manager import TimeManager
+from game.probcut import ProbCut
+from game.pattern_evaluator import PatternEvaluator
+from game.evaluation_weights import EvaluationWeights
+from game.game import Game
+from enums.player import Player
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+from multiprocessing.synchronize import Event as ProcessEvent
+from threading import Event
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING, cast
+import multiprocessing
+
+if TYPE_CHECKING:
+    from game.bot import Bot
+
+class ParallelSearch:
+    """
+    Pool of helper processes for a Lazy SMP search.
+
+    The helpers search the same position as the main search, each starting at a different depth,
+    and share one transposition table kept in a `multiprocessing.shared_memory` block. The main
+    search picks up the positions they have already searched from the table and plays its own best move.
+    Once it has, the helpers are stopped through a shared cancellation token.
+    """
+
+    def __init__(self, workers: int, hash_size_mb: float, probcut: Optional[ProbCut] = None, patterns_path: Optional[Path] = None) -> None:
+        """
+        Start the helper processes and allocate the shared transposition table.
+
+        Args:
+            workers (int): The total number of searching processes, including the main one.
+            hash_size_mb (float): The memory budget of the shared transposition table in megabytes.
+            probcut (Optional[ProbCut], optional): The forward pruning parameters of the main search. Defaults to None, which turns the pruning off.
+            patterns_path (Optional[Path], optional): The pattern tables of the main search, opened by every helper. 
+                Defaults to None, which evaluates with `Game.get_board_score`.
+        """
+        self.workers: int = workers
+        self.memory: SharedMemory = SharedMemory(create=True, size=TranspositionTable.get_size(hash_size_mb))
+        self.transposition_table: TranspositionTable = TranspositionTable(hash_size_mb, self.memory.buf)
+        self.cancellation: ProcessEvent = multiprocessing.Event()
+        """
+        Cancellation token of the helpers' searches, set by `ParallelSearch.stop` and cleared by `ParallelSearch.start`.
+        """
+        self.pool: ProcessPoolExecutor = ProcessPoolExecutor(
+            workers - 1, initializer=_initialize_helper, initargs=(self.memory.name, hash_size_mb, probcut, patterns_path, Game.weights, self.cancellation)
+        )
+
+    def start(self, board: Board, player: Player, time_manager: TimeManager, depth_limit: int) -> list[Future]:
+        """
+        Start all helpers on the position.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player): The player to move.
+            time_manager (TimeManager): The time manager of the main search. Each helper gets a copy, 
+                so they all use the same monotonic start time and limits.
+            depth_limit (int): The maximum depth to search in the game tree.
+
+        Returns:
+            list[Future]: One future per helper, done once the helper has finished searching.
+        """
+        self.cancellation.clear()
+        return [
+            self.pool.submit(_search_helper, board.occupied, board.color, player.value, time_manager, depth_limit, 1 + helper % 2)
+            for helper in range(1, self.workers)
+        ]
+
+    def stop(self, helpers: list[Future]) -> None:
+        """
+        Cancel the helpers' searches and wait until they have returned.
+
+        Args:
+            helpers (list[Future]): The futures returned by `ParallelSearch.start`.
+        """
+        self.cancellation.set()
+        wait(helpers)
+
+    def close(self) -> None:
+        """
+        Stop the helper processes and release the shared memory.
+        """
+        self.pool.shutdown()
+        self.transposition_table.release()
+        self.memory.close()
+        self.memory.unlink()
+
+
+_helper: Optional['Bot'] = None
+_helper_memory: Optional[SharedMemory] = None
+
+
+def _initialize_helper(name: str, hash_size_mb: float, probcut: Optional[ProbCut], patterns_path: Optional[Path], weights: EvaluationWeights, cancellation: ProcessEvent) -> None:
+    """Creates the bot of a helper process, attached to the shared transposition table and cancellation token.
+
+    Args:
+        name (str): The name of the shared memory block holding the transposition table.
+        hash_size_mb (float): The memory budget of the shared transposition table in megabytes.
+        probcut (Optional[ProbCut]): The forward pruning parameters of the main search.
+        patterns_path (Optional[Path]): The pattern tables of the main search, or None for the heuristic evaluation.
+        weights (EvaluationWeights): The weights of the heuristic evaluation of the main process.
+        cancellation (ProcessEvent): The cancellation token of the helpers, set by the main process.
+    """
+    # Imported here because the bot module imports this one.
+    from game.bot import Bot
+
+    global _helper, _helper_memory
+    Game.set_weights(weights)
+    _helper_memory = SharedMemory(name=name)
+    _helper = Bot(hash_size_mb=0, probcut_confidence=None, patterns=PatternEvaluator(patterns_path) if patterns_path is not None else None)
+    _helper.probcut = probcut
+    _helper.transposition_table = TranspositionTable(hash_size_mb, _helper_memory.buf)
+    # A process event has the interface of a threading one.
+    _helper.cancellation = cast(Event, cancellation)
+
+
+def _search_helper(occupied: int, color: int, player: int, time_manager: TimeManager, depth_limit: int, start_depth: int) -> None:
+    """Searches a position in a helper process, filling the shared transposition table.
+
+    Args:
+        occupied (int): The bitboard of occupied squares.
+        color (int): The bitboard of tile colors.
+        player (int): The value of the player to move.
+        time_manager (TimeManager): Decides when to stop the search.
+        depth_limit (int): The maximum depth to search in the game tree.
+        start_depth (int): The depth of the first iteration.
+    """
+    assert _helper is not None
+    _helper.prepare_search(clear_cancellation=False)
+    _helper.iterative_deepening(Board.from_bitboards(occupied, color), Player(player), time_manager, depth_limit, start_depth)
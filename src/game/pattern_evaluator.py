@@ -0,0 +1,283 @@
+from models.board import Board
+from enums.player import Player
+from pathlib import Path
+from typing import Optional
+import util.symmetry as Symmetry
+import itertools
+import mmap
+import struct
+
+class PatternEvaluator:
+    """
+    Evaluation function built from patterns of squares, an alternative to `Game.get_board_score`.
+
+    Every pattern is read in several orientations of the board, so each of its instances
+    (for example the four edges) uses the same table. The discs of the player to move and of
+    the opponent on the squares of an instance form a ternary number, which indexes the pattern's
+    table of the game phase. The score is the sum of the table entries of all instances.
+
+    Patterns (squares counted from the corner at (0, 0) of each orientation):
+    - `edge`: The first row and the two X squares next to its corners.
+    - `corner_2x5`: The first five squares of the first two rows.
+    - `corner_3x3`: The three by three squares at the corner.
+    - `line_2`, `line_3`, `line_4`: The second, third and fourth row.
+    - `diagonal_8` to `diagonal_4`: The diagonals of eight to four squares.
+
+    The tables are stored in a binary file: a header (magic bytes, format version and number of
+    phases) followed by the tables of every phase, each holding the tables of all patterns in
+    the order of `PatternEvaluator.PATTERNS`, as signed 16-bit entries in thousandths of a disc.
+    The file is memory-mapped, so opening it does not read the tables into Python objects.
+    """
+
+    MAGIC: bytes = b"OTHP"
+    VERSION: int = 1
+    HEADER: struct.Struct = struct.Struct("<4sII")
+
+    DEFAULT_PATH: Path = Path(__file__).resolve().parent.parent.parent / "data" / "patterns.bin"
+    """
+    Location of the tables used when the pattern evaluation is selected, if they have been trained.
+    """
+
+    PHASE_COUNT: int = 6
+    PHASE_WIDTH: int = 10
+    """
+    Number of discs on the board covered by each phase, starting from the four discs of the starting position.
+    """
+
+    PATTERNS: list[tuple[str, int, list[int]]] = [
+        ("edge", 10, [0, 2, 4, 6]),
+        ("corner_2x5", 10, [0, 1, 2, 3, 4, 5, 6, 7]),
+        ("corner_3x3", 9, [0, 1, 2, 3]),
+        ("line_2", 8, [0, 2, 4, 6]),
+        ("line_3", 8, [0, 2, 4, 6]),
+        ("line_4", 8, [0, 2, 4, 6]),
+        ("diagonal_8", 8, [0, 1]),
+        ("diagonal_7", 7, [0, 1, 2, 4]),
+        ("diagonal_6", 6, [0, 1, 2, 4]),
+        ("diagonal_5", 5, [0, 1, 2, 4]),
+        ("diagonal_4", 4, [0, 1, 2, 4]),
+    ]
+    """
+    Name, number of squares and orientations (transforms of `util.symmetry`) of every pattern.
+    """
+
+    OFFSETS: list[int] = list(itertools.accumulate((3 ** squares for _, squares, _ in PATTERNS), initial=0))[:-1]
+    """
+    Offset of the table of every pattern within the tables of a phase.
+    """
+
+    PHASE_SIZE: int = sum(3 ** squares for _, squares, _ in PATTERNS)
+    """
+    Number of entries of the tables of one phase.
+    """
+
+    TERNARY: list[int] = [sum(3 ** digit for digit in range(10) if bits >> digit & 1) for bits in range(1 << 10)]
+    """
+    The ternary number with the digits of every binary number of up to ten digits, so the index of
+    an instance is `TERNARY[player] + 2 * TERNARY[opponent]` of the squares gathered into the low bits.
+    """
+
+    __TERNARY_OPPONENT: list[int] = [2 * ternary for ternary in TERNARY]
+
+    DIAGONALS: int = 0x0101010101010101
+    """
+    Multiplier that gathers the squares of a diagonal into the last row, one per column.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Open a pattern table file.
+
+        Args:
+            path (Path): The path of the table file.
+
+        Raises:
+            ValueError: If the file does not hold pattern tables.
+        """
+        self.path: Path = path
+        with open(path, "rb") as file:
+            self.data: mmap.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, phases = PatternEvaluator.HEADER.unpack_from(self.data, 0)
+        size: int = PatternEvaluator.HEADER.size + 2 * PatternEvaluator.PHASE_COUNT * PatternEvaluator.PHASE_SIZE
+        if magic != PatternEvaluator.MAGIC or version != PatternEvaluator.VERSION or phases != PatternEvaluator.PHASE_COUNT or len(self.data) != size:
+            self.data.close()
+            raise ValueError(f"{path} is not a pattern table file")
+        self.table: memoryview = memoryview(self.data)[PatternEvaluator.HEADER.size:].cast("h")
+        self.tables: list[list[memoryview]] = [
+            [
+                self.table[phase * PatternEvaluator.PHASE_SIZE + offset:phase * PatternEvaluator.PHASE_SIZE + offset + 3 ** squares]
+                for offset, (_, squares, _) in zip(PatternEvaluator.OFFSETS, PatternEvaluator.PATTERNS)
+            ]
+            for phase in range(PatternEvaluator.PHASE_COUNT)
+        ]
+        """
+        The table of every pattern, indexed as `tables[phase][pattern]`.
+        """
+
+    @staticmethod
+    def open_default() -> Optional['PatternEvaluator']:
+        """
+        Open the tables at `PatternEvaluator.DEFAULT_PATH`.
+
+        Returns:
+            Optional[PatternEvaluator]: The default tables, or None if they have not been trained.
+        """
+        if not PatternEvaluator.DEFAULT_PATH.exists():
+            return None
+        return PatternEvaluator(PatternEvaluator.DEFAULT_PATH)
+
+    def close(self) -> None:
+        """
+        Close the memory-mapped file.
+        """
+        for tables in self.tables:
+            for table in tables:
+                table.release()
+        self.table.release()
+        self.data.close()
+
+    @staticmethod
+    def get_phase(board: Board) -> int:
+        """
+        Args:
+            board (Board): The current state of the game board.
+
+        Returns:
+            int: The game phase of the board.
+        """
+        return min((board.occupied.bit_count() - 4) // PatternEvaluator.PHASE_WIDTH, PatternEvaluator.PHASE_COUNT - 1)
+
+    @staticmethod
+    def get_orientations(bits: int) -> list[int]:
+        """
+        Args:
+            bits (int): A bitboard.
+
+        Returns:
+            list[int]: The bitboard in every orientation, indexed by the transform of `util.symmetry`.
+        """
+        mirrored: int = Symmetry.mirror_horizontal(bits)
+        transposed: int = Symmetry.transpose(bits)
+        mirrored_transposed: int = Symmetry.mirror_horizontal(transposed)
+        return [
+            bits, mirrored, Symmetry.flip_vertical(bits), Symmetry.flip_vertical(mirrored),
+            transposed, mirrored_transposed, Symmetry.flip_vertical(transposed), Symmetry.flip_vertical(mirrored_transposed),
+        ]
+
+    @staticmethod
+    def get_indices(player: int, opponent: int) -> list[int]:
+        """
+        Computes the table entries of all pattern instances.
+
+        Args:
+            player (int): The bitboard of the discs of the player to move.
+            opponent (int): The bitboard of the discs of the opponent.
+
+        Returns:
+            list[int]: The position of the entry of every instance within the tables of a phase,
+            in the order of `PatternEvaluator.PATTERNS` and their orientations.
+        """
+        own: list[int] = PatternEvaluator.get_orientations(player)
+        other: list[int] = PatternEvaluator.get_orientations(opponent)
+        ternary: list[int] = PatternEvaluator.TERNARY
+        multiplier: int = PatternEvaluator.DIAGONALS
+        offsets: list[int] = PatternEvaluator.OFFSETS
+        indices: list[int] = []
+        for o in (0, 2, 4, 6):
+            a, b = own[o], other[o]
+            indices.append(offsets[0] + ternary[(a & 0xFF) | (a >> 1 & 0x100) | (a >> 5 & 0x200)] + 2 * ternary[(b & 0xFF) | (b >> 1 & 0x100) | (b >> 5 & 0x200)])
+        for o in range(8):
+            a, b = own[o], other[o]
+            indices.append(offsets[1] + ternary[(a & 0x1F) | (a >> 3 & 0x3E0)] + 2 * ternary[(b & 0x1F) | (b >> 3 & 0x3E0)])
+        for o in (0, 1, 2, 3):
+            a, b = own[o], other[o]
+            indices.append(offsets[2] + ternary[(a & 0x7) | (a >> 5 & 0x38) | (a >> 10 & 0x1C0)] + 2 * ternary[(b & 0x7) | (b >> 5 & 0x38) | (b >> 10 & 0x1C0)])
+        for pattern, shift in ((3, 8), (4, 16), (5, 24)):
+            for o in (0, 2, 4, 6):
+                indices.append(offsets[pattern] + ternary[own[o] >> shift & 0xFF] + 2 * ternary[other[o] >> shift & 0xFF])
+        for o in (0, 1):
+            indices.append(offsets[6] + ternary[(own[o] & 0x8040201008040201) * multiplier >> 56 & 0xFF] + 2 * ternary[(other[o] & 0x8040201008040201) * multiplier >> 56 & 0xFF])
+        for pattern, mask, shift, width in ((7, 0x0080402010080402, 57, 0x7F), (8, 0x0000804020100804, 58, 0x3F), (9, 0x0000008040201008, 59, 0x1F), (10, 0x0000000080402010, 60, 0xF)):
+            for o in (0, 1, 2, 4):
+                indices.append(offsets[pattern] + ternary[(own[o] & mask) * multiplier >> shift & width] + 2 * ternary[(other[o] & mask) * multiplier >> shift & width])
+        return indices
+
+    @staticmethod
+    def get_squares(pattern: int) -> list[int]:
+        """
+        Args:
+            pattern (int): The index of the pattern in `PatternEvaluator.PATTERNS`.
+
+        Returns:
+            list[int]: The square of every ternary digit of the pattern's first instance, lowest digit first.
+        """
+        instance: int = sum(len(orientations) for _, _, orientations in PatternEvaluator.PATTERNS[:pattern])
+        empty: int = PatternEvaluator.get_indices(0, 0)[instance]
+        squares: list[int] = [0] * PatternEvaluator.PATTERNS[pattern][1]
+        for square in range(64):
+            digit: int = PatternEvaluator.get_indices(1 << square, 0)[instance] - empty
+            if digit:
+                squares[PatternEvaluator.TERNARY.index(digit).bit_length() - 1] = square
+        return squares
+
+    def evaluate(self, board: Board, player: Player) -> float:
+        """
+        Calculates the score of the board for the specified player from the pattern tables.
+
+        The instances are the same as in `PatternEvaluator.get_indices`, unrolled and grouped by
+        orientation, since this runs at every leaf of the search.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player): The player for whom the score is being calculated.
+
+        Returns:
+            float: The sum of the table entries of all pattern instances, in thousandths of a disc.
+        """
+        own, opponent = board.get_bitboards(player)
+        edge, corner_2x5, corner_3x3, line_2, line_3, line_4, diagonal_8, diagonal_7, diagonal_6, diagonal_5, diagonal_4 = self.tables[PatternEvaluator.get_phase(board)]
+        players: list[int] = PatternEvaluator.get_orientations(own)
+        opponents: list[int] = PatternEvaluator.get_orientations(opponent)
+        t: list[int] = PatternEvaluator.TERNARY
+        t2: list[int] = PatternEvaluator.__TERNARY_OPPONENT
+        m: int = PatternEvaluator.DIAGONALS
+        score: int = 0
+        for o in (0, 2, 4, 6):
+            a, b = players[o], opponents[o]
+            score += edge[t[(a & 0xFF) | (a >> 1 & 0x100) | (a >> 5 & 0x200)] + t2[(b & 0xFF) | (b >> 1 & 0x100) | (b >> 5 & 0x200)]]
+            score += line_2[t[a >> 8 & 0xFF] + t2[b >> 8 & 0xFF]] + line_3[t[a >> 16 & 0xFF] + t2[b >> 16 & 0xFF]] + line_4[t[a >> 24 & 0xFF] + t2[b >> 24 & 0xFF]]
+        for o in range(8):
+            a, b = players[o], opponents[o]
+            score += corner_2x5[t[(a & 0x1F) | (a >> 3 & 0x3E0)] + t2[(b & 0x1F) | (b >> 3 & 0x3E0)]]
+        for o in (0, 1, 2, 3):
+            a, b = players[o], opponents[o]
+            score += corner_3x3[t[(a & 0x7) | (a >> 5 & 0x38) | (a >> 10 & 0x1C0)] + t2[(b & 0x7) | (b >> 5 & 0x38) | (b >> 10 & 0x1C0)]]
+        for o in (0, 1):
+            a, b = players[o], opponents[o]
+            score += diagonal_8[t[(a & 0x8040201008040201) * m >> 56 & 0xFF] + t2[(b & 0x8040201008040201) * m >> 56 & 0xFF]]
+        for o in (0, 1, 2, 4):
+            a, b = players[o], opponents[o]
+            score += diagonal_7[t[(a & 0x0080402010080402) * m >> 57 & 0x7F] + t2[(b & 0x0080402010080402) * m >> 57 & 0x7F]]
+            score += diagonal_6[t[(a & 0x0000804020100804) * m >> 58 & 0x3F] + t2[(b & 0x0000804020100804) * m >> 58 & 0x3F]]
+            score += diagonal_5[t[(a & 0x0000008040201008) * m >> 59 & 0x1F] + t2[(b & 0x0000008040201008) * m >> 59 & 0x1F]]
+            score += diagonal_4[t[(a & 0x0000000080402010) * m >> 60 & 0xF] + t2[(b & 0x0000000080402010) * m >> 60 & 0xF]]
+        return float(score)
+
+    @staticmethod
+    def write(path: Path, tables: bytes) -> None:
+        """
+        Write a pattern table file.
+
+        Args:
+            path (Path): The path of the table file to write.
+            tables (bytes): The signed 16-bit little-endian entries of all phases.
+
+        Raises:
+            ValueError: If the number of entries does not match the patterns.
+        """
+        if len(tables) != 2 * PatternEvaluator.PHASE_COUNT * PatternEvaluator.PHASE_SIZE:
+            raise ValueError("The tables do not match the patterns")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(PatternEvaluator.HEADER.pack(PatternEvaluator.MAGIC, PatternEvaluator.VERSION, PatternEvaluator.PHASE_COUNT))
+            file.write(tables)
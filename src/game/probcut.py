@@ -0,0 +1,178 @@
+from pathlib import Path
+from game.evaluation_weights import EvaluationWeights
+from typing import Any, Optional
+import json
+
+class ProbCut:
+    """
+    Parameters of the Multi-ProbCut forward pruning of the search.
+
+    For a pair of a deep and a shallow search depth, the score of the deep search is predicted
+    from the score of the shallow search as `slope * shallow + intercept`, with the standard deviation
+    `sigma` of the prediction error. Before searching a node to a depth with a pair, the bot runs
+    the cheap shallow search with a null window and prunes the node when the deep search would fail
+    high (or low) with the given confidence.
+
+    The parameters depend on the game phase. Every set applies to positions with more empty squares
+    than its `empties` and at most as many as the next larger `empties` in the table. They are fitted
+    from self-play positions by `main.py --probcut` and read from `ProbCut.DEFAULT_PATH` if it exists.
+
+    The scores being predicted are those of the evaluation the bot searches with, so the pattern
+    evaluation, which scores in thousandths of a disc, has its own parameters at `ProbCut.PATTERNS_PATH`,
+    and the parameters of the heuristic evaluation record the fingerprint of the weights they were fitted to
+    (see `EvaluationWeights.get_fingerprint`).
+    """
+
+    DEFAULT_PATH: Path = Path(__file__).resolve().parent.parent.parent / "data" / "probcut.json"
+    """
+    Location of the fitted parameters, if they have been refitted.
+    """
+
+    PATTERNS_PATH: Path = Path(__file__).resolve().parent.parent.parent / "data" / "probcut_patterns.json"
+    """
+    Location of the parameters fitted to the pattern evaluation. There are no built-in parameters for it.
+    """
+
+    DEFAULT_CONFIDENCE: float = 1.5
+    """
+    Number of standard deviations the predicted score has to clear the window by to prune a node.
+    """
+
+    SCORE_LIMIT: float = 1000000.0
+    """
+    Scores of this magnitude or more are final results of the game, which are neither fitted nor pruned on.
+    """
+
+    __MAX_DEPTH: int = 64
+    __DEFAULT_PARAMETERS: list[tuple[int, int, int, float, float, float]] = [
+        (44, 3, 1, 1.027, 200.9, 3429.2),
+        (44, 4, 1, 1.081, -422.8, 4786.1),
+        (44, 5, 2, 1.020, 1013.2, 4547.5),
+        (44, 6, 2, 1.091, 420.8, 4446.8),
+        (44, 7, 3, 1.117, -537.8, 3402.0),
+        (32, 3, 1, 1.081, -1398.6, 6298.5),
+        (32, 4, 1, 1.116, -3060.3, 7735.1),
+        (32, 5, 2, 1.092, 1014.3, 6652.2),
+        (32, 6, 2, 1.109, 344.2, 7347.1),
+        (32, 7, 3, 1.108, -1268.2, 5097.6),
+        (20, 3, 1, 1.086, -2292.1, 7594.3),
+        (20, 4, 1, 1.104, -4405.9, 8630.4),
+        (20, 5, 2, 1.107, 2226.0, 7501.6),
+        (20, 6, 2, 1.138, 790.0, 8140.2),
+        (20, 7, 3, 1.139, -2071.4, 6924.7),
+        (0, 3, 1, 1.075, -2102.3, 7700.1),
+        (0, 4, 1, 1.099, -4308.2, 9659.4),
+        (0, 5, 2, 1.103, 1906.1, 7244.8),
+        (0, 6, 2, 1.137, 1289.6, 8632.9),
+        (0, 7, 3, 1.150, -982.8, 8832.5),
+    ]
+    """
+    Parameters fitted with `main.py --probcut 800 7` from random positions with the built-in evaluation weights, 
+    used when `ProbCut.DEFAULT_PATH` does not exist.
+    """
+
+    def __init__(self, parameters: Optional[list[tuple[int, int, int, float, float, float]]] = None, confidence: float = DEFAULT_CONFIDENCE, weights: Optional[str] = None) -> None:
+        """
+        Prepare the checks of every phase and depth.
+
+        Args:
+            parameters (Optional[list[tuple[int, int, int, float, float, float]]], optional): The fitted
+                (empties, deep depth, shallow depth, slope, intercept, sigma) tuples. Defaults to None, which uses the built-in parameters.
+            confidence (float, optional): Number of standard deviations the predicted score has to clear the window by. Defaults to `ProbCut.DEFAULT_CONFIDENCE`.
+            weights (Optional[str], optional): The fingerprint of the evaluation weights the parameters were fitted to. 
+                Defaults to None, which is unknown, or the built-in weights for the built-in parameters.
+        """
+        self.weights: Optional[str] = weights if parameters is not None else EvaluationWeights().get_fingerprint()
+        """
+        Fingerprint of the evaluation weights the parameters were fitted to, or None if it is not known.
+        """
+        self.parameters: list[tuple[int, int, int, float, float, float]] = parameters if parameters is not None else ProbCut.__DEFAULT_PARAMETERS
+        self.confidence: float = confidence
+        phases: list[int] = sorted({empties for empties, *_ in self.parameters}, reverse=True)
+        self.checks: list[list[list[tuple[int, float, float, float]]]] = [[[] for _ in range(ProbCut.__MAX_DEPTH)] for _ in range(65)]
+        """
+        The (shallow depth, slope, intercept, margin) checks of a node, indexed as `checks[empties][depth]`.
+        """
+        for empties in range(65):
+            phase: Optional[int] = next((minimum for minimum in phases if empties > minimum), phases[-1] if phases else None)
+            for minimum, deep, shallow, slope, intercept, sigma in self.parameters:
+                if minimum == phase and deep < ProbCut.__MAX_DEPTH:
+                    self.checks[empties][deep].append((shallow, slope, intercept, confidence * sigma))
+            for checks in self.checks[empties]:
+                checks.sort()
+
+    def get_checks(self, empties: int, depth: int) -> list[tuple[int, float, float, float]]:
+        """
+        Args:
+            empties (int): The number of empty squares of the node.
+            depth (int): The depth the node is to be searched to.
+
+        Returns:
+            list[tuple[int, float, float, float]]: The (shallow depth, slope, intercept, margin) checks to run, cheapest first.
+        """
+        return self.checks[empties][depth] if depth < ProbCut.__MAX_DEPTH else []
+
+    @staticmethod
+    def load(confidence: float = DEFAULT_CONFIDENCE, path: Path = DEFAULT_PATH) -> 'ProbCut':
+        """
+        Load fitted parameters.
+
+        Args:
+            confidence (float, optional): Number of standard deviations the predicted score has to clear the window by. Defaults to `ProbCut.DEFAULT_CONFIDENCE`.
+            path (Path, optional): The parameter file. Defaults to `ProbCut.DEFAULT_PATH`.
+
+        Returns:
+            ProbCut: The parameters in the file, or the built-in parameters if it does not exist.
+        """
+        if not path.exists():
+            return ProbCut(confidence=confidence)
+        with open(path) as file:
+            data: dict[str, Any] | list[dict[str, Any]] = json.load(file)
+        # Files written before the fingerprint was recorded hold the list of parameters only.
+        weights: Optional[str] = data["weights"] if isinstance(data, dict) else None
+        entries: list[dict[str, Any]] = data["parameters"] if isinstance(data, dict) else data
+        return ProbCut([
+            (entry["empties"], entry["deep"], entry["shallow"], entry["slope"], entry["intercept"], entry["sigma"]) for entry in entries
+        ], confidence, weights)
+
+    @staticmethod
+    def open_default(confidence: float = DEFAULT_CONFIDENCE, patterns: bool = False, weights: Optional[EvaluationWeights] = None) -> Optional['ProbCut']:
+        """
+        Load the parameters fitted to the evaluation the bot searches with.
+
+        Args:
+            confidence (float, optional): Number of standard deviations the predicted score has to clear the window by. Defaults to `ProbCut.DEFAULT_CONFIDENCE`.
+            patterns (bool, optional): Whether the bot evaluates with the pattern tables. Defaults to False.
+            weights (Optional[EvaluationWeights], optional): The weights of the heuristic evaluation. Defaults to None, which is the built-in weights.
+
+        Returns:
+            Optional[ProbCut]: The parameters of `ProbCut.load` for the heuristic evaluation, or None with a warning 
+            if they were not fitted to the weights. For the pattern evaluation, the parameters at `ProbCut.PATTERNS_PATH`, 
+            or None if they have not been fitted.
+        """
+        if not patterns:
+            probcut: ProbCut = ProbCut.load(confidence, ProbCut.DEFAULT_PATH)
+            if probcut.weights != (weights if weights is not None else EvaluationWeights()).get_fingerprint():
+                print("ProbCut is off: its parameters were not fitted to the evaluation weights, refit them with main.py --probcut")
+                return None
+            return probcut
+        if not ProbCut.PATTERNS_PATH.exists():
+            return None
+        return ProbCut.load(confidence, ProbCut.PATTERNS_PATH)
+
+    @staticmethod
+    def write(path: Path, parameters: list[tuple[int, int, int, float, float, float]], weights: Optional[str] = None) -> None:
+        """
+        Write fitted parameters.
+
+        Args:
+            path (Path): The parameter file to write.
+            parameters (list[tuple[int, int, int, float, float, float]]): The (empties, deep depth, shallow depth, slope, intercept, sigma) tuples.
+            weights (Optional[str], optional): The fingerprint of the evaluation weights the parameters were fitted to. Defaults to None.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as file:
+            json.dump({"weights": weights, "parameters": [
+                {"empties": empties, "deep": deep, "shallow": shallow, "slope": slope, "intercept": intercept, "sigma": sigma}
+                for empties, deep, shallow, slope, intercept, sigma in parameters
+            ]}, file, indent=1)
@@ -0,0 +1,116 @@
+from typing import Any, Optional
+import util.bitboard as Bitboard
+import json
+
+class SearchStats:
+    """
+    Statistics of a single search, filled in by the bot while it searches.
+
+    Counters:
+    - `nodes`: Positions visited, including the nodes of the endgame solver.
+    - `evaluations`: Positions scored by the heuristic evaluation.
+    - `probes`, `hits`, `hash_cutoffs`: Transposition table lookups, lookups that found the position
+      and lookups whose stored score ended the search of the position.
+    - `cutoffs`, `first_move_cutoffs`: Beta cutoffs, and those caused by the first move searched.
+    - `probcuts`: Positions pruned by Multi-ProbCut.
+    - `move_cache_hits`, `move_cache_misses`: Lookups of the bot's move cache during the search
+      that found and missed the position.
+
+    Each completed iteration of the iterative deepening is recorded with its depth, the time and
+    node count at its end, its score and its best move.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: int = 0
+        self.evaluations: int = 0
+        self.probes: int = 0
+        self.hits: int = 0
+        self.hash_cutoffs: int = 0
+        self.cutoffs: int = 0
+        self.first_move_cutoffs: int = 0
+        self.probcuts: int = 0
+        self.move_cache_hits: int = 0
+        self.move_cache_misses: int = 0
+        self.iterations: list[dict[str, Any]] = []
+        self.source: str = "search"
+        """
+        Where the move came from: "search", "endgame", "book" or "ponder".
+        """
+        self.depth: int = 0
+        self.time: float = 0
+        self.score: Optional[float] = None
+        self.move: Optional[int] = None
+
+    def add_iteration(self, depth: int, time: float, score: float, move: Optional[int]) -> None:
+        """
+        Record a completed iteration.
+
+        Args:
+            depth (int): The depth of the iteration.
+            time (float): The time in seconds since the search started.
+            score (float): The score of the iteration.
+            move (Optional[int]): The best move (square index) of the iteration.
+        """
+        self.iterations.append({"depth": depth, "time": time, "nodes": self.nodes, "score": score, "move": move})
+
+    def get_first_move_cutoff_rate(self) -> float:
+        """
+        Returns:
+            float: The share of beta cutoffs caused by the first move searched, a measure of the move ordering quality.
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0
+
+    def get_move_cache_hit_rate(self) -> float:
+        """
+        Returns:
+            float: The share of the move cache lookups of the search answered from the cache.
+        """
+        lookups: int = self.move_cache_hits + self.move_cache_misses
+        return self.move_cache_hits / lookups if lookups else 0
+
+    def get_branching_factor(self) -> float:
+        """
+        Returns:
+            float: The effective branching factor, the `depth`-th root of the node count.
+        """
+        return self.nodes ** (1 / self.depth) if self.depth > 0 else 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Returns:
+            dict[str, Any]: All statistics, including the derived ones.
+        """
+        return {
+            "source": self.source,
+            "move": Bitboard.to_position(self.move) if self.move is not None else None,
+            "score": self.score,
+            "depth": self.depth,
+            "time": self.time,
+            "nodes": self.nodes,
+            "nodes_per_second": self.nodes / self.time if self.time else 0,
+            "evaluations": self.evaluations,
+            "probes": self.probes,
+            "hits": self.hits,
+            "hash_cutoffs": self.hash_cutoffs,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoff_rate": self.get_first_move_cutoff_rate(),
+            "probcuts": self.probcuts,
+            "move_cache_hits": self.move_cache_hits,
+            "move_cache_misses": self.move_cache_misses,
+            "move_cache_hit_rate": self.get_move_cache_hit_rate(),
+            "branching_factor": self.get_branching_factor(),
+            "iterations": self.iterations,
+        }
+
+    def to_json(self) -> str:
+        """
+        Returns:
+            str: The statistics as a single line of JSON.
+        """
+        return json.dumps(self.to_dict())
+
+    def __str__(self) -> str:
+        move: Optional[tuple[int, int]] = Bitboard.to_position(self.move) if self.move is not None else None
+        if self.source == "book":
+            return f"Book move: {move}"
+        return f"Time: {self.time}\nDepth: {self.depth}\nMove: {move}\nNodes: {self.nodes}"
@@ -0,0 +1,131 @@
+from math import inf
+from typing import Optional
+import time
+
+class TimeManager:
+    """
+    Decides how long the bot searches a move.
+
+    The search has two limits:
+    - the soft limit, after which no new iteration of the iterative deepening is started,
+    - the hard limit, at which the running iteration is aborted.
+
+    The soft limit depends on the game phase (the number of empty squares) and is shortened
+    while the best move stays the same from one iteration to the next, or extended when it changes.
+
+    The clock is monotonic and is only read every `TimeManager.CHECK_INTERVAL` nodes.
+    With a node limit the clock is not used at all, so the search is reproducible.
+    """
+
+    CHECK_INTERVAL: int = 256
+    """
+    Number of nodes searched between two checks of the clock.
+    """
+
+    __SAFETY_MARGIN: float = 0.25
+    __PHASES: list[tuple[int, float]] = [(44, 0.4), (24, 0.7), (0, 0.9)]
+    __STABILITY_SCALES: list[float] = [1.5, 1.0, 0.7, 0.5]
+
+    def __init__(self, time_limit: float = inf, empties: int = 60, node_limit: Optional[int] = None) -> None:
+        """
+        Start the clock of a search.
+
+        Args:
+            time_limit (float, optional): The time in seconds the move may take. Defaults to inf, which never stops the search.
+            empties (int, optional): The number of empty squares on the board, used to select the phase budget. Defaults to 60.
+            node_limit (Optional[int], optional): The number of nodes to search instead of using the clock. Defaults to None.
+        """
+        self.start_time: float = time.monotonic()
+        self.node_limit: Optional[int] = node_limit
+        self.hard_limit: float = max(time_limit - TimeManager.__SAFETY_MARGIN, time_limit / 2)
+        """
+        Time in seconds after which the search is aborted.
+        """
+        self.optimum: float = self.hard_limit * next(fraction for minimum, fraction in TimeManager.__PHASES if empties > minimum or minimum == 0)
+        """
+        Time in seconds after which no new iteration is started while the best move is neither stable nor changing.
+        """
+        self.soft_limit: float = self.optimum
+        self.best_move: Optional[int] = None
+        self.stability: int = 0
+        """
+        Number of consecutive iterations that returned the same best move.
+        """
+
+    def get_elapsed(self) -> float:
+        """
+        Returns:
+            float: The time in seconds since the search started.
+        """
+        return time.monotonic() - self.start_time
+
+    def get_deadline(self, fraction: float) -> float:
+        """
+        Compute the point in time by which a part of the budget is used up.
+
+        Args:
+            fraction (float): The part of the hard limit.
+
+        Returns:
+            float: The deadline on the `time.monotonic()` clock, or inf when searching with a node limit.
+        """
+        if self.node_limit is not None:
+            return inf
+        return self.start_time + self.hard_limit * fraction
+
+    def get_node_budget(self, fraction: float) -> float:
+        """
+        Compute the number of nodes a part of the budget allows.
+
+        Args:
+            fraction (float): The part of the node limit.
+
+        Returns:
+            float: The number of nodes, or inf when searching with the clock.
+        """
+        if self.node_limit is None:
+            return inf
+        return self.node_limit * fraction
+
+    def is_out_of_time(self, nodes: int) -> bool:
+        """
+        Check whether the running iteration has to be aborted.
+
+        Args:
+            nodes (int): The number of nodes searched so far.
+
+        Returns:
+            bool: True if the hard limit (or the node limit) has been reached.
+        """
+        if self.node_limit is not None:
+            return nodes >= self.node_limit
+        return self.get_elapsed() >= self.hard_limit
+
+    def can_start_iteration(self, nodes: int) -> bool:
+        """
+        Check whether there is enough time left to start a new iteration.
+
+        Args:
+            nodes (int): The number of nodes searched so far.
+
+        Returns:
+            bool: True if the soft limit (or the node limit) has not been reached yet.
+        """
+        if self.node_limit is not None:
+            return nodes < self.node_limit
+        return self.get_elapsed() < self.soft_limit
+
+    def complete_iteration(self, best_move: Optional[int]) -> None:
+        """
+        Record the result of a completed iteration and adjust the soft limit to the stability of the best move.
+
+        Args:
+            best_move (Optional[int]): The best move (square index) of the iteration.
+        """
+        if best_move == self.best_move:
+            self.stability += 1
+        else:
+            self.best_move = best_move
+            self.stability = 0
+        scale: float = TimeManager.__STABILITY_SCALES[min(self.stability, len(TimeManager.__STABILITY_SCALES) - 1)]
+        self.soft_limit = min(self.optimum * scale, self.hard_limit)
@@ -0,0 +1,140 @@
+from array import array
+from enums.bound import Bound
+from typing import Optional
+
+class TranspositionTable:
+    """
+    Fixed-size transposition table for the search.
+
+    Entries are stored in a flat array of 64-bit words, two words per entry:
+    - the Zobrist key XOR-ed with the data word, used to verify the entry,
+    - the data word, packing the move, depth, bound, age and score.
+
+    Entries are grouped into buckets of two. The first slot of a bucket is depth-preferred: 
+    it is only replaced by a deeper search or when it was written by an earlier search. 
+    The second slot is always replaced.
+    """
+
+    ENTRY_SIZE: int = 16
+    """
+    Size of a single entry in bytes.
+    """
+
+    SCORE_SCALE: int = 1000
+    """
+    Scores are stored as fixed-point numbers with three decimal places.
+    """
+
+    __SCORE_OFFSET: int = 1 << 38
+    __SCORE_LIMIT: int = (1 << 39) - 1
+
+    def __init__(self, size_mb: float = 16, buffer: Optional[memoryview] = None) -> None:
+        """
+        Create an empty transposition table.
+
+        Args:
+            size_mb (float, optional): The memory budget of the table in megabytes. Defaults to 16.
+            buffer (Optional[memoryview], optional): Memory to keep the table in, for example a shared memory block 
+                used by several processes. It must be at least `TranspositionTable.get_size(size_mb)` bytes long. 
+                Defaults to None, which allocates a private table.
+        """
+        size: int = TranspositionTable.get_size(size_mb)
+        self.mask: int = size // (2 * TranspositionTable.ENTRY_SIZE) - 1
+        self.table: array | memoryview = array('Q', bytes(size)) if buffer is None else buffer[:size].cast('Q')
+        self.age: int = 0
+
+    @staticmethod
+    def get_size(size_mb: float) -> int:
+        """
+        Compute the number of bytes a table uses for the given memory budget.
+
+        Args:
+            size_mb (float): The memory budget of the table in megabytes.
+
+        Returns:
+            int: The size of the largest power-of-two number of buckets that fits into the budget.
+        """
+        buckets: int = 1
+        while buckets * 4 * TranspositionTable.ENTRY_SIZE <= size_mb * 1024 * 1024:
+            buckets *= 2
+        return buckets * 2 * TranspositionTable.ENTRY_SIZE
+
+    def new_search(self) -> None:
+        """
+        Start a new search. Entries written by earlier searches become preferred for replacement.
+        """
+        self.age = (self.age + 1) & 0xFF
+
+    def clear(self) -> None:
+        """
+        Remove all entries from the table.
+        """
+        self.table[:] = array('Q', bytes(len(self.table) * 8))
+        self.age = 0
+
+    def release(self) -> None:
+        """
+        Release the buffer the table was created with, so the memory can be closed. The table cannot be used afterwards.
+        """
+        if isinstance(self.table, memoryview):
+            self.table.release()
+
+    def probe(self, key: int) -> Optional[tuple[int, Bound, float, Optional[int]]]:
+        """
+        Look up the entry stored for a position.
+
+        Args:
+            key (int): The Zobrist key of the position, including the side to move.
+
+        Returns:
+            Optional[tuple[int, Bound, float, Optional[int]]]: The depth, bound, score and best move 
+            (square index) of the entry, or None if the position is not stored.
+        """
+        index: int = (key & self.mask) << 2
+        table: array | memoryview = self.table
+        data: int = table[index + 1]
+        if table[index] ^ data != key:
+            data = table[index + 3]
+            if table[index + 2] ^ data != key:
+                return None
+        move: int = data & 0x7F
+        return (
+            (data >> 7) & 0xFF,
+            Bound((data >> 15) & 0x3),
+            ((data >> 25) - TranspositionTable.__SCORE_OFFSET) / TranspositionTable.SCORE_SCALE,
+            move - 1 if move else None,
+        )
+
+    def store(self, key: int, depth: int, bound: Bound, score: float, move: Optional[int]) -> None:
+        """
+        Store the result of a search.
+
+        Args:
+            key (int): The Zobrist key of the position, including the side to move.
+            depth (int): The depth the position was searched to.
+            bound (Bound): Whether the score is exact, a lower bound or an upper bound.
+            score (float): The score of the position.
+            move (Optional[int]): The best move (square index) found, or None.
+        """
+        stored: int = round(score * TranspositionTable.SCORE_SCALE) + TranspositionTable.__SCORE_OFFSET
+        stored = min(max(stored, 0), TranspositionTable.__SCORE_LIMIT)
+        data: int = (
+            (move + 1 if move is not None else 0)
+            | min(depth, 0xFF) << 7
+            | bound << 15
+            | self.age << 17
+            | stored << 25
+        )
+        index: int = (key & self.mask) << 2
+        table: array | memoryview = self.table
+        first: int = table[index + 1]
+        if (
+            table[index] ^ first == key
+            or (first >> 17) & 0xFF != self.age
+            or depth >= (first >> 7) & 0xFF
+        ):
+            table[index] = key ^ data
+            table[index + 1] = data
+        else:
+            table[index + 2] = key ^ data
+            table[index + 3] = data
@@ -2,15 +2,32 @@ from typing import Optional
 from ui.console_interface import ConsoleInterface
 from ui.user_interface import UserInterface
 from ui.gui import GUI
+from tools.book_builder import BookBuilder
+from tools.match_runner import MatchRunner
+from tools.perft import Perft
+from tools.analyzer import Analyzer
+from tools.probcut_fitter import ProbCutFitter
+from tools.weight_tuner import WeightTuner
+from tools.pattern_trainer import PatternTrainer
+from game.evaluation_weights import EvaluationWeights
+from game.game import Game
 import sys
 
 def main() -> None:
+    Game.set_weights(EvaluationWeights.load())
     ui: Optional[UserInterface] = None
     argv: list[str] = sys.argv
     if len(argv) != 1:
         match argv[1]:
             case "--console" | "-c": ui = ConsoleInterface(argv)
             case "--ui" | "-u": ui = GUI(argv)
+            case "--book": ui = BookBuilder(argv)
+            case "--match": ui = MatchRunner(argv)
+            case "--perft": ui = Perft(argv)
+            case "--analyze": ui = Analyzer(argv)
+            case "--probcut": ui = ProbCutFitter(argv)
+            case "--tune": ui = WeightTuner(argv)
+            case "--patterns": ui = PatternTrainer(argv)
             case _: ui = GUI(argv)
     else:
         ui = GUI(argv)
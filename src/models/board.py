@@ -1,6 +1,7 @@
 from enums.player import Player
 from enums.board_symbol import BoardSymbol
 import util.matrix as Matrix
+import util.zobrist as Zobrist
 
 class Board:
     """
@@ -9,6 +10,14 @@ class Board:
     The board is represented by two 64-bit binary numbers:
     - `occupied`: Indicates whether each position on the board is occupied (1 if occupied, 0 if not).
     - `color`: Represents the color of the tiles (1 for white, 0 for black).
+
+    The number of tiles each player owns is kept up to date in `black_tiles` and `white_tiles`, 
+    and the Zobrist hash of the tiles in `hash`.
+
+    The board also keeps running evaluation terms, all counted as white minus black:
+    - `positional`: The sum of the `Matrix.HEURISTIC_MATRIX` weights of the tiles.
+    - `corners`: The number of corners owned.
+    - `corner_neighbours`: The number of X and C squares owned next to an empty corner.
     """
 
     SIZE: int = 8
@@ -22,6 +31,12 @@ class Board:
         """
         self.occupied: int = 0
         self.color: int = 0
+        self.black_tiles: int = 0
+        self.white_tiles: int = 0
+        self.hash: int = 0
+        self.positional: int = 0
+        self.corners: int = 0
+        self.corner_neighbours: int = 0
         
         self.set_tile((3,3), Player.WHITE)
         self.set_tile((3,4), Player.BLACK)
@@ -29,6 +44,32 @@ class Board:
         self.set_tile((4,3), Player.BLACK)
 
     
+    @staticmethod
+    def from_bitboards(occupied: int, color: int) -> 'Board':
+        """
+        Create a board with the given tiles.
+
+        Args:
+            occupied (int): The bitboard of occupied squares.
+            color (int): The bitboard of tile colors (1 for white, 0 for black).
+
+        Returns:
+            Board: A new board with the tiles placed and all running terms computed.
+        """
+        board: Board = Board.__new__(Board)
+        board.occupied = 0
+        board.color = 0
+        board.black_tiles = 0
+        board.white_tiles = 0
+        board.hash = 0
+        board.positional = 0
+        board.corners = 0
+        board.corner_neighbours = 0
+        for square in range(64):
+            if occupied >> square & 1:
+                board.set_tile((square >> 3, square & 7), Player(color >> square & 1))
+        return board
+
     def is_occupied(self, position: tuple[int, int]) -> bool:
         """
         Check if the specified position on the board is occupied.
@@ -64,20 +105,159 @@ class Board:
         Args:
             position (tuple[int, int]): A tuple representing the position (row, column).
         """
-        self.color ^= Matrix.DECODE_MATRIX[position[0]][position[1]]
+        if not self.is_occupied(position):
+            return
+        square: int = position[0] * 8 + position[1]
+        tile: int = 1 << square
+        touched: int = tile & Matrix.CORNER_REGIONS
+        before: int = self.__get_corner_neighbours(touched) if touched else 0
+        self.color ^= tile
+        self.hash ^= Zobrist.FLIP_KEYS[square]
+        sign: int = 1 if self.color & tile else -1
+        self.white_tiles += sign
+        self.black_tiles -= sign
+        self.positional += 2 * sign * Matrix.SQUARE_WEIGHTS[square]
+        if tile & Matrix.CORNERS:
+            self.corners += 2 * sign
+        if touched:
+            self.corner_neighbours += self.__get_corner_neighbours(touched) - before
     
     def set_tile(self, position: tuple[int, int], player: Player) -> None:
         """
         Occupy the tile at the specified position.
 
+        If the position is already occupied, this method does nothing.
+
         Args:
             position (tuple[int, int]): A tuple representing the position (row, column).
             player (Player): The player occupying the tile.
         """
-        self.occupied |= Matrix.DECODE_MATRIX[position[0]][position[1]]
+        if self.is_occupied(position):
+            return
+        self.make_move(position[0] * 8 + position[1], 0, player)
+
+    def make_move(self, position: int, flips: int, player: Player) -> None:
+        """
+        Play a move by placing a tile and reversing all flipped tiles at once.
+
+        Args:
+            position (int): The index of the square being played (row * 8 + column).
+            flips (int): A bitboard of the opponent tiles reversed by the move.
+            player (Player): The player making the move.
+        """
+        tile: int = 1 << position
+        flipped: int = flips.bit_count()
+        flips_hash, flips_weight = Board.__get_flips_delta(flips)
+        touched: int = (flips | tile) & Matrix.CORNER_REGIONS
+        before: int = self.__get_corner_neighbours(touched) if touched else 0
+        self.occupied |= tile
+        self.hash ^= Zobrist.KEYS[player.value][position] ^ flips_hash
         if player == Player.WHITE:
-            self.color |= Matrix.DECODE_MATRIX[position[0]][position[1]]    
-            
+            self.color ^= flips | tile
+            self.white_tiles += flipped + 1
+            self.black_tiles -= flipped
+            self.positional += Matrix.SQUARE_WEIGHTS[position] + 2 * flips_weight
+            if tile & Matrix.CORNERS:
+                self.corners += 1
+        else:
+            self.color ^= flips
+            self.black_tiles += flipped + 1
+            self.white_tiles -= flipped
+            self.positional -= Matrix.SQUARE_WEIGHTS[position] + 2 * flips_weight
+            if tile & Matrix.CORNERS:
+                self.corners -= 1
+        if touched:
+            self.corner_neighbours += self.__get_corner_neighbours(touched) - before
+
+    def unmake_move(self, position: int, flips: int, player: Player) -> None:
+        """
+        Revert a move previously played with `make_move`.
+
+        Args:
+            position (int): The index of the square that was played (row * 8 + column).
+            flips (int): A bitboard of the opponent tiles reversed by the move.
+            player (Player): The player who made the move.
+        """
+        tile: int = 1 << position
+        flipped: int = flips.bit_count()
+        flips_hash, flips_weight = Board.__get_flips_delta(flips)
+        touched: int = (flips | tile) & Matrix.CORNER_REGIONS
+        before: int = self.__get_corner_neighbours(touched) if touched else 0
+        self.occupied ^= tile
+        self.hash ^= Zobrist.KEYS[player.value][position] ^ flips_hash
+        if player == Player.WHITE:
+            self.color ^= flips | tile
+            self.white_tiles -= flipped + 1
+            self.black_tiles += flipped
+            self.positional -= Matrix.SQUARE_WEIGHTS[position] + 2 * flips_weight
+            if tile & Matrix.CORNERS:
+                self.corners -= 1
+        else:
+            self.color ^= flips
+            self.black_tiles -= flipped + 1
+            self.white_tiles += flipped
+            self.positional += Matrix.SQUARE_WEIGHTS[position] + 2 * flips_weight
+            if tile & Matrix.CORNERS:
+                self.corners += 1
+        if touched:
+            self.corner_neighbours += self.__get_corner_neighbours(touched) - before
+
+    @staticmethod
+    def __get_flips_delta(flips: int) -> tuple[int, int]:
+        """
+        Compute the hash difference and the total heuristic weight of the given tiles.
+
+        Args:
+            flips (int): A bitboard of the reversed tiles.
+
+        Returns:
+            tuple[int, int]: The value to XOR into `hash` when the tiles are reversed, 
+            and the sum of their `Matrix.HEURISTIC_MATRIX` weights.
+        """
+        hash: int = 0
+        weight: int = 0
+        while flips:
+            tile: int = flips & -flips
+            square: int = tile.bit_length() - 1
+            hash ^= Zobrist.FLIP_KEYS[square]
+            weight += Matrix.SQUARE_WEIGHTS[square]
+            flips ^= tile
+        return hash, weight
+
+    def __get_corner_neighbours(self, touched: int) -> int:
+        """
+        Count the X and C squares owned next to empty corners, restricted to the corner regions touching the given squares.
+
+        Args:
+            touched (int): A bitboard of squares whose corner regions are counted.
+
+        Returns:
+            int: The number of such squares owned by white minus the number owned by black.
+        """
+        white: int = self.occupied & self.color
+        black: int = self.occupied ^ white
+        count: int = 0
+        for corner, neighbours in Matrix.CORNER_NEIGHBOURS:
+            if touched & (corner | neighbours) and not self.occupied & corner:
+                count += (white & neighbours).bit_count() - (black & neighbours).bit_count()
+        return count
+
+    def get_bitboards(self, player: Player) -> tuple[int, int]:
+        """
+        Split the board into the discs of the specified player and the discs of the opponent.
+
+        Args:
+            player (Player): The player whose discs are returned first.
+
+        Returns:
+            tuple[int, int]: The bitboard of the player's discs and the bitboard of the opponent's discs.
+        """
+        white: int = self.occupied & self.color
+        black: int = self.occupied ^ white
+        if player == Player.WHITE:
+            return white, black
+        return black, white
+
     def deepcopy(self) -> 'Board':
         """
         Create a deep copy of the Board object.
@@ -85,7 +265,13 @@ class Board:
         Returns:
             Board: A new instance of the Board that is a copy of the original.
         """
-        new_board = Board()
+        new_board: Board = Board.__new__(Board)
         new_board.color = self.color
         new_board.occupied = self.occupied
+        new_board.black_tiles = self.black_tiles
+        new_board.white_tiles = self.white_tiles
+        new_board.hash = self.hash
+        new_board.positional = self.positional
+        new_board.corners = self.corners
+        new_board.corner_neighbours = self.corner_neighbours
         return new_board
\ No newline at end of file
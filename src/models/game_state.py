@@ -0,0 +1,118 @@
+from models.board import Board
+from enums.game_result import GameResult
+from enums.player import Player, get_opponent
+from game.move_cache import MoveCache
+from typing import Mapping, Optional
+import util.bitboard as Bitboard
+
+class GameState:
+    """
+    State of a single Othello game.
+
+    The state owns the board, the player to move and the legal moves of that player,
+    which are computed once per turn. Every game has its own state, so any number
+    of games can be played in one process. The tile counts are kept by the board.
+    """
+
+    move_cache: MoveCache = MoveCache()
+    """
+    Cache of the legal moves and flips of positions, shared by all games and `Game`. Bots search with their own caches.
+    """
+
+    def __init__(self, board: Optional[Board] = None, current_player: Player = Player.BLACK) -> None:
+        """
+        Create a game.
+
+        Args:
+            board (Optional[Board], optional): The board to play on. Defaults to None, which creates a board with the starting tiles.
+            current_player (Player, optional): The player to move. Defaults to Player.BLACK.
+        """
+        self.board: Board = board if board is not None else Board()
+        self.current_player: Player = current_player
+        self.legal_moves: int = 0
+        """
+        Bitboard of the legal moves of the player to move.
+        """
+        self.moves: Optional[dict[tuple[int, int], list[tuple[int, int]]]] = None
+        self.start: tuple[int, int, Player] = (self.board.occupied, self.board.color, current_player)
+        """
+        Occupied and color bitboards and player to move of the position the game started from.
+        """
+        self.history: list[int] = []
+        """
+        Square indexes of the moves played, in order. Passes are not recorded.
+        """
+        self.update_moves()
+
+    def update_moves(self) -> None:
+        """
+        Recompute the legal moves of the player to move, for example after the board was changed directly.
+        """
+        self.legal_moves = GameState.move_cache.get_legal_moves(self.board.occupied, self.board.color, self.current_player)
+        self.moves = None
+
+    def get_moves(self) -> dict[tuple[int, int], list[tuple[int, int]]]:
+        """
+        Gets the legal moves of the player to move as positions. The dictionary is built on first use in each turn.
+
+        Returns:
+            dict[tuple[int, int], list[tuple[int, int]]]: A dictionary mapping each possible move (position)
+            to a list of opponent positions flipped by that move.
+        """
+        if self.moves is None:
+            flips: Mapping[int, int] = GameState.move_cache.get_flips(self.board.occupied, self.board.color, self.current_player)
+            self.moves = {
+                Bitboard.to_position(square): [Bitboard.to_position(flip) for flip in Bitboard.iterate(flipped)]
+                for square, flipped in flips.items()
+            }
+        return self.moves
+
+    def play(self, position: tuple[int, int]) -> bool:
+        """
+        Plays a move for the player to move and passes the turn to the opponent.
+
+        Args:
+            position (tuple[int, int]): The coordinates of the position (row, column) to play.
+
+        Returns:
+            bool: True if the move was played; False if it is not legal.
+        """
+        square: int = Bitboard.to_square(position)
+        if not self.legal_moves >> square & 1:
+            return False
+        flips: int = GameState.move_cache.get_flips(self.board.occupied, self.board.color, self.current_player)[square]
+        self.board.make_move(square, flips, self.current_player)
+        self.history.append(square)
+        self.switch_player()
+        return True
+
+    def switch_player(self) -> None:
+        """
+        Passes the turn to the opponent.
+        """
+        self.current_player = get_opponent(self.current_player)
+        self.update_moves()
+
+    def has_ended(self) -> bool:
+        """
+        Returns:
+            bool: True if neither player can move.
+        """
+        if self.legal_moves:
+            return False
+        return not GameState.move_cache.get_legal_moves(self.board.occupied, self.board.color, get_opponent(self.current_player))
+
+    def get_winner(self) -> GameResult:
+        """
+        Determines the winner of the game.
+
+        Returns:
+            GameResult: The outcome of the game, or GameResult.NO_WINNER while it is still being played.
+        """
+        if not self.has_ended():
+            return GameResult.NO_WINNER
+        if self.board.white_tiles > self.board.black_tiles:
+            return GameResult.WHITE_WINS
+        if self.board.white_tiles < self.board.black_tiles:
+            return GameResult.BLACK_WINS
+        return GameResult.DRAW
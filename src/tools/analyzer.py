@@ -0,0 +1,170 @@
+from game.bot import Bot
+from game.evaluation_weights import EvaluationWeights
+from game.game import Game
+from models.board import Board
+from enums.player import Player
+from tools.match_runner import EngineSettings
+from ui.user_interface import UserInterface
+from concurrent.futures import Future, ProcessPoolExecutor
+from collections import deque
+from typing import Any, Iterator, Optional, TextIO
+import util.bitboard as Bitboard
+import json
+import os
+import sys
+
+class Analyzer(UserInterface):
+    """Analyses a stream of positions with the engine and writes one line of JSON per position.
+
+    Every input line holds the occupied and color bitboards as hexadecimal numbers and the player
+    to move (`black`/`white`, `b`/`w` or `0`/`1`), separated by whitespace. Empty lines and lines
+    starting with `#` are skipped. The output lines are in the order of the input and hold the
+    best move, the score, the principal variation and the search statistics, or an error
+    for a line that could not be read.
+
+    Positions are read lazily and spread over a process pool, with at most a few positions per worker
+    in flight, so inputs of any size are analysed in bounded memory.
+
+    Usage: main.py --analyze [engine] [input] [output] [workers]
+    """
+
+    __PENDING_PER_WORKER: int = 4
+
+    def __init__(self, argv: list[str]) -> None:
+        self.engine: EngineSettings = EngineSettings(argv[2] if len(argv) > 2 else "")
+        self.input_path: str = argv[3] if len(argv) > 3 else "-"
+        self.output_path: str = argv[4] if len(argv) > 4 else "-"
+        self.workers: int = int(argv[5]) if len(argv) > 5 else os.cpu_count() or 1
+
+    def run(self) -> None:
+        source: TextIO = sys.stdin if self.input_path == "-" else open(self.input_path)
+        target: TextIO = sys.stdout if self.output_path == "-" else open(self.output_path, "w")
+        try:
+            with ProcessPoolExecutor(self.workers, initializer=_initialize_worker, initargs=(self.engine, Game.weights)) as pool:
+                for result in self.__analyze(pool, Analyzer.__read_positions(source)):
+                    target.write(json.dumps(result) + "\n")
+                    target.flush()
+        finally:
+            if source is not sys.stdin:
+                source.close()
+            if target is not sys.stdout:
+                target.close()
+
+    def __analyze(self, pool: ProcessPoolExecutor, positions: Iterator[dict[str, Any]]) -> Iterator[dict[str, Any]]:
+        """Analyses the positions in the pool, keeping a bounded number of them in flight.
+
+        Args:
+            pool (ProcessPoolExecutor): The pool of worker processes.
+            positions (Iterator[dict[str, Any]]): The parsed input lines.
+
+        Yields:
+            dict[str, Any]: The analysis of every position, or the input line's error, in input order.
+        """
+        pending: deque[Future | dict[str, Any]] = deque()
+        for position in positions:
+            pending.append(position if "error" in position else pool.submit(_analyze_position, position))
+            if len(pending) >= self.workers * Analyzer.__PENDING_PER_WORKER:
+                yield Analyzer.__get_result(pending.popleft())
+        while pending:
+            yield Analyzer.__get_result(pending.popleft())
+
+    @staticmethod
+    def __get_result(entry: Future | dict[str, Any]) -> dict[str, Any]:
+        """
+        Args:
+            entry (Future | dict[str, Any]): A submitted analysis, or an input line that could not be read.
+
+        Returns:
+            dict[str, Any]: The output line of the entry.
+        """
+        return entry.result() if isinstance(entry, Future) else entry
+
+    @staticmethod
+    def __read_positions(source: TextIO) -> Iterator[dict[str, Any]]:
+        """Parses the input lazily.
+
+        Args:
+            source (TextIO): The input.
+
+        Yields:
+            dict[str, Any]: The line number, bitboards and player to move of every position,
+            or the line number and an error message for a line that could not be read.
+        """
+        for line_number, line in enumerate(source, 1):
+            fields: list[str] = line.split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            try:
+                if len(fields) != 3:
+                    raise ValueError("expected occupied, color and player to move")
+                occupied: int = int(fields[0], 16)
+                color: int = int(fields[1], 16)
+                if occupied >> 64 or color & ~occupied:
+                    raise ValueError("invalid bitboards")
+                player: Player = Analyzer.__parse_player(fields[2])
+            except ValueError as error:
+                yield {"line": line_number, "error": str(error)}
+                continue
+            yield {"line": line_number, "occupied": occupied, "color": color, "player": player.value}
+
+    @staticmethod
+    def __parse_player(text: str) -> Player:
+        """
+        Args:
+            text (str): The player to move as written in the input.
+
+        Returns:
+            Player: The player to move.
+
+        Raises:
+            ValueError: If the text does not name a player.
+        """
+        match text.lower():
+            case "black" | "b" | "0": return Player.BLACK
+            case "white" | "w" | "1": return Player.WHITE
+            case _: raise ValueError(f"unknown player to move: {text}")
+
+
+_engine: EngineSettings = EngineSettings()
+_bot: Optional[Bot] = None
+
+
+def _initialize_worker(engine: EngineSettings, weights: EvaluationWeights) -> None:
+    """Creates the bot of a worker process, kept for all positions the process analyses.
+
+    Args:
+        engine (EngineSettings): The settings of the engine.
+        weights (EvaluationWeights): The weights of the heuristic evaluation of the main process.
+    """
+    global _engine, _bot
+    Game.set_weights(weights)
+    _engine = engine
+    _bot = engine.create_bot()
+
+
+def _analyze_position(position: dict[str, Any]) -> dict[str, Any]:
+    """Analyses a position in a worker process.
+
+    Args:
+        position (dict[str, Any]): The line number, bitboards and player to move of the position.
+
+    Returns:
+        dict[str, Any]: The output line of the position.
+    """
+    assert _bot is not None
+    board: Board = Board.from_bitboards(position["occupied"], position["color"])
+    player: Player = Player(position["player"])
+    move, stats = _engine.play(_bot, board, player)
+    variation: list[Optional[int]] = _bot.get_principal_variation(board, player, max(stats.depth, 1)) if move is not None else []
+    if move is not None and (not variation or variation[0] != stats.move):
+        variation = [stats.move]
+    return {
+        "line": position["line"],
+        "occupied": f"{position['occupied']:#018x}",
+        "color": f"{position['color']:#018x}",
+        "player": player.name.lower(),
+        "move": move,
+        "score": stats.score,
+        "pv": [Bitboard.to_position(square) if square is not None else None for square in variation],
+        "stats": {key: value for key, value in stats.to_dict().items() if key not in ("move", "score")},
+    }
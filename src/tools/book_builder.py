@@ -0,0 +1,31 @@
+from game.bot import Bot
+from game.opening_book import OpeningBook
+from enums.player import Player
+from ui.user_interface import UserInterface
+from pathlib import Path
+import time
+
+class BookBuilder(UserInterface):
+    """Builds the opening book used by the bot.
+
+    Usage: main.py --book [depth] [search depth] [path]
+    """
+
+    def __init__(self, argv: list[str]) -> None:
+        self.depth: int = int(argv[2]) if len(argv) > 2 else 6
+        self.search_depth: int = int(argv[3]) if len(argv) > 3 else 6
+        self.path: Path = Path(argv[4]) if len(argv) > 4 else OpeningBook.DEFAULT_PATH
+
+    def run(self) -> None:
+        bot: Bot = Bot()
+        positions = OpeningBook.expand(self.depth)
+        records: list[tuple[int, int, Player, int, float]] = []
+        start_time: float = time.time()
+        for index, (board, player) in enumerate(positions):
+            score, move = bot.search(board, player, self.search_depth)
+            if move is not None:
+                records.append((board.occupied, board.color, player, move, score))
+            if (index + 1) % 100 == 0:
+                print(f"Evaluated {index + 1}/{len(positions)} positions in {time.time() - start_time:.1f}s")
+        OpeningBook.write(self.path, records)
+        print(f"Wrote {len(records)} positions to {self.path}")
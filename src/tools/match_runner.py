@@ -0,0 +1,245 @@
+from game.bot import Bot
+from game.evaluation_weights import EvaluationWeights
+from game.game import Game
+from game.search_stats import SearchStats
+from game.pattern_evaluator import PatternEvaluator
+from game.probcut import ProbCut
+from game.opening_book import OpeningBook
+from game.game_archive import GameArchive, GameRecord
+from models.board import Board
+from models.game_state import GameState
+from enums.player import Player
+from ui.user_interface import UserInterface
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+import util.bitboard as Bitboard
+import util.elo as Elo
+import os
+import random
+import time
+
+class EngineSettings:
+    """Settings of one engine in a match.
+
+    Parsed from comma-separated `key=value` pairs, for example `time=0.5,depth=9`:
+    - `time`: The time limit per move in seconds.
+    - `depth`: The depth limit of the search.
+    - `nodes`: The node limit per move, which replaces the time limit.
+    - `hash`: The size of the transposition table in megabytes.
+    - `endgame`: The number of empty squares at which the endgame is solved exactly.
+    - `probcut`: The confidence of the Multi-ProbCut forward pruning, or `off` to search every node to its full depth.
+    - `eval`: The evaluation of the leaves, `heuristic` (`Game.get_board_score`) or `patterns` (the tables at `PatternEvaluator.DEFAULT_PATH`).
+    """
+
+    def __init__(self, description: str = "") -> None:
+        self.time_limit: float = 1.0
+        self.depth_limit: int = 7
+        self.node_limit: Optional[int] = None
+        self.hash_size_mb: float = 16
+        self.endgame_empties: int = 12
+        self.probcut_confidence: Optional[float] = ProbCut.DEFAULT_CONFIDENCE
+        self.evaluation: str = "heuristic"
+        for option in filter(None, description.split(",")):
+            key, value = option.split("=")
+            match key:
+                case "time": self.time_limit = float(value)
+                case "depth": self.depth_limit = int(value)
+                case "nodes": self.node_limit = int(value)
+                case "hash": self.hash_size_mb = float(value)
+                case "endgame": self.endgame_empties = int(value)
+                case "probcut": self.probcut_confidence = None if value == "off" else float(value)
+                case "eval" if value in ("heuristic", "patterns"): self.evaluation = value
+                case "eval": raise ValueError(f"Unknown evaluation: {value}")
+                case _: raise ValueError(f"Unknown engine option: {key}")
+
+    def create_bot(self) -> Bot:
+        """
+        Returns:
+            Bot: A bot with these settings.
+        """
+        patterns: Optional[PatternEvaluator] = PatternEvaluator(PatternEvaluator.DEFAULT_PATH) if self.evaluation == "patterns" else None
+        return Bot(hash_size_mb=self.hash_size_mb, endgame_empties=self.endgame_empties, probcut_confidence=self.probcut_confidence, patterns=patterns)
+
+    def play(self, bot: Bot, board: Board, player: Player) -> tuple[Optional[tuple[int, int]], SearchStats]:
+        """Finds a move with these settings.
+
+        Args:
+            bot (Bot): A bot created by `EngineSettings.create_bot`.
+            board (Board): The current state of the game board.
+            player (Player): The player to move.
+
+        Returns:
+            tuple[Optional[tuple[int, int]], SearchStats]: The move found (row, column), or None if no move is available, 
+            and the statistics of the search.
+        """
+        return bot.bot_move(board, player, self.time_limit, self.depth_limit, self.node_limit)
+
+    def __str__(self) -> str:
+        limit: str = f"nodes={self.node_limit}" if self.node_limit is not None else f"time={self.time_limit}"
+        probcut: str = f"{self.probcut_confidence}" if self.probcut_confidence is not None else "off"
+        return f"{limit},depth={self.depth_limit},hash={self.hash_size_mb},endgame={self.endgame_empties},probcut={probcut},eval={self.evaluation}"
+
+
+class MatchRunner(UserInterface):
+    """Plays two engine settings against each other without a user interface.
+
+    Every opening is played twice, once with each engine as black. The games are spread over
+    a process pool, and each process keeps one bot per engine for all its games. The match stops
+    early once the sequential probability ratio test accepts or rejects that the first engine is stronger.
+    If an archive path is given, the games are appended to that `GameArchive` in batches.
+
+    Usage: main.py --match [games] [engine A] [engine B] [workers] [archive]
+    """
+
+    __OPENING_DEPTH: int = 4
+    __ELO0: float = 0
+    __ELO1: float = 10
+    __ALPHA: float = 0.05
+    __BETA: float = 0.05
+    __REPORT_INTERVAL: int = 10
+    __ARCHIVE_BATCH: int = 1000
+
+    def __init__(self, argv: list[str]) -> None:
+        self.games: int = int(argv[2]) if len(argv) > 2 else 100
+        self.engines: tuple[EngineSettings, EngineSettings] = (
+            EngineSettings(argv[3] if len(argv) > 3 else ""),
+            EngineSettings(argv[4] if len(argv) > 4 else ""),
+        )
+        self.workers: int = int(argv[5]) if len(argv) > 5 else os.cpu_count() or 1
+        self.archive_path: Optional[Path] = Path(argv[6]) if len(argv) > 6 else None
+        self.records: list[GameRecord] = []
+        self.wins: int = 0
+        self.draws: int = 0
+        self.losses: int = 0
+        self.nodes: list[int] = [0, 0]
+        self.search_time: list[float] = [0, 0]
+
+    def run(self) -> None:
+        print(f"Engine A: {self.engines[0]}")
+        print(f"Engine B: {self.engines[1]}")
+        openings: list[tuple[int, int, int]] = [
+            (board.occupied, board.color, player.value)
+            for board, player in OpeningBook.expand(MatchRunner.__OPENING_DEPTH)
+            if board.occupied.bit_count() == 4 + MatchRunner.__OPENING_DEPTH
+        ]
+        random.Random(0).shuffle(openings)
+        lower, upper = Elo.get_sprt_bounds(MatchRunner.__ALPHA, MatchRunner.__BETA)
+
+        start_time: float = time.monotonic()
+        with ProcessPoolExecutor(self.workers, initializer=_initialize_worker, initargs=(self.engines, Game.weights)) as pool:
+            futures: list[Future] = [
+                pool.submit(_play_game, *openings[(game // 2) % len(openings)], game % 2 == 0)
+                for game in range(self.games)
+            ]
+            for future in as_completed(futures):
+                self.__add_result(*future.result())
+                llr: float = Elo.get_llr(self.wins, self.draws, self.losses, MatchRunner.__ELO0, MatchRunner.__ELO1)
+                played: int = self.wins + self.draws + self.losses
+                if played % MatchRunner.__REPORT_INTERVAL == 0:
+                    self.__report(played, time.monotonic() - start_time, llr)
+                if not lower < llr < upper:
+                    print(f"SPRT: {'H1' if llr >= upper else 'H0'} accepted")
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+        self.__save_records()
+        played = self.wins + self.draws + self.losses
+        self.__report(played, time.monotonic() - start_time, Elo.get_llr(self.wins, self.draws, self.losses, MatchRunner.__ELO0, MatchRunner.__ELO1))
+
+    def __add_result(self, difference: int, nodes: tuple[int, int], search_time: tuple[float, float], record: GameRecord) -> None:
+        """Adds a finished game to the totals and to the games waiting to be archived.
+
+        Args:
+            difference (int): The final disc difference in favour of engine A.
+            nodes (tuple[int, int]): The nodes searched by each engine.
+            search_time (tuple[float, float]): The time spent searching by each engine.
+            record (GameRecord): The record of the game.
+        """
+        if self.archive_path is not None:
+            self.records.append(record)
+            if len(self.records) >= MatchRunner.__ARCHIVE_BATCH:
+                self.__save_records()
+        if difference > 0:
+            self.wins += 1
+        elif difference < 0:
+            self.losses += 1
+        else:
+            self.draws += 1
+        for engine in range(2):
+            self.nodes[engine] += nodes[engine]
+            self.search_time[engine] += search_time[engine]
+
+    def __save_records(self) -> None:
+        """Appends the games waiting to be archived to the archive."""
+        if self.archive_path is not None and self.records:
+            GameArchive.append(self.archive_path, self.records)
+            self.records = []
+
+    def __report(self, played: int, elapsed: float, llr: float) -> None:
+        """Prints the result of the match so far.
+
+        Args:
+            played (int): The number of games finished.
+            elapsed (float): The time since the match started in seconds.
+            llr (float): The log-likelihood ratio of the SPRT.
+        """
+        elo: float = Elo.get_elo(Elo.get_score(self.wins, self.draws, self.losses))
+        error: float = Elo.get_elo_error(self.wins, self.draws, self.losses)
+        speeds: list[str] = [
+            f"{self.nodes[engine] / self.search_time[engine]:.0f}" if self.search_time[engine] else "-" for engine in range(2)
+        ]
+        print(
+            f"Games: {played}  W/D/L: {self.wins}/{self.draws}/{self.losses}  Elo: {elo:.1f} +/- {error:.1f}  LLR: {llr:.2f}  "
+            f"Games/s: {played / elapsed:.2f}  Nodes/s: {sum(self.nodes) / elapsed:.0f} (A: {speeds[0]}, B: {speeds[1]})"
+        )
+
+
+_engines: tuple[EngineSettings, EngineSettings] = (EngineSettings(), EngineSettings())
+_bots: list[Bot] = []
+
+
+def _initialize_worker(engines: tuple[EngineSettings, EngineSettings], weights: EvaluationWeights) -> None:
+    """Creates the bots of a worker process, one per engine, kept for all games the process plays.
+
+    Args:
+        engines (tuple[EngineSettings, EngineSettings]): The settings of both engines.
+        weights (EvaluationWeights): The weights of the heuristic evaluation of the main process.
+    """
+    global _engines, _bots
+    Game.set_weights(weights)
+    _engines = engines
+    _bots = [engine.create_bot() for engine in engines]
+
+
+def _play_game(occupied: int, color: int, player: int, first_is_black: bool) -> tuple[int, tuple[int, int], tuple[float, float], GameRecord]:
+    """Plays a game between the two engines from an opening position.
+
+    Args:
+        occupied (int): The bitboard of occupied squares of the opening.
+        color (int): The bitboard of tile colors of the opening.
+        player (int): The value of the player to move in the opening.
+        first_is_black (bool): Whether engine A plays black.
+
+    Returns:
+        tuple[int, tuple[int, int], tuple[float, float], GameRecord]: The final disc difference in favour of engine A,
+        the nodes searched and the time spent searching by each engine, and the record of the game.
+    """
+    state: GameState = GameState(Board.from_bitboards(occupied, color), Player(player))
+    nodes: list[int] = [0, 0]
+    search_time: list[float] = [0, 0]
+    while not state.has_ended():
+        if not state.legal_moves:
+            state.switch_player()
+            continue
+        engine: int = 0 if (state.current_player == Player.BLACK) == first_is_black else 1
+        move, stats = _engines[engine].play(_bots[engine], state.board, state.current_player)
+        search_time[engine] += stats.time
+        nodes[engine] += stats.nodes
+        state.play(move if move is not None else Bitboard.to_position(Bitboard.iterate(state.legal_moves)[0]))
+
+    difference: int = state.board.black_tiles - state.board.white_tiles
+    black, white = (0, 1) if first_is_black else (1, 0)
+    record: GameRecord = GameRecord.from_state(state, (str(_engines[black]), str(_engines[white])), (search_time[black], search_time[white]))
+    return difference if first_is_black else -difference, (nodes[0], nodes[1]), (search_time[0], search_time[1]), record
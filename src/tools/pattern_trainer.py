@@ -0,0 +1,189 @@
+from game.game_archive import GameArchive
+from game.pattern_evaluator import PatternEvaluator
+from enums.player import Player
+from ui.user_interface import UserInterface
+from pathlib import Path
+from types import ModuleType
+from typing import Iterator, TYPE_CHECKING
+import util.symmetry as Symmetry
+import time
+
+if TYPE_CHECKING:
+    import numpy as np
+
+class PatternTrainer(UserInterface):
+    """Trains the tables of the pattern evaluation on the games of an archive.
+
+    Every position of the games is a sample whose target is the final disc difference of the game
+    from the point of view of the player to move, in thousandths of a disc. The tables of all phases
+    are fitted by ridge regression, solved with the conjugate gradient method since there is one unknown
+    per table entry; the ridge term keeps rare entries close to zero. The pattern indices are computed
+    with NumPy (see `util.features`) in every iteration instead of being stored, so only the bitboards
+    of the positions are held in memory.
+
+    Most patterns are symmetric, for example an edge under a mirror, so the entries of a configuration
+    and of its mirror image are tied to the same value, which halves the number of unknowns.
+
+    Every tenth game is held out, and the tables of the iteration with the lowest error on its positions
+    are written, which stops the fit before it learns the noise of a small archive.
+
+    Usage: main.py --patterns [archive] [path] [iterations]
+    """
+
+    __BATCH: int = 200000
+    __RIDGE: float = 2.0
+    __DISC: int = 1000
+    __HELD_OUT: int = 10
+
+    def __init__(self, argv: list[str]) -> None:
+        self.archive_path: Path = Path(argv[2]) if len(argv) > 2 else Path("games.bin")
+        self.path: Path = Path(argv[3]) if len(argv) > 3 and argv[3] != "-" else PatternEvaluator.DEFAULT_PATH
+        self.iterations: int = int(argv[4]) if len(argv) > 4 else 50
+
+    def run(self) -> None:
+        try:
+            import numpy as np
+            import util.features as Features
+        except ImportError:
+            print("The pattern trainer requires NumPy: pip install .[tune]")
+            return
+
+        start_time: float = time.monotonic()
+        players: list[int] = []
+        opponents: list[int] = []
+        phases: list[int] = []
+        targets: list[int] = []
+        held_out: list[bool] = []
+        archive: GameArchive = GameArchive(self.archive_path)
+        for game, (_, record) in enumerate(archive.games()):
+            for board, player in record.replay():
+                own, opponent = board.get_bitboards(player)
+                players.append(own)
+                opponents.append(opponent)
+                phases.append(PatternEvaluator.get_phase(board))
+                targets.append(record.result if player == Player.BLACK else -record.result)
+                held_out.append(game % PatternTrainer.__HELD_OUT == PatternTrainer.__HELD_OUT - 1)
+        archive.close()
+        if not targets:
+            print("No positions to train on")
+            return
+        print(f"Read {len(targets)} positions in {time.monotonic() - start_time:.1f}s")
+
+        columns: list[np.ndarray] = [
+            np.array(players, dtype=np.uint64),
+            np.array(opponents, dtype=np.uint64),
+            np.array(phases, dtype=np.int32),
+            np.array(targets, dtype=np.float64) * PatternTrainer.__DISC,
+        ]
+        validation: np.ndarray = np.array(held_out)
+        del players, opponents, phases, targets, held_out
+        training_set: list[np.ndarray] = [column[~validation] for column in columns]
+        validation_set: list[np.ndarray] = [column[validation] for column in columns]
+        del columns
+        goals: np.ndarray = training_set[3]
+        entries: np.ndarray = PatternTrainer.__get_tied_entries()
+
+        size: int = PatternEvaluator.PHASE_COUNT * PatternEvaluator.PHASE_SIZE
+        weights: np.ndarray = np.zeros(size)
+        counts: np.ndarray = np.zeros(size)
+        residual: np.ndarray = np.zeros(size)
+        for indices, batch in PatternTrainer.__batches(Features, entries, training_set):
+            counts += np.bincount(indices.ravel(), minlength=size)
+            residual += np.bincount(indices.ravel(), weights=np.repeat(goals[batch], indices.shape[1]), minlength=size)
+        direction: np.ndarray = residual.copy()
+        residual_square: float = float(residual @ residual)
+        predictions: np.ndarray = np.zeros(len(goals))
+        best_error: float = PatternTrainer.__get_error(Features, entries, weights, validation_set)
+        best_iteration: int = 0
+        best_weights: np.ndarray = weights.copy()
+
+        for iteration in range(1, self.iterations + 1):
+            product: np.ndarray = PatternTrainer.__RIDGE * direction
+            changes: np.ndarray = np.empty(len(goals))
+            for indices, batch in PatternTrainer.__batches(Features, entries, training_set):
+                changes[batch] = direction[indices].sum(axis=1)
+                product += np.bincount(indices.ravel(), weights=np.repeat(changes[batch], indices.shape[1]), minlength=size)
+            step: float = residual_square / max(float(direction @ product), 1e-12)
+            weights += step * direction
+            predictions += step * changes
+            residual -= step * product
+            previous: float = residual_square
+            residual_square = float(residual @ residual)
+            direction = residual + residual_square / max(previous, 1e-12) * direction
+
+            training_error: float = float(np.sqrt(np.mean((goals - predictions) ** 2)))
+            validation_error: float = PatternTrainer.__get_error(Features, entries, weights, validation_set)
+            if validation_error < best_error:
+                best_error, best_iteration, best_weights = validation_error, iteration, weights.copy()
+            print(
+                f"Iteration {iteration}/{self.iterations}: RMSE {training_error / PatternTrainer.__DISC:.3f} discs, "
+                f"held out {validation_error / PatternTrainer.__DISC:.3f} discs ({time.monotonic() - start_time:.1f}s)"
+            )
+
+        tables: np.ndarray = np.clip(np.rint(best_weights[entries]), -32768, 32767).astype("<i2")
+        PatternEvaluator.write(self.path, tables.tobytes())
+        print(f"Wrote the tables of iteration {best_iteration} ({int(np.count_nonzero(counts))} entries seen) to {self.path}")
+
+    @staticmethod
+    def __get_error(features: ModuleType, entries: 'np.ndarray', weights: 'np.ndarray', positions: list['np.ndarray']) -> float:
+        """
+        Args:
+            features (ModuleType): The `util.features` module.
+            entries (np.ndarray): The entry every entry of the tables is tied to.
+            weights (np.ndarray): The entries of the tables of all phases.
+            positions (list[np.ndarray]): The bitboards of the player to move and of the opponent, the phases and the targets.
+
+        Returns:
+            float: The root mean square error of the tables on the positions, or infinity if there are none.
+        """
+        error: float = 0.0
+        for indices, batch in PatternTrainer.__batches(features, entries, positions):
+            difference: np.ndarray = positions[3][batch] - weights[indices].sum(axis=1)
+            error += float(difference @ difference)
+        return (error / len(positions[3])) ** 0.5 if len(positions[3]) else float("inf")
+
+    @staticmethod
+    def __batches(features: ModuleType, entries: 'np.ndarray', positions: list['np.ndarray']) -> Iterator[tuple['np.ndarray', slice]]:
+        """Computes the table entries of the positions in batches.
+
+        Args:
+            features (ModuleType): The `util.features` module.
+            entries (np.ndarray): The entry every entry of the tables is tied to.
+            positions (list[np.ndarray]): The bitboards of the player to move and of the opponent, the phases and the targets.
+
+        Yields:
+            Iterator[tuple[np.ndarray, slice]]: The positions of the tied entries of all pattern instances within the tables
+            of all phases, and the slice of the positions of the batch.
+        """
+        for start in range(0, len(positions[2]), PatternTrainer.__BATCH):
+            batch: slice = slice(start, start + PatternTrainer.__BATCH)
+            indices: np.ndarray = features.get_pattern_indices(positions[0][batch], positions[1][batch])
+            yield entries[indices + (positions[2][batch] * PatternEvaluator.PHASE_SIZE)[:, None]], batch
+
+    @staticmethod
+    def __get_tied_entries() -> 'np.ndarray':
+        """Ties the entries of every configuration and its mirror image.
+
+        The mirror of a pattern is the first symmetry of the board that maps its squares onto themselves
+        in a different order. Patterns without such a symmetry keep all their entries.
+
+        Returns:
+            np.ndarray: The entry of the tables of all phases that every entry is tied to, the lower of the two.
+        """
+        import numpy as np
+        tied: list[np.ndarray] = []
+        for pattern, (_, length, _) in enumerate(PatternEvaluator.PATTERNS):
+            squares: list[int] = PatternEvaluator.get_squares(pattern)
+            permutation: list[int] = list(range(length))
+            for transform in range(1, 8):
+                mapped: list[int] = [Symmetry.transform_square(square, transform) for square in squares]
+                if sorted(mapped) == sorted(squares) and mapped != squares:
+                    permutation = [squares.index(square) for square in mapped]
+                    break
+            indices: np.ndarray = np.arange(3 ** length)
+            mirrored: np.ndarray = np.zeros_like(indices)
+            for digit, target in enumerate(permutation):
+                mirrored += indices // 3 ** digit % 3 * 3 ** target
+            tied.append(PatternEvaluator.OFFSETS[pattern] + np.minimum(indices, mirrored))
+        entries: np.ndarray = np.concatenate(tied)
+        return np.concatenate([phase * PatternEvaluator.PHASE_SIZE + entries for phase in range(PatternEvaluator.PHASE_COUNT)])
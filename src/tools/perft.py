@@ -0,0 +1,244 @@
+from game.game import Game
+from game.pattern_evaluator import PatternEvaluator
+from models.board import Board
+from models.game_state import GameState
+from enums.player import Player, get_opponent
+from ui.user_interface import UserInterface
+from pathlib import Path
+from typing import Any, Callable, Optional
+import util.bitboard as Bitboard
+import functools
+import json
+import platform
+import random
+import sys
+import time
+
+class Perft(UserInterface):
+    """Checks and times move generation, making moves and evaluation.
+
+    Perft counts the leaf nodes of the game tree to a fixed depth, from the starting position
+    and from a set of bundled positions, and checks the counts against reference values.
+    A pass counts as a move, and a finished game counts as a leaf.
+    The micro-benchmarks time move generation, making and reverting moves and evaluation separately,
+    including the pattern evaluation if its tables have been trained.
+
+    The results are printed and written as JSON, so they can be compared across runs.
+    The process exits with status 1 if a count does not match.
+
+    Usage: main.py --perft [depth] [path]
+    """
+
+    START_COUNTS: list[int] = [1, 4, 12, 56, 244, 1396, 8200, 55092, 390216, 3005288]
+    """
+    Reference leaf counts from the starting position, indexed by depth.
+    """
+
+    POSITIONS: list[tuple[str, int, int, Player, int, int]] = [
+        ("opening", 0x005C381878504000, 0x0000080878404000, Player.BLACK, 5, 51816),
+        ("early midgame", 0x5CD97E7C1E330000, 0x40C0542018200000, Player.BLACK, 5, 174787),
+        ("late midgame", 0xE07E3F3E3E7F3656, 0x603028342A532244, Player.BLACK, 5, 287581),
+        ("endgame", 0x2CFC7FFFFFFFFBDC, 0x08C44F036F512150, Player.BLACK, 7, 336727),
+        ("pass", 0xFFFFFFFFFFFFDDBC, 0x063E5A6E520E0C00, Player.WHITE, 6, 18),
+    ]
+    """
+    Bundled positions as (name, occupied, color, player to move, depth, reference leaf count).
+    The reference counts were computed with the original array-based move generator.
+    """
+
+    __BENCHMARK_GAMES: int = 200
+    __BENCHMARK_REPEAT: int = 3
+
+    def __init__(self, argv: list[str]) -> None:
+        self.depth: int = int(argv[2]) if len(argv) > 2 else 6
+        self.path: Optional[Path] = Path(argv[3]) if len(argv) > 3 else None
+
+    def run(self) -> None:
+        results: dict[str, Any] = {
+            "python": platform.python_version(),
+            "perft": [],
+            "benchmarks": [],
+        }
+        expected: Optional[int] = Perft.START_COUNTS[self.depth] if self.depth < len(Perft.START_COUNTS) else None
+        results["perft"].append(Perft.__run_perft("start", Board(), Player.BLACK, self.depth, expected))
+        for name, occupied, color, player, depth, nodes in Perft.POSITIONS:
+            results["perft"].append(Perft.__run_perft(name, Board.from_bitboards(occupied, color), player, depth, nodes))
+
+        positions: list[tuple[Board, Player]] = Perft.__get_benchmark_positions()
+        moves: list[tuple[Board, Player, int, int]] = [
+            (board, player, move, Game.get_flips(board, player, move))
+            for board, player in positions
+            for move in Bitboard.iterate(Game.get_legal_moves(board, player))
+        ]
+        results["benchmarks"] += [
+            Perft.__run_benchmark("move generation", positions, Perft.__generate_moves),
+            Perft.__run_benchmark("cached move lookup", positions, Perft.__look_up_moves),
+            Perft.__run_benchmark("make and unmake", moves, Perft.__make_and_unmake),
+            Perft.__run_benchmark("incremental evaluation", positions, Perft.__evaluate_incremental),
+            Perft.__run_benchmark("full evaluation", positions, Perft.__evaluate_full),
+        ]
+        patterns: Optional[PatternEvaluator] = PatternEvaluator.open_default()
+        if patterns is not None:
+            results["benchmarks"].append(Perft.__run_benchmark("pattern evaluation", positions, functools.partial(Perft.__evaluate_patterns, patterns)))
+            patterns.close()
+
+        for entry in results["perft"]:
+            status: str = "ok" if entry["passed"] else f"FAILED (expected {entry['expected']})"
+            print(f"perft {entry['name']} depth {entry['depth']}: {entry['nodes']} nodes, {entry['per_second']:.0f} nodes/s, {status}")
+        for entry in results["benchmarks"]:
+            print(f"{entry['name']}: {entry['operations']} operations, {entry['per_second']:.0f} operations/s")
+
+        output: str = json.dumps(results, indent=2)
+        if self.path is None:
+            print(output)
+        else:
+            self.path.write_text(output)
+            print(f"Wrote results to {self.path}")
+
+        if not all(entry["passed"] for entry in results["perft"]):
+            sys.exit(1)
+
+    @staticmethod
+    def count(board: Board, player: Player, depth: int) -> int:
+        """Counts the leaf nodes of the game tree.
+
+        Moves are played and reverted on the given board in place.
+
+        Args:
+            board (Board): The current state of the game board.
+            player (Player): The player to move.
+            depth (int): The number of moves (plies) to expand, passes included.
+
+        Returns:
+            int: The number of positions reached at the given depth, plus the finished games reached earlier.
+        """
+        if depth == 0:
+            return 1
+        moves: int = Game.get_legal_moves(board, player)
+        opponent: Player = get_opponent(player)
+        if not moves:
+            if not Game.get_legal_moves(board, opponent):
+                return 1
+            return Perft.count(board, opponent, depth - 1)
+
+        nodes: int = 0
+        for move, flips in Game.move_cache.get_flips(board.occupied, board.color, player).items():
+            board.make_move(move, flips, player)
+            nodes += Perft.count(board, opponent, depth - 1)
+            board.unmake_move(move, flips, player)
+        return nodes
+
+    @staticmethod
+    def __run_perft(name: str, board: Board, player: Player, depth: int, expected: Optional[int]) -> dict[str, Any]:
+        """Counts the leaf nodes from a position and checks the count and that the board was restored.
+
+        Args:
+            name (str): The name of the position.
+            board (Board): The position.
+            player (Player): The player to move.
+            depth (int): The depth to count to.
+            expected (Optional[int]): The reference count, or None if it is not known.
+
+        Returns:
+            dict[str, Any]: The result of the run.
+        """
+        before: dict[str, int] = dict(vars(board))
+        start_time: float = time.perf_counter()
+        nodes: int = Perft.count(board, player, depth)
+        elapsed: float = time.perf_counter() - start_time
+        return {
+            "name": name,
+            "depth": depth,
+            "nodes": nodes,
+            "expected": expected,
+            "passed": (expected is None or nodes == expected) and vars(board) == before,
+            "seconds": elapsed,
+            "per_second": nodes / elapsed if elapsed else 0,
+        }
+
+    @staticmethod
+    def __run_benchmark(name: str, items: list, operation: Callable[[list], None]) -> dict[str, Any]:
+        """Times an operation over all items, keeping the fastest of several runs.
+
+        Args:
+            name (str): The name of the benchmark.
+            items (list): The inputs of the operation.
+            operation (Callable[[list], None]): Runs the operation once for every item.
+
+        Returns:
+            dict[str, Any]: The result of the benchmark.
+        """
+        elapsed: float = min(Perft.__time(operation, items) for _ in range(Perft.__BENCHMARK_REPEAT))
+        return {
+            "name": name,
+            "operations": len(items),
+            "seconds": elapsed,
+            "per_second": len(items) / elapsed if elapsed else 0,
+        }
+
+    @staticmethod
+    def __time(operation: Callable[[list], None], items: list) -> float:
+        """Returns the time in seconds one run of the operation takes."""
+        start_time: float = time.perf_counter()
+        operation(items)
+        return time.perf_counter() - start_time
+
+    @staticmethod
+    def __get_benchmark_positions() -> list[tuple[Board, Player]]:
+        """Collects every position of a fixed set of random games.
+
+        Returns:
+            list[tuple[Board, Player]]: The positions paired with the player to move.
+        """
+        generator: random.Random = random.Random(0)
+        positions: list[tuple[Board, Player]] = []
+        for _ in range(Perft.__BENCHMARK_GAMES):
+            state: GameState = GameState()
+            while not state.has_ended():
+                if not state.legal_moves:
+                    state.switch_player()
+                    continue
+                positions.append((state.board.deepcopy(), state.current_player))
+                state.play(Bitboard.to_position(generator.choice(Bitboard.iterate(state.legal_moves))))
+        return positions
+
+    @staticmethod
+    def __generate_moves(positions: list[tuple[Board, Player]]) -> None:
+        """Generates the legal moves and their flips for every position, without the move cache."""
+        for board, player in positions:
+            own, opponent = board.get_bitboards(player)
+            for move in Bitboard.iterate(Bitboard.get_legal_moves(own, opponent)):
+                Bitboard.get_flips(own, opponent, move)
+
+    @staticmethod
+    def __look_up_moves(positions: list[tuple[Board, Player]]) -> None:
+        """Looks up the legal moves of every position in the move cache, which holds them after the first run."""
+        for board, player in positions:
+            Game.get_legal_moves(board, player)
+
+    @staticmethod
+    def __make_and_unmake(moves: list[tuple[Board, Player, int, int]]) -> None:
+        """Plays and reverts every move."""
+        for board, player, move, flips in moves:
+            board.make_move(move, flips, player)
+            board.unmake_move(move, flips, player)
+
+    @staticmethod
+    def __evaluate_incremental(positions: list[tuple[Board, Player]]) -> None:
+        """Evaluates every position from the running terms of the board, starting with an empty move cache."""
+        Game.move_cache.clear()
+        for board, player in positions:
+            Game.get_incremental_score(board, player)
+
+    @staticmethod
+    def __evaluate_full(positions: list[tuple[Board, Player]]) -> None:
+        """Evaluates every position from scratch, starting with an empty move cache."""
+        Game.move_cache.clear()
+        for board, player in positions:
+            Game.get_board_score(board, player)
+
+    @staticmethod
+    def __evaluate_patterns(patterns: PatternEvaluator, positions: list[tuple[Board, Player]]) -> None:
+        """Evaluates every position with the pattern tables."""
+        for board, player in positions:
+            patterns.evaluate(board, player)
@@ -0,0 +1,192 @@
+from game.bot import Bot
+from game.game import Game
+from game.game_archive import GameArchive
+from game.probcut import ProbCut
+from game.pattern_evaluator import PatternEvaluator
+from game.time_manager import TimeManager
+from models.board import Board
+from models.game_state import GameState
+from enums.player import Player
+from ui.user_interface import UserInterface
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+import util.bitboard as Bitboard
+import math
+import os
+import random
+import time
+
+class ProbCutFitter(UserInterface):
+    """Generates the data for the Multi-ProbCut parameters and fits them.
+
+    Sample positions are drawn from a game archive, or from random games if no archive is given.
+    Every position is searched with iterative deepening to the maximum depth without forward pruning,
+    and the score of each deep depth is fitted against the score of its shallow depth by least squares,
+    separately for each game phase.
+
+    The positions are searched with the evaluation the parameters are for: `heuristic` (`Game.get_board_score`),
+    written to `ProbCut.DEFAULT_PATH`, or `patterns` (the tables at `PatternEvaluator.DEFAULT_PATH`), written to
+    `ProbCut.PATTERNS_PATH`.
+
+    Usage: main.py --probcut [positions] [max depth] [path] [archive] [workers] [evaluation]
+    """
+
+    __PHASES: list[int] = [44, 32, 20, 0]
+    __MIN_EMPTIES: int = 14
+    __MAX_EMPTIES: int = 56
+    __MIN_DEPTH: int = 3
+    __MIN_SAMPLES: int = 20
+
+    def __init__(self, argv: list[str]) -> None:
+        self.positions: int = int(argv[2]) if len(argv) > 2 else 200
+        self.max_depth: int = int(argv[3]) if len(argv) > 3 else 6
+        self.archive_path: Optional[Path] = Path(argv[5]) if len(argv) > 5 and argv[5] != "-" else None
+        self.workers: int = int(argv[6]) if len(argv) > 6 else os.cpu_count() or 1
+        evaluation: str = argv[7] if len(argv) > 7 else "heuristic"
+        if evaluation not in ("heuristic", "patterns"):
+            raise ValueError(f"Unknown evaluation: {evaluation}")
+        self.patterns_path: Optional[Path] = PatternEvaluator.DEFAULT_PATH if evaluation == "patterns" else None
+        default_path: Path = ProbCut.PATTERNS_PATH if self.patterns_path is not None else ProbCut.DEFAULT_PATH
+        self.path: Path = Path(argv[4]) if len(argv) > 4 and argv[4] != "-" else default_path
+
+    def run(self) -> None:
+        rng: random.Random = random.Random(0)
+        positions: list[tuple[int, int, int]] = (
+            self.__sample_archive(rng) if self.archive_path is not None else [ProbCutFitter.__play_random(rng) for _ in range(self.positions)]
+        )
+        start_time: float = time.monotonic()
+        samples: list[tuple[int, dict[int, float]]] = []
+        with ProcessPoolExecutor(self.workers, initializer=Game.set_weights, initargs=(Game.weights,)) as pool:
+            for index, scores in enumerate(pool.map(_search_position, positions, [self.max_depth] * len(positions), [self.patterns_path] * len(positions))):
+                samples.append((64 - positions[index][0].bit_count(), scores))
+                if (index + 1) % 10 == 0:
+                    print(f"Searched {index + 1}/{len(positions)} positions in {time.monotonic() - start_time:.1f}s")
+
+        parameters: list[tuple[int, int, int, float, float, float]] = []
+        for minimum, maximum in zip(ProbCutFitter.__PHASES, [64] + ProbCutFitter.__PHASES):
+            phase_samples: list[dict[int, float]] = [scores for empties, scores in samples if minimum < empties <= maximum]
+            for deep in range(ProbCutFitter.__MIN_DEPTH, self.max_depth + 1):
+                shallow: int = (deep - 1) // 2
+                pairs: list[tuple[float, float]] = [(scores[shallow], scores[deep]) for scores in phase_samples if shallow in scores and deep in scores]
+                fit: Optional[tuple[float, float, float]] = ProbCutFitter.fit(pairs)
+                if fit is None:
+                    continue
+                parameters.append((minimum, deep, shallow, *fit))
+                print(f"Empties {minimum + 1}-{maximum}, depth {deep} from {shallow}: slope {fit[0]:.3f}, intercept {fit[1]:.1f}, sigma {fit[2]:.1f} ({len(pairs)} samples)")
+        ProbCut.write(self.path, parameters, Game.weights.get_fingerprint() if self.patterns_path is None else None)
+        print(f"Wrote {len(parameters)} depth pairs to {self.path}")
+
+    @staticmethod
+    def fit(pairs: list[tuple[float, float]]) -> Optional[tuple[float, float, float]]:
+        """Fits the deep scores against the shallow scores by least squares.
+
+        Args:
+            pairs (list[tuple[float, float]]): The (shallow score, deep score) pairs.
+
+        Returns:
+            Optional[tuple[float, float, float]]: The slope, intercept and standard deviation of the error,
+            or None if there are too few pairs or the scores are not positively correlated.
+        """
+        count: int = len(pairs)
+        if count < ProbCutFitter.__MIN_SAMPLES:
+            return None
+        mean_x: float = sum(x for x, _ in pairs) / count
+        mean_y: float = sum(y for _, y in pairs) / count
+        variance: float = sum((x - mean_x) ** 2 for x, _ in pairs)
+        covariance: float = sum((x - mean_x) * (y - mean_y) for x, y in pairs)
+        if variance == 0 or covariance <= 0:
+            return None
+        slope: float = covariance / variance
+        intercept: float = mean_y - slope * mean_x
+        sigma: float = math.sqrt(sum((y - slope * x - intercept) ** 2 for x, y in pairs) / (count - 2))
+        return slope, intercept, sigma
+
+    def __sample_archive(self, rng: random.Random) -> list[tuple[int, int, int]]:
+        """Draws positions uniformly from the games of the archive, reading it once.
+
+        Args:
+            rng (random.Random): The random number generator.
+
+        Returns:
+            list[tuple[int, int, int]]: The occupied and color bitboards and the value of the player to move of the positions.
+        """
+        assert self.archive_path is not None
+        archive: GameArchive = GameArchive(self.archive_path)
+        positions: list[tuple[int, int, int]] = []
+        seen: int = 0
+        for _, record in archive.games():
+            for board, player in record.replay():
+                if not ProbCutFitter.__is_sample(board, player):
+                    continue
+                seen += 1
+                if len(positions) < self.positions:
+                    positions.append((board.occupied, board.color, player.value))
+                else:
+                    index: int = rng.randrange(seen)
+                    if index < self.positions:
+                        positions[index] = (board.occupied, board.color, player.value)
+        archive.close()
+        return positions
+
+    @staticmethod
+    def __play_random(rng: random.Random) -> tuple[int, int, int]:
+        """Plays random moves until a randomly chosen number of empty squares is reached.
+
+        Args:
+            rng (random.Random): The random number generator.
+
+        Returns:
+            tuple[int, int, int]: The occupied and color bitboards and the value of the player to move of the position.
+        """
+        while True:
+            empties: int = rng.randint(ProbCutFitter.__MIN_EMPTIES, ProbCutFitter.__MAX_EMPTIES)
+            state: GameState = GameState()
+            while 64 - state.board.occupied.bit_count() > empties and not state.has_ended():
+                if not state.legal_moves:
+                    state.switch_player()
+                    continue
+                state.play(Bitboard.to_position(rng.choice(Bitboard.iterate(state.legal_moves))))
+            if ProbCutFitter.__is_sample(state.board, state.current_player):
+                return state.board.occupied, state.board.color, state.current_player.value
+
+    @staticmethod
+    def __is_sample(board: Board, player: Player) -> bool:
+        """
+        Args:
+            board (Board): The position.
+            player (Player): The player to move.
+
+        Returns:
+            bool: True if the position is in the range of empty squares that is searched and the player can move.
+        """
+        empties: int = 64 - board.occupied.bit_count()
+        own, opponent = board.get_bitboards(player)
+        return ProbCutFitter.__MIN_EMPTIES <= empties <= ProbCutFitter.__MAX_EMPTIES and Bitboard.get_legal_moves(own, opponent) != 0
+
+
+def _search_position(position: tuple[int, int, int], max_depth: int, patterns_path: Optional[Path]) -> dict[int, float]:
+    """Searches a position without forward pruning in a worker process.
+
+    Args:
+        position (tuple[int, int, int]): The occupied and color bitboards and the value of the player to move.
+        max_depth (int): The depth of the last iteration.
+        patterns_path (Optional[Path]): The pattern tables to evaluate with, or None for the heuristic evaluation.
+
+    Returns:
+        dict[int, float]: The score of every completed depth, without the final results of the game.
+    """
+    occupied, color, player = position
+    patterns: Optional[PatternEvaluator] = PatternEvaluator(patterns_path) if patterns_path is not None else None
+    bot: Bot = Bot(probcut_confidence=None, patterns=patterns)
+    scores: dict[int, float] = {}
+
+    def record(depth: int, score: float, move: Optional[int]) -> None:
+        if abs(score) < ProbCut.SCORE_LIMIT:
+            scores[depth] = score
+
+    bot.prepare_search()
+    bot.iterative_deepening(Board.from_bitboards(occupied, color), Player(player), TimeManager(), max_depth, progress=record)
+    if patterns is not None:
+        patterns.close()
+    return scores
@@ -0,0 +1,176 @@
+from game.bot import Bot
+from game.evaluation_weights import EvaluationWeights
+from game.game import Game
+from game.game_archive import GameArchive
+from game.probcut import ProbCut
+from models.board import Board
+from enums.player import Player
+from ui.user_interface import UserInterface
+from pathlib import Path
+from types import ModuleType
+from typing import Optional, TYPE_CHECKING
+import time
+
+if TYPE_CHECKING:
+    import numpy as np
+
+class WeightTuner(UserInterface):
+    """Fits the weights of the evaluation function to the games of an archive.
+
+    The positions of the games are replayed and collected in batches, their features are extracted
+    with NumPy (see `util.features`), and the weights are fitted by ridge regression. Only the normal
+    equations are accumulated, so the archive is streamed once without being held in memory. The target
+    is either the final disc difference of the game (`result`) or the score of a search without forward
+    pruning (`search=<depth>`), both from the point of view of the player to move.
+
+    Weights fitted to game results are in discs, so they are rescaled to the spread of the current
+    evaluation on the same positions, which keeps the search windows meaningful. The ProbCut parameters
+    should be refitted after the weights change. The positional weights are rounded to integers,
+    since boards keep their positional sum as an integer.
+
+    Usage: main.py --tune [archive] [target] [path]
+    """
+
+    __BATCH: int = 100000
+    __RIDGE: float = 1e-6
+    __MAX_SQUARE_WEIGHT: int = 20
+
+    def __init__(self, argv: list[str]) -> None:
+        self.archive_path: Path = Path(argv[2]) if len(argv) > 2 else Path("games.bin")
+        target: str = argv[3] if len(argv) > 3 else "result"
+        self.search_depth: Optional[int] = int(target.split("=")[1]) if target.startswith("search=") else None
+        if target != "result" and self.search_depth is None:
+            raise ValueError(f"Unknown target: {target}")
+        self.path: Path = Path(argv[4]) if len(argv) > 4 else EvaluationWeights.DEFAULT_PATH
+        self.bot: Optional[Bot] = Bot(probcut_confidence=None) if self.search_depth is not None else None
+
+    def run(self) -> None:
+        try:
+            import numpy as np
+            import util.features as Features
+        except ImportError:
+            print("The weight tuner requires NumPy: pip install .[tune]")
+            return
+
+        size: int = len(Features.FEATURES)
+        normal: np.ndarray = np.zeros((size, size))
+        moments: np.ndarray = np.zeros(size)
+        target_square: float = 0
+        count: int = 0
+        extraction_time: float = 0
+        start_time: float = time.monotonic()
+
+        archive: GameArchive = GameArchive(self.archive_path)
+        players: list[int] = []
+        opponents: list[int] = []
+        targets: list[float] = []
+        for _, record in archive.games():
+            for board, player in record.replay():
+                target: Optional[float] = self.__get_target(board, player, record.result)
+                if target is None:
+                    continue
+                own, opponent = board.get_bitboards(player)
+                players.append(own)
+                opponents.append(opponent)
+                targets.append(target)
+            if len(targets) >= WeightTuner.__BATCH:
+                extraction_time += WeightTuner.__accumulate(Features, normal, moments, players, opponents, targets)
+                target_square += sum(target * target for target in targets)
+                count += len(targets)
+                players, opponents, targets = [], [], []
+                print(f"Read {count} positions in {time.monotonic() - start_time:.1f}s")
+        archive.close()
+        if targets:
+            extraction_time += WeightTuner.__accumulate(Features, normal, moments, players, opponents, targets)
+            target_square += sum(target * target for target in targets)
+            count += len(targets)
+        if count == 0:
+            print("No positions to fit")
+            return
+        print(f"Extracted the features of {count} positions in {extraction_time:.2f}s ({count / max(extraction_time, 1e-9) * 60:.0f} positions/min)")
+
+        ridge: float = WeightTuner.__RIDGE * max(float(np.trace(normal)) / size, 1)
+        fitted: np.ndarray = np.linalg.solve(normal + ridge * np.eye(size), moments)
+        residual: float = target_square - 2 * float(fitted @ moments) + float(fitted @ normal @ fitted)
+        print(f"R^2: {1 - residual / target_square:.4f}" if target_square else "R^2: -")
+
+        current: np.ndarray = np.array(WeightTuner.__get_vector(Game.weights, Features.SQUARE_CLASSES))
+        if self.search_depth is None:
+            fitted *= np.sqrt(float(current @ normal @ current) / max(float(fitted @ normal @ fitted), 1e-12))
+        for name, old, new in zip(Features.FEATURES, current, fitted):
+            print(f"{name:>20}: {old:12.3f} -> {new:12.3f}")
+        WeightTuner.__get_weights([float(weight) for weight in fitted], Features.SQUARE_CLASSES).write(self.path)
+        print(f"Wrote the weights to {self.path}")
+
+    def __get_target(self, board: Board, player: Player, result: int) -> Optional[float]:
+        """
+        Args:
+            board (Board): The position.
+            player (Player): The player to move.
+            result (int): The final disc difference of the game in favour of black.
+
+        Returns:
+            Optional[float]: The value the evaluation of the position is fitted to, or None if the position is skipped.
+        """
+        if self.bot is None or self.search_depth is None:
+            return float(result if player == Player.BLACK else -result)
+        score, _ = self.bot.search(board, player, self.search_depth)
+        return score if abs(score) < ProbCut.SCORE_LIMIT else None
+
+    @staticmethod
+    def __accumulate(features: ModuleType, normal: 'np.ndarray', moments: 'np.ndarray', players: list[int], opponents: list[int], targets: list[float]) -> float:
+        """Adds a batch of positions to the normal equations.
+
+        Args:
+            features (ModuleType): The `util.features` module.
+            normal (np.ndarray): The sum of the outer products of the features, updated in place.
+            moments (np.ndarray): The sum of the features weighted by the targets, updated in place.
+            players (list[int]): The bitboards of the player to move.
+            opponents (list[int]): The bitboards of the opponent.
+            targets (list[float]): The targets.
+
+        Returns:
+            float: The time spent extracting the features in seconds.
+        """
+        import numpy as np
+        start_time: float = time.perf_counter()
+        matrix: np.ndarray = features.extract(np.array(players, dtype=np.uint64), np.array(opponents, dtype=np.uint64))
+        elapsed: float = time.perf_counter() - start_time
+        normal += matrix.T @ matrix
+        moments += matrix.T @ np.array(targets)
+        return elapsed
+
+    @staticmethod
+    def __get_vector(weights: EvaluationWeights, square_classes: list[int]) -> list[float]:
+        """
+        Args:
+            weights (EvaluationWeights): The weights of the evaluation.
+            square_classes (list[int]): The masks of the classes of symmetric squares.
+
+        Returns:
+            list[float]: The weights as coefficients of the features of `util.features`.
+        """
+        squares: list[float] = []
+        for mask in square_classes:
+            row, column = divmod((mask & -mask).bit_length() - 1, 8)
+            squares.append(weights.positional * weights.matrix[row][column])
+        return weights.get_terms()[:5] + squares
+
+    @staticmethod
+    def __get_weights(vector: list[float], square_classes: list[int]) -> EvaluationWeights:
+        """
+        Args:
+            vector (list[float]): The coefficients of the features of `util.features`.
+            square_classes (list[int]): The masks of the classes of symmetric squares.
+
+        Returns:
+            EvaluationWeights: The weights, with the square coefficients split into the positional weight and an integer matrix.
+        """
+        squares: list[float] = vector[5:]
+        positional: float = max(abs(weight) for weight in squares) / WeightTuner.__MAX_SQUARE_WEIGHT or 1.0
+        matrix: list[list[int]] = [[0] * 8 for _ in range(8)]
+        for mask, weight in zip(square_classes, squares):
+            for square in range(64):
+                if mask >> square & 1:
+                    matrix[square >> 3][square & 7] = round(weight / positional)
+        return EvaluationWeights(vector[:5] + [positional], matrix)
@@ -0,0 +1,55 @@
+from typing import Optional
+from threading import Lock
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+
+from enums.player import Player
+from game.bot import Bot
+from models.board import Board
+import util.bitboard as Bitboard
+
+
+class BotWorker(QObject):
+    """Runs the searches of the bot outside the thread of the window, so the window stays responsive.
+
+    The worker is moved to a `QThread` and receives its searches through a queued signal.
+    Its own signals are delivered to the window's thread:
+    - `progress`: The depth and best move (row, column) of every completed iteration.
+    - `finished`: The move found (row, column), or None, and the statistics of the search.
+    """
+
+    progress = pyqtSignal(int, object)
+    finished = pyqtSignal(object, object)
+
+    def __init__(self, bot: Bot) -> None:
+        super().__init__()
+        self.bot: Bot = bot
+        self.stopped: bool = False
+        """
+        Set by `BotWorker.stop`. Searches requested afterwards are dropped.
+        """
+        self.lock: Lock = Lock()
+        """
+        Orders `BotWorker.stop` and the start of a search, so a stop is never overtaken by the search it should cancel.
+        """
+
+    def stop(self) -> None:
+        """
+        Cancels the running search and drops the searches that are still queued. Can be called from any thread.
+        """
+        with self.lock:
+            self.stopped = True
+            self.bot.cancel()
+
+    @pyqtSlot(object, object)
+    def search(self, board: Board, player: Player) -> None:
+        with self.lock:
+            if self.stopped:
+                return
+            self.bot.stop_pondering()
+            self.bot.cancellation.clear()
+        move, stats = self.bot.bot_move(board, player, progress=self.report_progress, clear_cancellation=False)
+        self.finished.emit(move, stats)
+
+    def report_progress(self, depth: int, score: float, move: Optional[int]) -> None:
+        self.progress.emit(depth, Bitboard.to_position(move) if move is not None else None)
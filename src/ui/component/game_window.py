@@ -4,9 +4,15 @@ from enums.player import Player
 from enums.color import Color, get_color
 
 from ui.component.tile import Tile
+from ui.component.bot_worker import BotWorker
 from models.board import Board
+from models.game_state import GameState
 from game.bot import Bot
+from game.opening_book import OpeningBook
+from game.pattern_evaluator import PatternEvaluator
+from game.search_stats import SearchStats
 from game.game import Game
+import util.bitboard as Bitboard
 
 import sys
 
@@ -20,10 +26,13 @@ from PyQt5.QtWidgets import (
     QMessageBox,
 )
 
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import QThread, pyqtSignal
+from PyQt5.QtGui import QCloseEvent
 
 class GameWindow(QWidget):    
 
+    search_requested = pyqtSignal(object, object)
+
     def __init__(self, argv: list[str]) -> None:
         super().__init__()
         self.bot_on: bool = True
@@ -34,10 +43,18 @@ class GameWindow(QWidget):
                 case _: self.bot_on = True
 
         
-        self.game_board: Board = Board()
+        self.state: GameState = GameState()
+        self.game_board: Board = self.state.board
         if self.bot_on:
-            self.bot: Bot = Bot()
-        Game.legal_moves = Game.get_moves(self.game_board, Game.current_player)
+            self.bot: Bot = Bot(book=OpeningBook.open_default(), patterns=PatternEvaluator.open_default())
+            self.bot_thinking: bool = False
+            self.bot_thread: QThread = QThread()
+            self.bot_worker: BotWorker = BotWorker(self.bot)
+            self.bot_worker.moveToThread(self.bot_thread)
+            self.search_requested.connect(self.bot_worker.search)
+            self.bot_worker.progress.connect(self.display_progress)
+            self.bot_worker.finished.connect(self.handle_bot_move)
+            self.bot_thread.start()
         
         self.setFixedSize(400,400)
         self.current_player: QLabel = QLabel("Current Player: Black")
@@ -66,15 +83,6 @@ class GameWindow(QWidget):
                 else:
                     button.setStyleSheet("background-color: darkgreen;")
                 
-                if (row == 2 and col == 3) or (row == 3 and col == 2) \
-                or (row == 4 and col == 5) or (row == 5 and col == 4):
-                    button.set_color(Color.GRAY)
-                
-                if (row == 3 and col == 3) or (row == 4 and col == 4):
-                    button.set_color(Color.WHITE)
-                if (row == 3 and col == 4) or (row == 4 and col == 3):
-                    button.set_color(Color.BLACK) 
-                
                 button.clicked.connect(self.handle_click)
 
                 self.grid.addWidget(button, row, col)
@@ -82,71 +90,91 @@ class GameWindow(QWidget):
 
         self.main_layout.addLayout(self.grid)
 
+        self.shown: tuple[int, int, int] = (0, 0, 0)
+        self.display_board(self.game_board, self.state.legal_moves)
+
         self.setLayout(self.main_layout)
         self.setWindowTitle(f"Othello {'PvB' if self.bot_on else 'PvP'}")
 
     def handle_click(self) -> None:
-        if Game.play(self.game_board, Game.current_player, cast(Tile, self.sender()).position):
+        if self.bot_on and self.bot_thinking:
+            return
+        if self.state.play(cast(Tile, self.sender()).position):
             if self.bot_on:
                 self.update_game_state()            
-                QTimer.singleShot(10, self.handle_bot_move) 
+                self.bot_thinking = True
+                self.search_requested.emit(self.game_board.deepcopy(), Player.WHITE)
             else:
-                if Game.has_ended(self.game_board):
+                if self.state.has_ended():
                     self.update_game_state()
-                    self.display_result(Game.get_winner())
+                    self.display_result(self.state.get_winner())
                     self.close()
                     return 
                 
                 self.update_game_state()
+        else:
+            print("Cannot make that move!")
 
         
-    def handle_bot_move(self) -> None:
-        bot_move: Optional[tuple[int, int]] = self.bot.bot_move(self.game_board)
+    def handle_bot_move(self, bot_move: Optional[tuple[int, int]], stats: SearchStats) -> None:
+        self.bot_thinking = False
         if bot_move:
-            Game.play(self.game_board, Game.current_player, bot_move, Game.get_moves(self.game_board, Player.WHITE))
+            print(stats)
+            self.state.play(bot_move)
         else:
             self.update_game_state()
-            self.display_result(Game.get_winner())
+            self.display_result(Game.get_winner(self.game_board))
             self.close()
             return            
 
-        if Game.has_ended(self.game_board):
+        if self.state.has_ended():
             self.update_game_state()
-            self.display_result(Game.get_winner())
+            self.display_result(self.state.get_winner())
             self.close()
             return 
         
         self.update_game_state()
+        self.bot.ponder(self.game_board, Player.WHITE)
 
 
     def update_game_state(self) -> None:
-        Game.switch_player()  
-        Game.legal_moves = Game.get_moves(self.game_board, Game.current_player)
-        self.display_current_player(Game.current_player)
-        self.display_board(self.game_board, Game.legal_moves)
-        self.display_score(Game.white_tiles, Game.black_tiles) 
+        self.display_current_player(self.state.current_player)
+        self.display_board(self.game_board, self.state.legal_moves)
+        self.display_score(self.game_board.white_tiles, self.game_board.black_tiles) 
         
+    def closeEvent(self, event: Optional[QCloseEvent]) -> None:
+        if self.bot_on and self.bot_thread.isRunning():
+            self.bot_worker.finished.disconnect()
+            self.bot_worker.stop()
+            self.bot_thread.quit()
+            self.bot_thread.wait()
+            self.bot.close()
+        super().closeEvent(event)
+
     def run(self) -> None:
         self.show()
         sys.exit(self.app.exec_())
          
     def display_current_player(self, current_player: Player) -> None: 
         self.current_player.setText(f"Current player: {current_player.name}")
+
+    def display_progress(self, depth: int, move: Optional[tuple[int, int]]) -> None: 
+        self.current_player.setText(f"Bot thinking: depth {depth}, best move {move}")
     
     def display_score(self, white_tiles: int, black_tiles: int) -> None: 
         self.current_score.setText(f"Score - Black: {black_tiles}, White: {white_tiles}")
     
-    def display_board(self, board: Board, legal_moves: dict[tuple[int, int], list[tuple[int, int]]]) -> None: 
-        for x in range(Board.SIZE):
-            for y in range(Board.SIZE):
-                occupied: int = board.is_occupied( (x,y))
-                if occupied:
-                    bit_color: int = board.get_tile_color((x,y))
-                    self.buttons[x * Board.SIZE + y].set_color(get_color(bit_color))
-                elif (x,y) in legal_moves:
-                    self.buttons[x * Board.SIZE + y].set_color(Color.GRAY)
-                else:
-                    self.buttons[x * Board.SIZE + y].set_color(None)
+    def display_board(self, board: Board, legal_moves: int) -> None: 
+        shown_occupied, shown_color, shown_moves = self.shown
+        changed: int = (board.occupied ^ shown_occupied) | ((board.color ^ shown_color) & board.occupied) | (legal_moves ^ shown_moves)
+        for square in Bitboard.iterate(changed):
+            if board.occupied >> square & 1:
+                self.buttons[square].set_color(get_color(board.color >> square & 1))
+            elif legal_moves >> square & 1:
+                self.buttons[square].set_color(Color.GRAY)
+            else:
+                self.buttons[square].set_color(None)
+        self.shown = (board.occupied, board.color, legal_moves)
     
     def display_result(self, result: GameResult) -> None: 
         result_box: QMessageBox = QMessageBox()
@@ -1,13 +1,15 @@
 from typing import Optional
 
 from PyQt5.QtWidgets import QPushButton
-from PyQt5.QtCore import QSize, QPoint
-from PyQt5.QtGui import QPainter, QColor, QPaintEvent
+from PyQt5.QtCore import QSize, QPoint, Qt
+from PyQt5.QtGui import QPainter, QColor, QPaintEvent, QPixmap
 
 from enums.color import Color
 
 
 class Tile(QPushButton):
+
+    discs: dict[tuple[str, int, int], QPixmap] = {}
     
     def __init__(self, color: Optional[Color], position: tuple[int, int]) -> None:
         super().__init__()
@@ -24,17 +26,30 @@ class Tile(QPushButton):
         if self.color is None:
             return
 
-        painter.setBrush(QColor(self.color))
-        radius= min(self.width(), self.height()) / 2 - 10  
-        center = QPoint(self.width() // 2, self.height() // 2)
-        painter.drawEllipse(center, radius, radius)
+        painter.drawPixmap(0, 0, Tile.get_disc(self.color, self.width(), self.height()))
+
+    @staticmethod
+    def get_disc(color: str, width: int, height: int) -> QPixmap:
+        disc: Optional[QPixmap] = Tile.discs.get((color, width, height))
+        if disc is None:
+            disc = QPixmap(width, height)
+            disc.fill(Qt.transparent)
+            painter: QPainter = QPainter(disc)
+            painter.setRenderHint(QPainter.Antialiasing)
+            painter.setBrush(QColor(color))
+            radius = min(width, height) / 2 - 10  
+            center = QPoint(width // 2, height // 2)
+            painter.drawEllipse(center, radius, radius)
+            painter.end()
+            Tile.discs[(color, width, height)] = disc
+        return disc
 
     def sizeHint(self) -> QSize:
         return QSize(100, 100)
 
     def set_color(self, color: Optional[Color]) -> None:
-        self.color = color.value if color is not None else None
+        value: Optional[str] = color.value if color is not None else None
+        if value == self.color:
+            return
+        self.color = value
         self.update()
-
-
-
@@ -3,8 +3,10 @@ from enums.board_symbol import BoardSymbol, get_symbol
 from enums.game_result import GameResult
 from game.game import Game
 from game.bot import Bot
+from game.opening_book import OpeningBook
+from game.pattern_evaluator import PatternEvaluator
 from models.board import Board
-from typing import Optional
+from models.game_state import GameState
 
 from .user_interface import UserInterface
 
@@ -20,21 +22,21 @@ class ConsoleInterface(UserInterface):
                 
     def run(self) -> None:
       
-        game_board: Board = Board()
+        state: GameState = GameState()
+        game_board: Board = state.board
         if self.bot_on:
-            bot: Bot = Bot()    
+            bot: Bot = Bot(book=OpeningBook.open_default(), patterns=PatternEvaluator.open_default())
     
         while True:
-            Game.legal_moves = Game.get_moves(game_board, Game.current_player)
             print("=====================================================")
-            self.display_current_player(Game.current_player)
-            self.display_score(Game.white_tiles, Game.black_tiles)
+            self.display_current_player(state.current_player)
+            self.display_score(game_board.white_tiles, game_board.black_tiles)
             print("=====================================================")
-            self.display_board(game_board, Game.legal_moves)
-            if Game.has_ended(game_board):
-                self.display_score(Game.white_tiles, Game.black_tiles)
-                self.display_board(game_board, Game.legal_moves)
-                self.display_result(Game.get_winner())
+            self.display_board(game_board, state.get_moves())
+            if state.has_ended():
+                self.display_score(game_board.white_tiles, game_board.black_tiles)
+                self.display_board(game_board, state.get_moves())
+                self.display_result(state.get_winner())
                 break
 
             while True:
@@ -47,23 +49,23 @@ class ConsoleInterface(UserInterface):
                         return
                     x,y = op.split(",")
 
-                    if Game.play(game_board, Game.current_player, (int(x),int(y))):
-                        Game.switch_player()
-                        self.display_score(Game.white_tiles, Game.black_tiles)
-                        self.display_board(game_board, Game.legal_moves)
+                    if state.play((int(x),int(y))):
+                        self.display_score(game_board.white_tiles, game_board.black_tiles)
+                        self.display_board(game_board, state.get_moves())
                         break  
+                    print("Cannot make that move!")
                 except:
                         print("Invalid input!")
                         continue
             if self.bot_on:
-                bot_move: Optional[tuple[int, int]] = bot.bot_move(game_board)
+                bot_move, stats = bot.bot_move(game_board)
                 if bot_move:
-                    Game.play(game_board, Game.current_player, bot_move, Game.get_moves(game_board, Player.WHITE))
+                    print(stats)
+                    state.play(bot_move)
+                    bot.ponder(game_board, Player.WHITE)
                 else:
-                    self.display_result(Game.get_winner())
+                    self.display_result(Game.get_winner(game_board))
                     break
-            
-                Game.switch_player()            
     
     def display_current_player(board, current_player: Player) -> None:
         print(f"Current player: {get_symbol(current_player)}")
@@ -0,0 +1,146 @@
+"""Bitboard constants and helpers.
+
+Square indices follow the layout of `Matrix.DECODE_MATRIX`: the bit for the
+position (row, column) is `1 << (row * 8 + column)`.
+"""
+FULL: int = 0xFFFFFFFFFFFFFFFF
+"""
+Mask with all 64 board squares set.
+"""
+
+INNER_COLUMNS: int = 0x7E7E7E7E7E7E7E7E
+"""
+Mask of all squares except the first and the last column.
+
+Opponent discs are masked with it before horizontal and diagonal shifts, so a
+ray can never wrap around from one row into the next.
+"""
+
+SHIFTS: list[tuple[int, int]] = [(1, INNER_COLUMNS), (8, FULL), (-8, FULL), (-1, INNER_COLUMNS), (9, INNER_COLUMNS), (-7, INNER_COLUMNS), (7, INNER_COLUMNS), (-9, INNER_COLUMNS)]
+"""
+Bit shifts for all eight directions paired with the mask applied to the opponent discs.
+
+A positive shift moves bits to higher squares (left shift), a negative one to lower squares
+(right shift). The order matches `Matrix.DIRECTIONS`.
+"""
+
+
+def get_legal_moves(player: int, opponent: int) -> int:
+    """Computes all legal moves for the player with a shift-and-mask fill in all eight directions.
+
+    Args:
+        player (int): The bitboard of the discs owned by the player to move.
+        opponent (int): The bitboard of the discs owned by the opponent.
+
+    Returns:
+        int: A bitboard with a bit set for every square the player can legally play.
+    """
+    empty: int = ~(player | opponent) & FULL
+    moves: int = 0
+    for amount, mask in SHIFTS:
+        inner: int = opponent & mask
+        if amount > 0:
+            x: int = (player << amount) & inner
+            x |= (x << amount) & inner
+            x |= (x << amount) & inner
+            x |= (x << amount) & inner
+            x |= (x << amount) & inner
+            x |= (x << amount) & inner
+            moves |= (x << amount) & empty
+        else:
+            amount = -amount
+            x = (player >> amount) & inner
+            x |= (x >> amount) & inner
+            x |= (x >> amount) & inner
+            x |= (x >> amount) & inner
+            x |= (x >> amount) & inner
+            x |= (x >> amount) & inner
+            moves |= (x >> amount) & empty
+    return moves
+
+
+def get_flips(player: int, opponent: int, square: int) -> int:
+    """Computes the discs flipped by playing the given square.
+
+    Args:
+        player (int): The bitboard of the discs owned by the player to move.
+        opponent (int): The bitboard of the discs owned by the opponent.
+        square (int): The index of the square being played (row * 8 + column).
+
+    Returns:
+        int: A bitboard of all opponent discs that the move flips. Zero if the move is not legal.
+    """
+    move: int = 1 << square
+    flips: int = 0
+    for amount, mask in SHIFTS:
+        inner: int = opponent & mask
+        line: int = 0
+        if amount > 0:
+            x: int = move << amount
+            while x & inner:
+                line |= x
+                x <<= amount
+        else:
+            amount = -amount
+            x = move >> amount
+            while x & inner:
+                line |= x
+                x >>= amount
+        if x & player:
+            flips |= line
+    return flips
+
+
+def get_neighbours(bits: int) -> int:
+    """Computes all squares adjacent to at least one square of the bitboard.
+
+    Args:
+        bits (int): The bitboard whose neighbourhood is computed.
+
+    Returns:
+        int: A bitboard of all squares adjacent to a set bit in any of the eight directions, 
+        excluding the set bits themselves.
+    """
+    row: int = bits | ((bits << 1) & 0xFEFEFEFEFEFEFEFE) | ((bits >> 1) & 0x7F7F7F7F7F7F7F7F)
+    return (row | (row << 8) | (row >> 8)) & ~bits & FULL
+
+
+def iterate(bits: int) -> list[int]:
+    """Lists the indices of all set bits, from the lowest square to the highest.
+
+    Args:
+        bits (int): The bitboard to decompose.
+
+    Returns:
+        list[int]: Square indices (row * 8 + column) of every set bit.
+    """
+    squares: list[int] = []
+    while bits:
+        lowest: int = bits & -bits
+        squares.append(lowest.bit_length() - 1)
+        bits ^= lowest
+    return squares
+
+
+def to_position(square: int) -> tuple[int, int]:
+    """Converts a square index to a board position.
+
+    Args:
+        square (int): The square index (row * 8 + column).
+
+    Returns:
+        tuple[int, int]: The position (row, column).
+    """
+    return (square >> 3, square & 7)
+
+
+def to_square(position: tuple[int, int]) -> int:
+    """Converts a board position to a square index.
+
+    Args:
+        position (tuple[int, int]): The position (row, column).
+
+    Returns:
+        int: The square index (row * 8 + column).
+    """
+    return position[0] * 8 + position[1]
@@ -0,0 +1,125 @@
+"""Elo and sequential probability ratio test (SPRT) helpers for evaluating match results.
+"""
+from math import inf, log, log10, sqrt
+
+Z_95: float = 1.959964
+"""
+Two-sided 95% quantile of the normal distribution, used for the error bars.
+"""
+
+
+def get_expected_score(elo: float) -> float:
+    """Computes the expected score of a player with the given Elo advantage.
+
+    Args:
+        elo (float): The Elo difference in favour of the player.
+
+    Returns:
+        float: The expected score per game, between 0 and 1.
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def get_elo(score: float) -> float:
+    """Computes the Elo difference that corresponds to a score.
+
+    Args:
+        score (float): The score per game, between 0 and 1.
+
+    Returns:
+        float: The Elo difference, infinite for a score of 0 or 1.
+    """
+    if score <= 0:
+        return -inf
+    if score >= 1:
+        return inf
+    return -400 * log10(1 / score - 1)
+
+
+def get_score(wins: int, draws: int, losses: int) -> float:
+    """Computes the score per game of a match result.
+
+    Args:
+        wins (int): The number of games won.
+        draws (int): The number of games drawn.
+        losses (int): The number of games lost.
+
+    Returns:
+        float: The score per game, between 0 and 1, or 0.5 if no game was played.
+    """
+    games: int = wins + draws + losses
+    return (wins + draws / 2) / games if games else 0.5
+
+
+def get_variance(wins: int, draws: int, losses: int) -> float:
+    """Computes the variance of the score of a single game of a match result.
+
+    Args:
+        wins (int): The number of games won.
+        draws (int): The number of games drawn.
+        losses (int): The number of games lost.
+
+    Returns:
+        float: The variance of the score per game.
+    """
+    games: int = wins + draws + losses
+    if not games:
+        return 0
+    score: float = get_score(wins, draws, losses)
+    return (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / games
+
+
+def get_elo_error(wins: int, draws: int, losses: int) -> float:
+    """Computes the half-width of the 95% confidence interval of the Elo difference of a match result.
+
+    Args:
+        wins (int): The number of games won.
+        draws (int): The number of games drawn.
+        losses (int): The number of games lost.
+
+    Returns:
+        float: The error bar of the Elo difference, infinite while it cannot be estimated.
+    """
+    games: int = wins + draws + losses
+    if not games:
+        return inf
+    score: float = get_score(wins, draws, losses)
+    error: float = Z_95 * sqrt(get_variance(wins, draws, losses) / games)
+    return (get_elo(score + error) - get_elo(score - error)) / 2
+
+
+def get_llr(wins: int, draws: int, losses: int, elo0: float, elo1: float) -> float:
+    """Computes the log-likelihood ratio of the sequential probability ratio test,
+    using the normal approximation of the score distribution.
+
+    Args:
+        wins (int): The number of games won.
+        draws (int): The number of games drawn.
+        losses (int): The number of games lost.
+        elo0 (float): The Elo difference of the null hypothesis.
+        elo1 (float): The Elo difference of the alternative hypothesis.
+
+    Returns:
+        float: The log-likelihood ratio in favour of the alternative hypothesis.
+    """
+    games: int = wins + draws + losses
+    variance: float = get_variance(wins, draws, losses)
+    if not games or not variance:
+        return 0
+    score0: float = get_expected_score(elo0)
+    score1: float = get_expected_score(elo1)
+    return games * (score1 - score0) * (2 * get_score(wins, draws, losses) - score0 - score1) / (2 * variance)
+
+
+def get_sprt_bounds(alpha: float, beta: float) -> tuple[float, float]:
+    """Computes the stopping bounds of the sequential probability ratio test.
+
+    Args:
+        alpha (float): The probability of accepting the alternative hypothesis when the null hypothesis is true.
+        beta (float): The probability of accepting the null hypothesis when the alternative hypothesis is true.
+
+    Returns:
+        tuple[float, float]: The lower bound, below which the null hypothesis is accepted,
+        and the upper bound, above which the alternative hypothesis is accepted.
+    """
+    return log(beta / (1 - alpha)), log((1 - beta) / alpha)
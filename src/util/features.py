@@ -0,0 +1,217 @@
+"""Vectorized extraction of the evaluation features with NumPy.
+
+The functions take arrays of `uint64` bitboards, one entry per position, and compute the terms of
+`Game.get_board_score` for all positions at once. The positional term is split into the tile
+difference on each of the ten classes of symmetric squares, so the weight of every class can be fitted.
+
+`get_pattern_indices` computes the table entries of the patterns of `PatternEvaluator` in the same way.
+
+Requires the optional `numpy` dependency (`pip install .[tune]`).
+"""
+from game.pattern_evaluator import PatternEvaluator
+import numpy as np
+import util.bitboard as Bitboard
+import util.matrix as Matrix
+import util.symmetry as Symmetry
+
+SQUARE_CLASSES: list[int] = sorted(
+    {sum({1 << Symmetry.transform_square(square, transform) for transform in range(8)}) for square in range(64)},
+    key=lambda mask: mask & -mask,
+)
+"""
+Bit masks of the ten classes of squares that the symmetries of the board map onto each other, ordered by their lowest square.
+"""
+
+FEATURES: list[str] = ["tiles", "corners", "corner_neighbours", "mobility", "frontier"] + [
+    f"square_{Bitboard.to_position((mask & -mask).bit_length() - 1)}" for mask in SQUARE_CLASSES
+]
+"""
+Names of the columns returned by `extract`.
+"""
+
+_COUNTS: np.ndarray = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.uint8)
+
+
+def count(bits: np.ndarray) -> np.ndarray:
+    """Counts the set bits of every bitboard.
+
+    Args:
+        bits (np.ndarray): The `uint64` bitboards.
+
+    Returns:
+        np.ndarray: The number of set bits of every bitboard.
+    """
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(bits).astype(np.int64)
+    return _COUNTS[np.ascontiguousarray(bits).view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.int64)
+
+
+def get_legal_moves(player: np.ndarray, opponent: np.ndarray) -> np.ndarray:
+    """Computes the legal moves of every position, with the same shift-and-mask fill as `Bitboard.get_legal_moves`.
+
+    Args:
+        player (np.ndarray): The `uint64` bitboards of the discs of the player to move.
+        opponent (np.ndarray): The `uint64` bitboards of the discs of the opponent.
+
+    Returns:
+        np.ndarray: The `uint64` bitboards of the legal moves.
+    """
+    empty: np.ndarray = ~(player | opponent)
+    moves: np.ndarray = np.zeros_like(player)
+    for amount, mask in Bitboard.SHIFTS:
+        inner: np.ndarray = opponent & np.uint64(mask)
+        shift: np.uint64 = np.uint64(abs(amount))
+        if amount > 0:
+            x: np.ndarray = (player << shift) & inner
+            for _ in range(5):
+                x |= (x << shift) & inner
+            moves |= (x << shift) & empty
+        else:
+            x = (player >> shift) & inner
+            for _ in range(5):
+                x |= (x >> shift) & inner
+            moves |= (x >> shift) & empty
+    return moves
+
+
+def get_neighbours(bits: np.ndarray) -> np.ndarray:
+    """Computes the squares adjacent to every bitboard, like `Bitboard.get_neighbours`.
+
+    Args:
+        bits (np.ndarray): The `uint64` bitboards.
+
+    Returns:
+        np.ndarray: The `uint64` bitboards of all squares adjacent to a set bit, excluding the set bits themselves.
+    """
+    one: np.uint64 = np.uint64(1)
+    eight: np.uint64 = np.uint64(8)
+    row: np.ndarray = bits | ((bits << one) & np.uint64(0xFEFEFEFEFEFEFEFE)) | ((bits >> one) & np.uint64(0x7F7F7F7F7F7F7F7F))
+    return (row | (row << eight) | (row >> eight)) & ~bits
+
+
+def get_ratio(player_count: np.ndarray, opponent_count: np.ndarray) -> np.ndarray:
+    """Computes the share of the larger count as a percentage, signed in favour of the player, like the evaluation.
+
+    Args:
+        player_count (np.ndarray): The counts of the player.
+        opponent_count (np.ndarray): The counts of the opponent.
+
+    Returns:
+        np.ndarray: Values between -100 and 100, or 0 where the counts are equal.
+    """
+    total: np.ndarray = np.maximum(player_count + opponent_count, 1)
+    return np.where(
+        player_count > opponent_count,
+        100.0 * player_count / total,
+        np.where(player_count < opponent_count, -100.0 * opponent_count / total, 0.0),
+    )
+
+
+def extract(player: np.ndarray, opponent: np.ndarray) -> np.ndarray:
+    """Computes the evaluation features of every position.
+
+    Args:
+        player (np.ndarray): The `uint64` bitboards of the discs of the player to move.
+        opponent (np.ndarray): The `uint64` bitboards of the discs of the opponent.
+
+    Returns:
+        np.ndarray: A float array with one row per position and one column per entry of `FEATURES`.
+    """
+    features: np.ndarray = np.empty((len(player), len(FEATURES)))
+    empty: np.ndarray = ~(player | opponent)
+    features[:, 0] = get_ratio(count(player), count(opponent))
+    corners: np.uint64 = np.uint64(Matrix.CORNERS)
+    features[:, 1] = 25 * (count(player & corners) - count(opponent & corners))
+    neighbours: np.ndarray = np.zeros(len(player), dtype=np.int64)
+    for corner, mask in Matrix.CORNER_NEIGHBOURS:
+        open_corner: np.ndarray = (empty & np.uint64(corner)) != 0
+        neighbours += np.where(open_corner, count(player & np.uint64(mask)) - count(opponent & np.uint64(mask)), 0)
+    features[:, 2] = -12.5 * neighbours
+    features[:, 3] = get_ratio(count(get_legal_moves(player, opponent)), count(get_legal_moves(opponent, player)))
+    frontier: np.ndarray = get_neighbours(empty)
+    features[:, 4] = -get_ratio(count(player & frontier), count(opponent & frontier))
+    for column, mask in enumerate(SQUARE_CLASSES, 5):
+        features[:, column] = count(player & np.uint64(mask)) - count(opponent & np.uint64(mask))
+    return features
+
+
+_TERNARY: np.ndarray = np.array(PatternEvaluator.TERNARY, dtype=np.int32)
+
+_GATHERS: dict[int, list[tuple[int, int]]] = {
+    0: [(0, 0xFF), (1, 0x100), (5, 0x200)],
+    1: [(0, 0x1F), (3, 0x3E0)],
+    2: [(0, 0x7), (5, 0x38), (10, 0x1C0)],
+    3: [(8, 0xFF)],
+    4: [(16, 0xFF)],
+    5: [(24, 0xFF)],
+}
+"""
+The (right shift, mask) parts that gather the squares of the row-based patterns into the low bits, by pattern index.
+"""
+
+_DIAGONALS: dict[int, tuple[int, int, int]] = {
+    6: (0x8040201008040201, 56, 0xFF),
+    7: (0x0080402010080402, 57, 0x7F),
+    8: (0x0000804020100804, 58, 0x3F),
+    9: (0x0000008040201008, 59, 0x1F),
+    10: (0x0000000080402010, 60, 0xF),
+}
+"""
+The (mask, right shift, width) of the diagonal patterns, gathered with `PatternEvaluator.DIAGONALS`, by pattern index.
+"""
+
+
+def get_orientations(bits: np.ndarray) -> list[np.ndarray]:
+    """Computes every orientation of the bitboards, like `PatternEvaluator.get_orientations`.
+
+    Args:
+        bits (np.ndarray): The `uint64` bitboards.
+
+    Returns:
+        list[np.ndarray]: The bitboards in every orientation, indexed by the transform of `util.symmetry`.
+    """
+    def mirror(x: np.ndarray) -> np.ndarray:
+        for shift, mask in ((1, 0x5555555555555555), (2, 0x3333333333333333), (4, 0x0F0F0F0F0F0F0F0F)):
+            x = ((x >> np.uint64(shift)) & np.uint64(mask)) | ((x & np.uint64(mask)) << np.uint64(shift))
+        return x
+
+    transposed: np.ndarray = bits.copy()
+    for shift, mask in ((28, 0x0F0F0F0F00000000), (14, 0x3333000033330000), (7, 0x5500550055005500)):
+        swap: np.ndarray = np.uint64(mask) & (transposed ^ (transposed << np.uint64(shift)))
+        transposed ^= swap ^ (swap >> np.uint64(shift))
+    orientations: list[np.ndarray] = [bits, mirror(bits), bits.byteswap(), mirror(bits).byteswap()]
+    orientations += [transposed, mirror(transposed), transposed.byteswap(), mirror(transposed).byteswap()]
+    return orientations
+
+
+def get_pattern_indices(player: np.ndarray, opponent: np.ndarray) -> np.ndarray:
+    """Computes the table entries of all pattern instances of every position, like `PatternEvaluator.get_indices`.
+
+    Args:
+        player (np.ndarray): The `uint64` bitboards of the discs of the player to move.
+        opponent (np.ndarray): The `uint64` bitboards of the discs of the opponent.
+
+    Returns:
+        np.ndarray: An `int32` array with one row per position and one column per pattern instance,
+        holding the position of the entry within the tables of a phase.
+    """
+    def gather(bits: np.ndarray, parts: list[tuple[int, int]]) -> np.ndarray:
+        gathered: np.ndarray = np.zeros_like(bits)
+        for shift, mask in parts:
+            gathered |= (bits >> np.uint64(shift)) & np.uint64(mask)
+        return gathered
+
+    def diagonal(bits: np.ndarray, mask: int, shift: int, width: int) -> np.ndarray:
+        return ((bits & np.uint64(mask)) * np.uint64(PatternEvaluator.DIAGONALS) >> np.uint64(shift)) & np.uint64(width)
+
+    players: list[np.ndarray] = get_orientations(player)
+    opponents: list[np.ndarray] = get_orientations(opponent)
+    columns: list[np.ndarray] = []
+    for pattern, (_, _, orientations) in enumerate(PatternEvaluator.PATTERNS):
+        for o in orientations:
+            if pattern in _GATHERS:
+                a, b = gather(players[o], _GATHERS[pattern]), gather(opponents[o], _GATHERS[pattern])
+            else:
+                a, b = diagonal(players[o], *_DIAGONALS[pattern]), diagonal(opponents[o], *_DIAGONALS[pattern])
+            columns.append(PatternEvaluator.OFFSETS[pattern] + _TERNARY[a.astype(np.intp)] + 2 * _TERNARY[b.astype(np.intp)])
+    return np.stack(columns, axis=1).astype(np.int32)
@@ -38,6 +38,45 @@ gameplay. The values are designed to guide the decision-making process
 in favor of optimal moves.
 """
 
+HEURISTIC_MASKS: list[tuple[int, int]] = [
+        (weight, sum(DECODE_MATRIX[i][j] for i in range(8) for j in range(8) if HEURISTIC_MATRIX[i][j] == weight))
+        for weight in sorted({weight for row in HEURISTIC_MATRIX for weight in row})
+    ]
+"""
+The heuristic matrix grouped by weight.
+
+Each entry pairs a weight from `HEURISTIC_MATRIX` with the bit mask of all positions 
+that have that weight, so the weighted sum of a set of tiles can be computed with one 
+popcount per distinct weight.
+"""
+
+SQUARE_WEIGHTS: list[int] = [weight for row in HEURISTIC_MATRIX for weight in row]
+"""
+The heuristic matrix flattened by square index (row * 8 + column).
+"""
+
+CORNERS: int = DECODE_MATRIX[0][0] | DECODE_MATRIX[0][7] | DECODE_MATRIX[7][0] | DECODE_MATRIX[7][7]
+"""
+A bit mask of the four corners of the board.
+"""
+
+CORNER_NEIGHBOURS: list[tuple[int, int]] = [
+        (DECODE_MATRIX[0][0], DECODE_MATRIX[0][1] | DECODE_MATRIX[1][1] | DECODE_MATRIX[1][0]),
+        (DECODE_MATRIX[0][7], DECODE_MATRIX[0][6] | DECODE_MATRIX[1][6] | DECODE_MATRIX[1][7]),
+        (DECODE_MATRIX[7][0], DECODE_MATRIX[7][1] | DECODE_MATRIX[6][1] | DECODE_MATRIX[6][0]),
+        (DECODE_MATRIX[7][7], DECODE_MATRIX[6][7] | DECODE_MATRIX[6][6] | DECODE_MATRIX[7][6]),
+    ]
+"""
+Each corner paired with the bit mask of its adjacent X and C squares.
+
+Tiles on these squares are a liability while the corner is still empty.
+"""
+
+CORNER_REGIONS: int = CORNERS | CORNER_NEIGHBOURS[0][1] | CORNER_NEIGHBOURS[1][1] | CORNER_NEIGHBOURS[2][1] | CORNER_NEIGHBOURS[3][1]
+"""
+A bit mask of the corners and their adjacent X and C squares.
+"""
+
 DIRECTIONS: list[tuple[int,int]] = [(0,1), (1,0), (-1,0), (0,-1), (1,1), (-1,1), (1,-1), (-1,-1)]
 """
 A list of all possible directions represented in the matrix.
@@ -46,4 +85,20 @@ Each direction corresponds to a potential movement or action within the game,
 defined as vectors that indicate how to navigate the game board. This can 
 include horizontal, vertical, and diagonal movements, facilitating 
 move generation and evaluation during gameplay.
-"""
\ No newline at end of file
+"""
+
+def set_heuristic_matrix(matrix: list[list[int]]) -> None:
+    """Replaces the heuristic matrix and the tables derived from it.
+
+    The lists are updated in place, so every module that imported them sees the new weights. 
+    Boards created before the call keep the positional sum of the old weights.
+
+    Args:
+        matrix (list[list[int]]): The new weight of every position, indexed by row and column.
+    """
+    HEURISTIC_MATRIX[:] = [list(row) for row in matrix]
+    HEURISTIC_MASKS[:] = [
+        (weight, sum(DECODE_MATRIX[i][j] for i in range(8) for j in range(8) if HEURISTIC_MATRIX[i][j] == weight))
+        for weight in sorted({weight for row in HEURISTIC_MATRIX for weight in row})
+    ]
+    SQUARE_WEIGHTS[:] = [weight for row in HEURISTIC_MATRIX for weight in row]
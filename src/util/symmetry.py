@@ -0,0 +1,166 @@
+"""Symmetries of the board.
+
+The square board has eight symmetries. A transform is numbered 0 to 7 and applies, in this order:
+- a transpose (swapping rows and columns) if bit 2 is set,
+- a horizontal mirror (reversing the columns) if bit 0 is set,
+- a vertical flip (reversing the rows) if bit 1 is set.
+
+Transform 0 is the identity. All operations work on 64-bit bitboards with square index row * 8 + column.
+"""
+
+IDENTITY: int = 0
+"""
+The transform that leaves the board unchanged.
+"""
+
+
+def flip_vertical(bits: int) -> int:
+    """Reverses the order of the rows.
+
+    Args:
+        bits (int): The bitboard to flip.
+
+    Returns:
+        int: The bitboard with row r moved to row 7 - r.
+    """
+    return int.from_bytes(bits.to_bytes(8, "little"), "big")
+
+
+def mirror_horizontal(bits: int) -> int:
+    """Reverses the order of the columns.
+
+    Args:
+        bits (int): The bitboard to mirror.
+
+    Returns:
+        int: The bitboard with column c moved to column 7 - c.
+    """
+    bits = ((bits >> 1) & 0x5555555555555555) | ((bits & 0x5555555555555555) << 1)
+    bits = ((bits >> 2) & 0x3333333333333333) | ((bits & 0x3333333333333333) << 2)
+    return ((bits >> 4) & 0x0F0F0F0F0F0F0F0F) | ((bits & 0x0F0F0F0F0F0F0F0F) << 4)
+
+
+def transpose(bits: int) -> int:
+    """Swaps rows and columns, flipping the board along the diagonal through (0, 0) and (7, 7).
+
+    Args:
+        bits (int): The bitboard to transpose.
+
+    Returns:
+        int: The bitboard with (row, column) moved to (column, row).
+    """
+    swap: int = 0x0F0F0F0F00000000 & (bits ^ (bits << 28))
+    bits ^= swap ^ (swap >> 28)
+    swap = 0x3333000033330000 & (bits ^ (bits << 14))
+    bits ^= swap ^ (swap >> 14)
+    swap = 0x5500550055005500 & (bits ^ (bits << 7))
+    return bits ^ swap ^ (swap >> 7)
+
+
+def rotate_clockwise(bits: int) -> int:
+    """Rotates the board by 90 degrees clockwise, as seen with row 0 at the top.
+
+    Args:
+        bits (int): The bitboard to rotate.
+
+    Returns:
+        int: The bitboard with (row, column) moved to (column, 7 - row).
+    """
+    return mirror_horizontal(transpose(bits))
+
+
+def rotate_counterclockwise(bits: int) -> int:
+    """Rotates the board by 90 degrees counterclockwise, as seen with row 0 at the top.
+
+    Args:
+        bits (int): The bitboard to rotate.
+
+    Returns:
+        int: The bitboard with (row, column) moved to (7 - column, row).
+    """
+    return flip_vertical(transpose(bits))
+
+
+def rotate_half(bits: int) -> int:
+    """Rotates the board by 180 degrees.
+
+    Args:
+        bits (int): The bitboard to rotate.
+
+    Returns:
+        int: The bitboard with (row, column) moved to (7 - row, 7 - column).
+    """
+    return flip_vertical(mirror_horizontal(bits))
+
+
+def apply(bits: int, transform: int) -> int:
+    """Applies a transform to a bitboard.
+
+    Args:
+        bits (int): The bitboard to transform.
+        transform (int): The transform (0 to 7).
+
+    Returns:
+        int: The transformed bitboard.
+    """
+    if transform & 4:
+        bits = transpose(bits)
+    if transform & 1:
+        bits = mirror_horizontal(bits)
+    if transform & 2:
+        bits = flip_vertical(bits)
+    return bits
+
+
+SQUARES: list[list[int]] = [[apply(1 << square, transform).bit_length() - 1 for square in range(64)] for transform in range(8)]
+"""
+Square each square is moved to by each transform, indexed as `SQUARES[transform][square]`.
+"""
+
+INVERSES: list[int] = [next(inverse for inverse in range(8) if all(SQUARES[inverse][SQUARES[transform][square]] == square for square in range(64))) for transform in range(8)]
+"""
+Transform that undoes each transform.
+"""
+
+
+def transform_square(square: int, transform: int) -> int:
+    """
+    Args:
+        square (int): The square index (row * 8 + column).
+        transform (int): The transform (0 to 7).
+
+    Returns:
+        int: The square the transform moves the square to.
+    """
+    return SQUARES[transform][square]
+
+
+def get_canonical(occupied: int, color: int) -> tuple[int, int, int]:
+    """Finds the canonical orientation of a position, shared by all its symmetric positions.
+
+    The canonical orientation is the one with the smallest (occupied, color) pair. Moves found
+    in the canonical orientation are mapped back with `transform_square(move, INVERSES[transform])`.
+
+    Args:
+        occupied (int): The bitboard of occupied squares.
+        color (int): The bitboard of tile colors (1 for white, 0 for black).
+
+    Returns:
+        tuple[int, int, int]: The occupied and color bitboards of the canonical orientation
+        and the transform that produces it from the given position.
+    """
+    mirrored: int = mirror_horizontal(occupied)
+    transposed: int = transpose(occupied)
+    mirrored_transposed: int = mirror_horizontal(transposed)
+    candidates: list[int] = [
+        occupied, mirrored, flip_vertical(occupied), flip_vertical(mirrored),
+        transposed, mirrored_transposed, flip_vertical(transposed), flip_vertical(mirrored_transposed),
+    ]
+    smallest: int = min(candidates)
+    best: tuple[int, int, int] = (smallest, -1, IDENTITY)
+    for transform in range(8):
+        if candidates[transform] == smallest:
+            transformed: int = apply(color, transform)
+            if best[1] < 0 or transformed < best[1]:
+                best = (smallest, transformed, transform)
+    return best
@@ -0,0 +1,93 @@
+"""Zobrist hashing constants.
+"""
+import random
+
+_generator: random.Random = random.Random(0x0E11E110)
+
+KEYS: list[list[int]] = [[_generator.getrandbits(64) for _ in range(64)] for _ in range(2)]
+"""
+Random 64-bit keys for every (player, square) pair.
+
+The first row holds the keys of black tiles and the second row the keys of white tiles, 
+matching the values of `Player`. The generator is seeded, so every process computes 
+the same keys for the same position.
+"""
+
+FLIP_KEYS: list[int] = [KEYS[0][square] ^ KEYS[1][square] for square in range(64)]
+"""
+Keys that reverse the color of a tile in a hash.
+
+XOR-ing `FLIP_KEYS[square]` into a hash replaces the key of a black tile on the square 
+with the key of a white tile, and vice versa.
+"""
+
+SIDE: int = _generator.getrandbits(64)
+"""
+Key XOR-ed into a hash when white is the side to move.
+"""
+
+
+def get_hash(occupied: int, color: int) -> int:
+    """Computes the Zobrist hash of a position from scratch.
+
+    Args:
+        occupied (int): The bitboard of occupied squares.
+        color (int): The bitboard of tile colors (1 for white, 0 for black).
+
+    Returns:
+        int: The 64-bit Zobrist hash of the tiles on the board, without the side to move.
+    """
+    hash: int = 0
+    while occupied:
+        lowest: int = occupied & -occupied
+        square: int = lowest.bit_length() - 1
+        hash ^= KEYS[color >> square & 1][square]
+        occupied ^= lowest
+    return hash
+
+
+def _get_byte_keys(keys: list[int]) -> list[list[int]]:
+    """Combines the keys of every byte of a bitboard.
+
+    Args:
+        keys (list[int]): The keys of the 64 squares for one player.
+
+    Returns:
+        list[list[int]]: For every byte of a bitboard, the XOR of the keys of the squares set in each of its 256 values.
+    """
+    tables: list[list[int]] = []
+    for offset in range(0, 64, 8):
+        table: list[int] = [0] * 256
+        for value in range(1, 256):
+            lowest: int = (value & -value).bit_length() - 1
+            table[value] = table[value & (value - 1)] ^ keys[offset + lowest]
+        tables.append(table)
+    return tables
+
+
+_BYTE_KEYS: list[list[list[int]]] = [_get_byte_keys(keys) for keys in KEYS]
+
+
+def get_bitboard_hash(own: int, opponent: int) -> int:
+    """Computes the Zobrist hash of a position given by the bitboards of the player to move and of the opponent.
+
+    The tiles of the player to move use the keys of black and those of the opponent the keys of white, 
+    so the hash identifies the position as seen by the player to move, which is all a score from 
+    their point of view depends on. The hash is built from precomputed keys of every byte of the 
+    bitboards, in sixteen lookups.
+
+    Args:
+        own (int): The bitboard of the tiles of the player to move.
+        opponent (int): The bitboard of the opponent's tiles.
+
+    Returns:
+        int: The 64-bit Zobrist hash of the position.
+    """
+    o: list[list[int]] = _BYTE_KEYS[0]
+    t: list[list[int]] = _BYTE_KEYS[1]
+    return (
+        o[0][own & 0xFF] ^ o[1][own >> 8 & 0xFF] ^ o[2][own >> 16 & 0xFF] ^ o[3][own >> 24 & 0xFF]
+        ^ o[4][own >> 32 & 0xFF] ^ o[5][own >> 40 & 0xFF] ^ o[6][own >> 48 & 0xFF] ^ o[7][own >> 56]
+        ^ t[0][opponent & 0xFF] ^ t[1][opponent >> 8 & 0xFF] ^ t[2][opponent >> 16 & 0xFF] ^ t[3][opponent >> 24 & 0xFF]
+        ^ t[4][opponent >> 32 & 0xFF] ^ t[5][opponent >> 40 & 0xFF] ^ t[6][opponent >> 48 & 0xFF] ^ t[7][opponent >> 56]
+    )
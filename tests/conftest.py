@@ -0,0 +1,33 @@
+from pathlib import Path
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import util.bitboard as Bitboard
+
+
+@pytest.fixture(scope="session")
+def positions() -> list[tuple[int, int]]:
+    """The (occupied, color) bitboards of all positions of seeded random games, a few thousand in total."""
+    rng: random.Random = random.Random(2024)
+    result: list[tuple[int, int]] = []
+    while len(result) < 3000:
+        discs: list[int] = [0x0000000810000000, 0x0000001008000000]
+        side: int = 0
+        passes: int = 0
+        while passes < 2:
+            own, opponent = discs[side], discs[1 - side]
+            moves: int = Bitboard.get_legal_moves(own, opponent)
+            if moves:
+                move: int = rng.choice(Bitboard.iterate(moves))
+                flips: int = Bitboard.get_flips(own, opponent, move)
+                discs[side], discs[1 - side] = own | flips | 1 << move, opponent ^ flips
+                result.append((discs[0] | discs[1], discs[1]))
+                passes = 0
+            else:
+                passes += 1
+            side = 1 - side
+    return result
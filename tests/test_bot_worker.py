@@ -0,0 +1,31 @@
+from game.bot import Bot
+from models.board import Board
+from enums.player import Player
+from math import inf
+import time
+
+import pytest
+
+
+def test_cancel_before_the_search_is_kept() -> None:
+    bot: Bot = Bot(probcut_confidence=None)
+    bot.cancel()
+    start_time: float = time.monotonic()
+    move, stats = bot.bot_move(Board(), Player.BLACK, time_limit=inf, depth_limit=30, clear_cancellation=False)
+    assert move is not None
+    assert stats.depth <= 1
+    assert time.monotonic() - start_time < 5
+
+
+def test_stopped_worker_drops_queued_search() -> None:
+    pytest.importorskip("PyQt5")
+    from ui.component.bot_worker import BotWorker
+
+    worker: BotWorker = BotWorker(Bot(probcut_confidence=None))
+    results: list[object] = []
+    worker.finished.connect(lambda move, stats: results.append(move))
+    worker.stop()
+    start_time: float = time.monotonic()
+    worker.search(Board(), Player.BLACK)
+    assert results == []
+    assert time.monotonic() - start_time < 5
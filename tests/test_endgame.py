@@ -0,0 +1,45 @@
+from game.endgame import EndgameSolver
+from game.bot import Bot
+from game.time_manager import TimeManager
+from models.board import Board
+from enums.player import Player
+import time
+
+import pytest
+
+COLLIDING_POSITIONS: list[tuple[tuple[int, int], tuple[int, int]]] = [
+    ((0xA921F24211B86012, 0x564C0D9CEE459ECC), (0x8921F24211B86013, 0x564C0D9CEE459ECC)),
+    ((0x6765A63C75969218, 0x189A51C088616D62), (0x4765A63C75969219, 0x189A51C088616D62)),
+    ((0xAC6149A04382476C, 0x039E245E3C5C3892), (0x8C6149A04382476D, 0x039E245E3C5C3892)),
+]
+"""
+Pairs of positions, as the bitboards of black (to move) and white, that differ only by a black disc on square 61
+instead of square 0. Python's integer hash reduces modulo 2^61 - 1, so `hash((own, opponent))` maps them and many
+of their descendants to the same key.
+"""
+
+
+def solve(solver: EndgameSolver, black: int, white: int) -> int:
+    result = solver.solve(Board.from_bitboards(black | white, white), Player.BLACK, time.monotonic() + 60)
+    assert result is not None
+    return result[0]
+
+
+@pytest.mark.parametrize("first, second", COLLIDING_POSITIONS)
+def test_reused_solver_keeps_positions_apart(first: tuple[int, int], second: tuple[int, int]) -> None:
+    solver: EndgameSolver = EndgameSolver(1)
+    solve(solver, *first)
+    assert solve(solver, *second) == solve(EndgameSolver(1), *second)
+
+
+def test_node_limit_bounds_the_solver() -> None:
+    board: Board = Board.from_bitboards(0xACFDFFFFFF7F9E0E, 0xA8416B3D5B2F160E)
+    solver: EndgameSolver = EndgameSolver(1)
+    assert solver.solve(board, Player.BLACK, time.monotonic() + 60, node_limit=500) is None
+    assert solver.nodes <= 500
+
+    bot: Bot = Bot(endgame_empties=16, probcut_confidence=None)
+    move, stats = bot.bot_move(board, Player.BLACK, node_limit=1000)
+    assert move is not None
+    assert stats.source == "search"
+    assert stats.nodes < 1000 + TimeManager.CHECK_INTERVAL
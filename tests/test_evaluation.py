@@ -0,0 +1,98 @@
+from game.evaluation_weights import EvaluationWeights
+from game.game import Game
+from models.board import Board
+from enums.player import Player, get_opponent
+import util.bitboard as Bitboard
+import util.matrix as Matrix
+
+import pytest
+
+
+def get_ratio(player_count: int, opponent_count: int) -> float:
+    if player_count > opponent_count:
+        return (100.0 * player_count) / (player_count + opponent_count)
+    elif player_count < opponent_count:
+        return -(100.0 * opponent_count) / (player_count + opponent_count)
+    return 0
+
+
+def get_loop_score(board: Board, player: Player) -> float:
+    """The square-by-square board score that `Game.get_board_score` replaced, kept as the reference."""
+    opponent: Player = get_opponent(player)
+    player_tiles: int = 0
+    opponent_tiles: int = 0
+    my_front_tiles: int = 0
+    opp_front_tiles: int = 0
+    d: float = 0
+    for i in range(Board.SIZE):
+        for j in range(Board.SIZE):
+            if board.get_tile_color((i, j)) == player:
+                d += Matrix.HEURISTIC_MATRIX[i][j]
+                player_tiles += 1
+            elif board.get_tile_color((i, j)) == opponent:
+                d -= Matrix.HEURISTIC_MATRIX[i][j]
+                opponent_tiles += 1
+            if board.is_occupied((i, j)):
+                for direction in Matrix.DIRECTIONS:
+                    x = i + direction[0]
+                    y = j + direction[1]
+                    if 0 <= x < 8 and 0 <= y < 8 and not board.is_occupied((x, y)):
+                        if board.get_tile_color((i, j)) == player:
+                            my_front_tiles += 1
+                        elif board.get_tile_color((i, j)) == opponent:
+                            opp_front_tiles += 1
+                        break
+    p: float = get_ratio(player_tiles, opponent_tiles)
+    f: float = -get_ratio(my_front_tiles, opp_front_tiles)
+
+    corners: list[tuple[int, int]] = [(0, 0), (0, 7), (7, 0), (7, 7)]
+    c: float = 25 * sum((board.get_tile_color(corner) == player) - (board.get_tile_color(corner) == opponent) for corner in corners)
+
+    neighbours: dict[tuple[int, int], list[tuple[int, int]]] = {
+        (0, 0): [(0, 1), (1, 1), (1, 0)],
+        (0, 7): [(0, 6), (1, 6), (1, 7)],
+        (7, 0): [(7, 1), (6, 1), (6, 0)],
+        (7, 7): [(6, 7), (6, 6), (7, 6)],
+    }
+    player_tiles = opponent_tiles = 0
+    for corner, squares in neighbours.items():
+        if not board.is_occupied(corner):
+            player_tiles += sum(board.get_tile_color(square) == player for square in squares)
+            opponent_tiles += sum(board.get_tile_color(square) == opponent for square in squares)
+    l: float = -12.5 * (player_tiles - opponent_tiles)
+
+    own, other = board.get_bitboards(player)
+    m: float = get_ratio(Bitboard.get_legal_moves(own, other).bit_count(), Bitboard.get_legal_moves(other, own).bit_count())
+
+    weights: EvaluationWeights = Game.weights
+    return (weights.tiles * p) + (weights.corners * c) + (weights.corner_neighbours * l) + (weights.mobility * m) + (weights.frontier * f) + (weights.positional * d)
+
+
+@pytest.mark.parametrize("player", [Player.BLACK, Player.WHITE])
+def test_board_score_matches_loop(positions: list[tuple[int, int]], player: Player) -> None:
+    for occupied, color in positions:
+        board: Board = Board.from_bitboards(occupied, color)
+        assert Game.get_board_score(board, player) == pytest.approx(get_loop_score(board, player), abs=1e-9)
+
+
+@pytest.mark.parametrize("player", [Player.BLACK, Player.WHITE])
+def test_incremental_score_matches_board_score(positions: list[tuple[int, int]], player: Player) -> None:
+    for occupied, color in positions:
+        board: Board = Board.from_bitboards(occupied, color)
+        assert Game.get_incremental_score(board, player) == pytest.approx(Game.get_board_score(board, player), abs=1e-9)
+
+
+def test_weights_are_installed_explicitly() -> None:
+    built_in: EvaluationWeights = EvaluationWeights()
+    assert Game.weights.get_terms() == built_in.get_terms()
+    assert Matrix.HEURISTIC_MATRIX == built_in.matrix
+
+    matrix: list[list[int]] = [[weight + 1 for weight in row] for row in built_in.matrix]
+    try:
+        Game.set_weights(EvaluationWeights(matrix=matrix))
+        assert Matrix.HEURISTIC_MATRIX == matrix
+        assert Matrix.SQUARE_WEIGHTS == [weight for row in matrix for weight in row]
+        assert Game.weights.matrix == matrix
+    finally:
+        Game.set_weights(built_in)
+    assert Matrix.HEURISTIC_MATRIX == built_in.matrix
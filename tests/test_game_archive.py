@@ -0,0 +1,44 @@
+from game.game_archive import GameArchive, GameRecord
+from models.board import Board
+from pathlib import Path
+
+import pytest
+
+GAME: list[int] = [19, 18, 17, 9, 1, 0]
+"""
+The first moves of a game from the starting position: d3, c3, b3, b2, b1, a1.
+"""
+
+
+def read_games(path: Path) -> list[tuple[list[int], tuple[str, str]]]:
+    archive: GameArchive = GameArchive(path)
+    try:
+        return [(record.moves, record.engines) for _, record in archive.games()]
+    finally:
+        archive.close()
+
+
+def test_append_round_trip(tmp_path: Path) -> None:
+    path: Path = tmp_path / "games.bin"
+    GameArchive.append(path, [GameRecord(GAME, 2, ("black", "white"))])
+    GameArchive.append(path, [GameRecord(GAME[:3], -4, ("white", "other"))])
+    assert read_games(path) == [(GAME, ("black", "white")), (GAME[:3], ("white", "other"))]
+
+    archive: GameArchive = GameArchive(path)
+    try:
+        assert len(archive.find(Board())) == 2
+    finally:
+        archive.close()
+
+
+def test_append_with_bad_record_leaves_archive_unchanged(tmp_path: Path) -> None:
+    path: Path = tmp_path / "games.bin"
+    GameArchive.append(path, [GameRecord(GAME, 2, ("black", "white"))])
+    files: list[Path] = [path, GameArchive.get_engines_path(path), GameArchive.get_index_path(path)]
+    contents: list[bytes] = [file.read_bytes() for file in files]
+
+    with pytest.raises(ValueError):
+        GameArchive.append(path, [GameRecord(GAME, 2, ("new", "white")), GameRecord([0], 0, ("newer", "white"))])
+
+    assert [file.read_bytes() for file in files] == contents
+    assert read_games(path) == [(GAME, ("black", "white"))]
@@ -0,0 +1,17 @@
+from game.bot import Bot
+from game.game import Game
+from models.board import Board
+from enums.player import Player
+from math import inf
+
+
+def test_search_counts_only_the_bot_cache() -> None:
+    Game.move_cache.clear()
+    bot: Bot = Bot(probcut_confidence=None)
+    Bot(probcut_confidence=None).bot_move(Board(), Player.BLACK, time_limit=inf, depth_limit=5)
+    _, stats = bot.bot_move(Board(), Player.BLACK, time_limit=inf, depth_limit=5)
+
+    assert Game.move_cache.hits + Game.move_cache.misses == 0
+    lookups: int = stats.move_cache_hits + stats.move_cache_misses
+    assert 0 < lookups <= bot.move_cache.hits + bot.move_cache.misses
+    assert stats.move_cache_misses <= bot.move_cache.misses
@@ -0,0 +1,19 @@
+from game.bot import Bot
+from models.board import Board
+from enums.player import Player
+from math import inf
+from threading import Timer
+import time
+
+
+def test_cancel_stops_the_helpers() -> None:
+    bot: Bot = Bot(workers=3, probcut_confidence=None)
+    try:
+        for _ in range(2):
+            Timer(0.5, bot.cancel).start()
+            start_time: float = time.monotonic()
+            move, _ = bot.bot_move(Board(), Player.BLACK, time_limit=inf, depth_limit=30)
+            assert move is not None
+            assert time.monotonic() - start_time < 5
+    finally:
+        bot.close()
@@ -0,0 +1,32 @@
+from game.evaluation_weights import EvaluationWeights
+from game.probcut import ProbCut
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+
+def test_pattern_evaluation_has_no_built_in_parameters(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path: Path = tmp_path / "probcut_patterns.json"
+    monkeypatch.setattr(ProbCut, "PATTERNS_PATH", path)
+    assert ProbCut.open_default(patterns=True) is None
+    assert ProbCut.open_default(patterns=False) is not None
+
+    parameters: list[tuple[int, int, int, float, float, float]] = [(0, 4, 1, 1.0, 0.0, 2000.0)]
+    ProbCut.write(path, parameters)
+    probcut: Optional[ProbCut] = ProbCut.open_default(2.0, patterns=True)
+    assert probcut is not None
+    assert probcut.get_checks(30, 4) == [(1, 1.0, 0.0, 4000.0)]
+
+
+def test_heuristic_parameters_match_the_weights(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    path: Path = tmp_path / "probcut.json"
+    monkeypatch.setattr(ProbCut, "DEFAULT_PATH", path)
+    built_in: EvaluationWeights = EvaluationWeights()
+    tuned: EvaluationWeights = EvaluationWeights([1, 2, 3, 4, 5, 6])
+    assert ProbCut.open_default(weights=built_in) is not None
+    assert ProbCut.open_default(weights=tuned) is None
+
+    ProbCut.write(path, [(0, 4, 1, 1.0, 0.0, 2000.0)], tuned.get_fingerprint())
+    assert ProbCut.open_default(weights=tuned) is not None
+    assert ProbCut.open_default(weights=built_in) is None